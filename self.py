@@ -23,86 +23,79 @@
 """
 
 import os
+import sys
+import time
+
+# زمان‌سنج راه‌اندازی باید قبل از importهای سنگین ساخته شود (گزارش با --profile-startup)
+from selfbot.startup_profile import StartupProfiler
+startup_profiler = StartupProfiler()
+
 import asyncio
 import re
 import random
 import datetime
-import math
 import logging
 import json
-import ast  # برای eval امن‌تر در ماشین حساب و جلوگیری از آسیب‌پذیری
-import time
-import subprocess # برای اجرای دستورات سیستمی مانند speedtest-cli
-
-# کتابخانه‌های خارجی برای دستورات خاص. مطمئن شوید که اینها را نصب کرده‌اید.
-# pip install requests wikipedia speedtest-cli pyfiglet google_trans_new psutil
-try:
-    import requests  # برای وب‌هوک‌ها، آب و هوا، ترجمه، IMDB و سایر API‌های خارجی
-except ImportError:
-    print("ماژول 'requests' نصب نیست. برخی دستورات ممکن است کار نکنند. لطفاً 'pip install requests' را اجرا کنید.")
-    requests = None
-
-try:
-    import wikipedia  # برای دستور wikipedia
-    wikipedia.set_lang("fa") # تنظیم زبان فارسی برای ویکی پدیا
-except ImportError:
-    print("ماژول 'wikipedia' نصب نیست. دستور 'wiki' کار نخواهد کرد. لطفاً 'pip install wikipedia' را اجرا کنید.")
-    wikipedia = None
-except Exception as e:
-    print(f"خطا در تنظیم زبان ویکی‌پدیا (فارسی): {e}. ممکن است 'wiki' به زبان انگلیسی جستجو کند یا کار نکند.")
-    wikipedia = None
-
-try:
-    import speedtest # برای دستور speedtest
-except ImportError:
-    print("ماژول 'speedtest-cli' نصب نیست. دستور 'speedtest' کار نخواهد کرد. لطفاً 'pip install speedtest-cli' را اجرا کنید.")
-    speedtest = None
-
-try:
-    import pyfiglet # برای دستور figlet
-except ImportError:
-    print("ماژول 'pyfiglet' نصب نیست. دستور 'figlet' کار نخواهد کرد. لطفاً 'pip install pyfiglet' را اجرا کنید.")
-    pyfiglet = None
-
-try:
-    # GoogleTranslator از google_trans_new یا Translator از deep_translator
-    from google_trans_new import google_translator
-    TRANSLATOR = google_translator()
-except ImportError:
-    try:
-        from deep_translator import GoogleTranslator
-        TRANSLATOR = GoogleTranslator(source='auto', target='en') # پیش‌فرض به انگلیسی
-        print("ماژول 'deep_translator' به عنوان جایگزین 'google_trans_new' استفاده می‌شود.")
-    except ImportError:
-        print("هیچ یک از ماژول‌های 'google_trans_new' یا 'deep_translator' نصب نیستند. دستور 'translate' ممکن است کار نکند. لطفاً 'pip install google_trans_new' یا 'pip install deep_translator' را اجرا کنید.")
-        TRANSLATOR = None
-
-try:
-    import psutil # برای اطلاعات سیستم
-except ImportError:
-    print("ماژول 'psutil' نصب نیست. دستورات 'sysinfo', 'cpu', 'ram', 'disk' کار نخواهند کرد. لطفاً 'pip install psutil' را اجرا کنید.")
-    psutil = None
+import io
+import signal
+import shlex
+import urllib.parse
+
+from selfbot.lazy import LazyModule
+startup_profiler.mark('stdlib imports')
+
+# کتابخانه‌های خارجی برای دستورات خاص. این ماژول‌ها هنگام راه‌اندازی import نمی‌شوند:
+# بررسی وجودشان (if not requests: ...) فقط با جستجوی spec انجام می‌شود و import واقعی
+# در اولین استفاده از دستور مربوطه رخ می‌دهد تا شروع (مخصوصاً پس از کرش) سریع باشد.
+# وابستگی‌های دستورات پلاگین‌ها (wikipedia، pyfiglet، مترجم و ...) در خود پلاگین‌ها تعریف شده‌اند.
+# pip install requests speedtest-cli psutil
+requests = LazyModule('requests')  # برای وب‌هوک‌ها، .ipinfo و سایر API‌های خارجی
+speedtest = LazyModule('speedtest')  # برای دستور speedtest
+psutil = LazyModule('psutil')  # برای اطلاعات سیستم
+
+# وابستگی اختیاری هر دستور؛ .help دستوراتی را که وابستگی‌شان نصب نیست علامت می‌زند
+# (برای دستورات پلاگین‌ها از بخش 'requires' در manifest خوانده می‌شود).
+COMMAND_DEPENDENCIES = {
+    ".ipinfo": (requests, 'requests'),
+    ".speedtest": (speedtest, 'speedtest-cli'),
+    ".sysinfo": (psutil, 'psutil'),
+}
 
 
 # ماژول اصلی Telethon
-from telethon import TelegramClient, events
-from telethon.tl.functions.users import GetFullUserRequest
-from telethon.tl.functions.channels import GetFullChannelRequest
+from telethon import events, utils
 from telethon.tl.functions.messages import GetHistoryRequest
-from telethon.tl.functions.photos import UploadProfilePhotoRequest, DeletePhotosRequest
 from telethon.tl.types import (
     User, Chat, Channel, Message, MessageMediaPhoto, MessageMediaDocument,
-    ChatBannedRights, ChannelParticipantsAdmins, ChannelParticipantAdmin,
-    ChannelParticipantCreator
+    UserStatusOnline
 )
 from telethon.errors.rpcerrorlist import (
-    PeerIdInvalidError, UserNotParticipantError, UserAdminInvalidError,
-    MessageDeleteForbiddenError, PhotoCropSizeSmallError, WebpageCurlFailedError,
-    ChatSendMediaForbiddenError, MessageTooLongError, ChannelsAdminNotAggregatorError,
-    UserAdminRightsForbiddenError, ChannelPrivateError, ChatAdminRequiredError,
+    PeerIdInvalidError,
+    MessageDeleteForbiddenError,
+    MessageTooLongError, ChannelsAdminNotAggregatorError,
     UserIsBotError, UsernameNotOccupiedError, YouBlockedUserError
 )
 from telethon.errors import SessionPasswordNeededError
+startup_profiler.mark('telethon imports')
+
+from selfbot.outbound import ScheduledTelegramClient, background
+from selfbot.entity_cache import EntityCache
+from selfbot.peer_directory import PeerDirectory
+from selfbot.admin_rights import AdminRightsService
+from selfbot.chat_meta import ChatMetaCache
+from selfbot.full_users import FullUserCache
+from selfbot.report_queue import split_digest
+from selfbot.progress import ProgressReporter
+from selfbot.upload_cache import UploadCache
+from selfbot.batch_resolve import BatchResolver
+from selfbot.history_ops import CheckpointStore, PipelinedDeleter, StreamingForwarder, message_ids
+from selfbot.reloader import is_reloading, keep, reload_script
+from selfbot.plugins import PluginContext, PluginRegistry
+from selfbot.settings import SettingsDB
+from selfbot.snapshot import StateSnapshot
+from selfbot.calculator import CalcError, Calculator
+from selfbot.sandbox import format_exception, run_async_snippet, run_code, strip_code_fence
+startup_profiler.mark('selfbot imports')
 
 
 # --- تنظیمات عمومی ---
@@ -123,13 +116,69 @@ OWM_API_KEY = os.environ.get('OWM_API_KEY', 'YOUR_OPENWEATHERMAP_API_KEY_HERE')
 # API Key برای OMDb API (برای دستور .imdb)
 OMDB_API_KEY = os.environ.get('OMDB_API_KEY', 'YOUR_OMDB_API_KEY_HERE') # <<--- API Key را اینجا قرار دهید
 
+# تعداد اتصال‌های موازی برای دانلود/آپلود فایل‌های بزرگ (.downloadmedia و .sendfile)
+TRANSFER_CONNECTIONS = int(os.environ.get('TG_TRANSFER_CONNECTIONS', 4))
+
+# تعداد دانلودهای همزمان صف دانلود (.downloadmedia، .downloadall) و پوشه ذخیره فایل‌ها
+DOWNLOAD_CONCURRENCY = int(os.environ.get('TG_DOWNLOAD_CONCURRENCY', 2))
+DOWNLOAD_DIR = os.environ.get('TG_DOWNLOAD_DIR', 'downloads')
+
+# پلاگین‌های فعال (مثال: TG_PLUGINS=moderation,profile)؛ خالی یعنی همه پلاگین‌ها. پلاگین غیرفعال هرگز import نمی‌شود.
+# پلاگین‌ها: moderation، profile، search، media، monshi، fonts، monitoring، spam (لیست دستورات هر کدام در .help)
+ENABLED_PLUGINS = [name.strip() for name in os.environ.get('TG_PLUGINS', '').split(',') if name.strip()] or None
+
+# دیتابیس SQLite تنظیمات پلاگین‌ها (منشی، ساعت در اسم، گزارش‌ها، ...) که پس از ری‌استارت باقی می‌مانند
+DB_NAME = os.environ.get('TG_DB_NAME', 'selfbot_data.db')
+
+# محدودیت‌های .exec (زمان واقعی، زمان CPU و حافظه پروسه جداگانه) و حداکثر زمان اجرای .aexec، به ثانیه/مگابایت
+EXEC_TIMEOUT = int(os.environ.get('TG_EXEC_TIMEOUT', 30))
+EXEC_CPU_SECONDS = int(os.environ.get('TG_EXEC_CPU_SECONDS', 10))
+EXEC_MEMORY_MB = int(os.environ.get('TG_EXEC_MEMORY_MB', 512))
+AEXEC_TIMEOUT = int(os.environ.get('TG_AEXEC_TIMEOUT', 300))
+
 
 # تنظیمات لاگین
 logging.basicConfig(format='[%(levelname) 5s/%(asctime)s] %(name)s: %(message)s', level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # --- راه‌اندازی کلاینت تلگرام ---
-client = TelegramClient(SESSION_NAME, API_ID, API_HASH)
+# همه ارسال/ویرایش/حذف‌ها از زمان‌بند خروجی عبور می‌کنند تا FloodWait فقط همان چت/نوع درخواست را متوقف کند.
+# کلاینت و سرویس‌های زیر با keep فقط بار اول ساخته می‌شوند و پس از .reload همان نمونه‌های زنده باقی می‌مانند.
+client = keep('client', lambda: ScheduledTelegramClient(SESSION_NAME, API_ID, API_HASH))
+
+# کش entityها بر اساس شناسه و یوزرنیم (با زمان انقضا) تا هر دستور نیاز به ResolveUsername نداشته باشد.
+# یوزرنیم‌هایی که در حافظه نیستند ابتدا از دایرکتوری ذخیره شده در فایل سشن خوانده می‌شوند.
+peer_directory = keep('peer_directory', lambda: PeerDirectory(client))
+entity_cache = keep('entity_cache', lambda: EntityCache(client, directory=peer_directory))
+
+# حقوق ادمین ما در هر چت (و لیست کامل ادمین‌ها) با زمان انقضا کش می‌شود و با آپدیت‌های تغییر ادمین باطل می‌شود.
+admin_rights = keep('admin_rights', lambda: AdminRightsService(client))
+if not is_reloading():
+    admin_rights.install()
+
+# اطلاعات کامل چت (تعداد اعضا، پیام پین شده، توضیحات) با زمان انقضا؛ پین/آنپین و ویرایش چت آن را به‌روز می‌کنند.
+chat_meta = keep('chat_meta', lambda: ChatMetaCache(client))
+if not is_reloading():
+    chat_meta.install()
+
+# پروفایل کامل کاربران (بیو، عکس فعلی، تعداد عکس‌ها) با زمان انقضا؛ بین .whois، .pfp و .id مشترک است.
+full_users = keep('full_users', lambda: FullUserCache(client, entity_cache))
+
+# وضعیت پاکسازی‌های نیمه‌کاره (.purge) برای ادامه با .purge resume
+purge_checkpoints = keep('purge_checkpoints', lambda: CheckpointStore('purge_state.json'))
+
+# کش آپلود بر اساس محتوای فایل (SHA-256): ارسال دوباره همان فایل فقط یک درخواست است، بدون آپلود مجدد.
+upload_cache = keep('upload_cache', lambda: UploadCache(client))
+
+# نام چند صد شناسه (لیست‌های منشی و ریاکشن) با درخواست‌های دسته‌ای و همزمان دریافت می‌شود، نه یکی‌یکی.
+batch_resolver = keep('batch_resolver', lambda: BatchResolver(client, entity_cache))
+
+# تنظیمات و جدول‌های پلاگین‌ها؛ هر پلاگین جدول‌های خودش را هنگام بارگذاری می‌سازد.
+settings = keep('settings', lambda: SettingsDB(DB_NAME))
+
+# ماشین حساب .calc: ارزیاب AST با محدودیت توان، اندازه عدد، تعداد عملیات و زمان؛ متغیرها بین دفعات اجرا باقی می‌مانند.
+calculator = keep('calculator', Calculator)
+startup_profiler.mark('client + services')
 
 # --- متغیرهای سراسری برای وضعیت‌ها و داده‌ها ---
 AFK_STATUS = False
@@ -137,6 +186,54 @@ AFK_REASON = ""
 AFK_START_TIME = None
 LAST_SEEN_MESSAGE = {} # ذخیره آخرین پیام دیده شده در هر چت برای دستور afk_auto_reply
 DISABLED_CHATS = set() # چت‌هایی که AFK در آنها غیرفعال است (برای جلوگیری از اسپم در گروه‌های بزرگ)
+AEXEC_TASKS = {} # شناسه پیام .aexec -> task در حال اجرا (برای .aexec cancel)
+
+# متغیرهای وضعیتی که .reload مقدار فعلی‌شان را نگه می‌دارد (بقیه با اجرای دوباره کد مقداردهی می‌شوند)
+RELOAD_PRESERVE = ('AFK_STATUS', 'AFK_REASON', 'AFK_START_TIME', 'LAST_SEEN_MESSAGE', 'DISABLED_CHATS', 'SCRIPT_START_TIME', 'AEXEC_TASKS')
+
+# وضعیت AFK، آخرین پیام پاسخ داده شده در هر چت و کش اطلاعات چت‌ها در یک فایل نسخه‌دار ذخیره می‌شوند
+# (هر ۳۰ ثانیه، هنگام خاموشی و قبل از .restart) و هنگام شروع در چند میلی‌ثانیه بازیابی می‌شوند؛
+# پس از ری‌استارت یا کرش، به کسانی که قبلاً پاسخ AFK گرفته‌اند دوباره پاسخ داده نمی‌شود.
+state_snapshot = keep('state_snapshot', lambda: StateSnapshot('state_snapshot.json'))
+
+def _dump_afk_state():
+    """وضعیت AFK را به شکل داده JSON برای snapshot برمی‌گرداند."""
+    return {
+        'status': AFK_STATUS,
+        'reason': AFK_REASON,
+        'start': AFK_START_TIME.timestamp() if AFK_START_TIME else None,
+        'last_seen': LAST_SEEN_MESSAGE,
+        'disabled': sorted(DISABLED_CHATS),
+    }
+
+def _load_afk_state(data):
+    """وضعیت AFK را از snapshot بازیابی می‌کند (کلیدهای JSON رشته هستند و به شناسه عددی برگردانده می‌شوند)."""
+    global AFK_STATUS, AFK_REASON, AFK_START_TIME
+    AFK_STATUS = data['status']
+    AFK_REASON = data['reason']
+    AFK_START_TIME = datetime.datetime.fromtimestamp(data['start']) if data['start'] else None
+    LAST_SEEN_MESSAGE.update({int(chat_id): msg_id for chat_id, msg_id in data['last_seen'].items()})
+    DISABLED_CHATS.update(data['disabled'])
+
+state_snapshot.register('afk', _dump_afk_state, _load_afk_state)
+state_snapshot.register('chat_meta', chat_meta.dump, chat_meta.load)
+state_snapshot.register('calc', calculator.dump, calculator.load)
+
+# دستورات پلاگین‌ها (مدیریت گروه، پروفایل، منشی، ...) از روی manifest شناخته می‌شوند و ماژول هر پلاگین در اولین استفاده import می‌شود.
+# پلاگین‌هایی که به آپدیت‌ها گوش می‌دهند (startup) همین‌جا بارگذاری می‌شوند تا بخش‌های snapshot آنها قبل از restore ثبت شود.
+plugins = PluginRegistry(PluginContext(
+    client, entity_cache=entity_cache, admin_rights=admin_rights, chat_meta=chat_meta, full_users=full_users,
+    upload_cache=upload_cache, batch_resolver=batch_resolver, settings=settings, snapshot=state_snapshot,
+    config={
+        'owm_api_key': OWM_API_KEY,
+        'omdb_api_key': OMDB_API_KEY,
+        'transfer_connections': TRANSFER_CONNECTIONS,
+        'download_concurrency': DOWNLOAD_CONCURRENCY,
+        'download_dir': DOWNLOAD_DIR,
+    },
+), enabled=ENABLED_PLUGINS)
+if not is_reloading():
+    plugins.load_startup() # پس از .reload، reload_command آنها را دوباره بارگذاری می‌کند
 
 # --- توابع کمکی (Helper Functions) ---
 
@@ -147,22 +244,25 @@ async def get_target_entity(event, input_param=None):
     """
     if input_param:
         try:
-            return await client.get_entity(input_param)
+            return await entity_cache.get(input_param)
         except (ValueError, PeerIdInvalidError, UsernameNotOccupiedError):
             return None
     elif event.is_reply:
         try:
             replied_message = await event.get_reply_message()
+            if replied_message.sender: # entity همراه آپدیت آمده و نیازی به درخواست شبکه نیست
+                entity_cache.put(replied_message.sender)
+                return replied_message.sender
             if replied_message.sender_id:
-                return await client.get_entity(replied_message.sender_id)
+                return await entity_cache.get(replied_message.sender_id)
             else: # در صورتی که پیام از کانال یا بات باشد و sender_id مشخص نباشد
-                return await client.get_entity(replied_message.peer_id)
+                return await entity_cache.get(utils.get_peer_id(replied_message.peer_id))
         except Exception:
             return None
     elif event.is_private:
-        return await client.get_entity(event.chat_id)
+        return await entity_cache.get(event.chat_id)
     else:
-        return await client.get_entity(event.sender_id)
+        return await entity_cache.get(event.sender_id)
 
 async def get_chat_entity_from_event(event, input_param=None):
     """
@@ -170,7 +270,7 @@ async def get_chat_entity_from_event(event, input_param=None):
     """
     if input_param:
         try:
-            return await client.get_entity(input_param)
+            return await entity_cache.get(input_param)
         except (ValueError, PeerIdInvalidError, UsernameNotOccupiedError):
             return None
     return await event.get_chat()
@@ -204,20 +304,6 @@ def human_readable_time(seconds):
         return "همین الان"
     return ", ".join(parts)
 
-async def get_admin_rights(chat_id, user_id):
-    """
-    حقوق ادمین یک کاربر در چت/کانال را برمی‌گرداند.
-    """
-    try:
-        participants = await client(ChannelParticipantsAdmins(chat_id, offset=0, limit=100))
-        for p in participants.participants:
-            if p.user_id == user_id:
-                return p.admin_rights
-        return None
-    except Exception as e:
-        logger.error(f"خطا در دریافت حقوق ادمین برای {user_id} در چت {chat_id}: {e}")
-        return None
-
 # --- دستورات اصلی ---
 
 @client.on(events.NewMessage(pattern=r'^\.ping(?:@\w+)?$', outgoing=True))
@@ -330,15 +416,8 @@ async def delete_message_command(event):
         if event.is_private or replied_message.sender_id == OWNER_ID:
             can_delete = True
         elif event.is_group or event.is_channel:
-            # فقط در چت‌هایی که از نوع کانال (گروه سوپرگروه) هستند می‌توانیم حقوق ادمین را بررسی کنیم
-            try:
-                chat_full = await client(GetFullChannelRequest(event.chat_id))
-                my_participant = await client.get_participant(event.chat_id, OWNER_ID)
-                if isinstance(my_participant, (ChannelParticipantAdmin, ChannelParticipantCreator)):
-                    if my_participant.admin_rights and my_participant.admin_rights.delete_messages:
-                        can_delete = True
-            except (UserNotParticipantError, UserAdminInvalidError, ChannelPrivateError):
-                pass # در گروه های معمولی یا اگر ادمین نیستید، این متد کار نمی کند یا نیاز به بررسی متفاوت دارد
+            # حقوق ما در این چت از کش خوانده می‌شود (سازنده همه حقوق را دارد)
+            can_delete = await admin_rights.can(event.chat_id, 'delete_messages')
 
         if can_delete:
             await client.delete_messages(event.chat_id, [replied_message.id, event.message.id])
@@ -352,51 +431,149 @@ async def delete_message_command(event):
         logger.error(f"خطا در اجرای دستور .del: {e}")
         await event.edit(f"خطا در حذف پیام: `{e}`")
 
-@client.on(events.NewMessage(pattern=r'^\.purge(?: (\d+))?(?:@\w+)?$', outgoing=True))
+@client.on(events.NewMessage(pattern=r'^\.purge(?: (\d+|from-reply|resume))?(?:@\w+)?$', outgoing=True))
 async def purge_messages_command(event):
     """
     .purge [تعداد]: N پیام آخر ارسالی شما را پاک می‌کند. اگر تعداد مشخص نشود، ۱۰ پیام.
+    .purge from-reply: همه پیام‌های شما از پیام ریپلای شده تا الان را پاک می‌کند.
+    .purge resume: پاکسازی نیمه‌کاره قبلی در این چت را ادامه می‌دهد.
+    پیام‌ها صفحه به صفحه با فیلتر فرستنده در سمت سرور خوانده و در دسته‌های ۱۰۰تایی همزمان با خواندن پاک می‌شوند.
     """
     if event.sender_id != OWNER_ID:
         return
 
+    chat_id = event.chat_id
+    mode = event.pattern_match.group(1) or '10' # پیش‌فرض ۱۰ پیام
+    progress = ProgressReporter(event, "🗑️ پاکسازی پیام‌های شما", unit='پیام')
     try:
-        count_str = event.pattern_match.group(1)
-        count = int(count_str) if count_str else 10 # پیش‌فرض ۱۰ پیام
-
-        if count <= 0:
-            await event.edit("لطفاً یک عدد مثبت برای تعداد پیام‌ها وارد کنید.")
-            return
-        
-        # تلگرام محدودیت در تعداد پیام‌های قابل حذف در یک درخواست دارد
-        if count > 100:
-            await event.edit("برای جلوگیری از خطا، حداکثر ۱۰۰ پیام را می‌توان در هر بار پاکسازی کرد.")
-            count = 100
-
-        await event.edit(f"در حال پاکسازی {count} پیام آخر شما...")
-
-        chat_id = event.chat_id
-        messages_to_delete_ids = []
-        # +1 برای حذف خود دستور .purge
-        async for msg in client.iter_messages(chat_id, limit=count + 1, from_user=OWNER_ID):
-            messages_to_delete_ids.append(msg.id)
-            if len(messages_to_delete_ids) >= count + 1:
-                break
-        
-        if not messages_to_delete_ids:
-            await event.edit("هیچ پیامی برای پاک کردن پیدا نشد.")
-            return
-
-        # حذف پیام‌ها
-        await client.delete_messages(chat_id, messages_to_delete_ids)
-        await client.send_message(chat_id, f"✅ `{len(messages_to_delete_ids) - 1}` پیام آخر شما پاک شد.", delete_in=3) # ارسال پیام تایید و حذف آن پس از ۳ ثانیه
-        logger.info(f"دستور .purge با موفقیت اجرا شد. {len(messages_to_delete_ids)} پیام در چت {chat_id} حذف شد.")
+        if mode == 'resume':
+            state = purge_checkpoints.get(chat_id)
+            if not state:
+                await event.edit("هیچ پاکسازی نیمه‌کاره‌ای برای این چت ثبت نشده است.")
+                return
+        elif mode == 'from-reply':
+            if not event.is_reply:
+                await event.edit("برای `.purge from-reply` روی اولین پیامی که باید پاک شود ریپلای کنید.")
+                return
+            # min_id انحصاری است، پس خود پیام ریپلای شده هم شامل می‌شود
+            state = {'offset_id': event.id, 'min_id': event.reply_to_msg_id - 1, 'remaining': None, 'deleted': 0}
+        else:
+            count = int(mode)
+            if count <= 0:
+                await event.edit("لطفاً یک عدد مثبت برای تعداد پیام‌ها وارد کنید.")
+                return
+            state = {'offset_id': event.id, 'min_id': 0, 'remaining': count, 'deleted': 0}
+        purge_checkpoints.set(chat_id, state)
+
+        await event.edit("در حال پاکسازی پیام‌های شما... 🗑️")
+        if state['remaining'] is not None:
+            progress.total = state['deleted'] + state['remaining']
+
+        def save_checkpoint(oldest_done_id, deleted):
+            remaining = state['remaining'] - deleted if state['remaining'] is not None else None
+            purge_checkpoints.set(chat_id, {'offset_id': oldest_done_id, 'min_id': state['min_id'],
+                                            'remaining': remaining, 'deleted': state['deleted'] + deleted})
+
+        deleter = PipelinedDeleter(client, chat_id, on_progress=lambda deleted, seen: progress(state['deleted'] + deleted),
+                                   on_checkpoint=save_checkpoint)
+        # offset_id باعث می‌شود فقط پیام‌های قدیمی‌تر از خود دستور (یا آخرین نقطه ذخیره شده) خوانده شوند
+        ids = message_ids(client, chat_id, limit=state['remaining'], offset_id=state['offset_id'],
+                          min_id=state['min_id'], from_user='me', wait_time=0)
+        deleted = await deleter.run(ids)
+        purge_checkpoints.clear(chat_id)
+
+        total = state['deleted'] + deleted
+        await progress.finish()
+        await event.delete()
+        confirmation = await client.send_message(chat_id, f"✅ `{total}` پیام شما پاک شد.")
+        logger.info(f"دستور .purge با موفقیت اجرا شد. {total} پیام در چت {chat_id} حذف شد.")
+        await asyncio.sleep(3) # حذف پیام تایید پس از ۳ ثانیه
+        await confirmation.delete()
     except MessageDeleteForbiddenError:
-        logger.warning(f"خطا: اجازه حذف برخی پیام‌ها در چت {event.chat_id} وجود ندارد (خیلی قدیمی یا ادمین نیستید).")
-        await event.edit("خطا: اجازه حذف برخی از این پیام‌ها را ندارید (ممکن است خیلی قدیمی باشند یا ادمین نباشید).")
+        logger.warning(f"خطا: اجازه حذف برخی پیام‌ها در چت {chat_id} وجود ندارد (خیلی قدیمی یا ادمین نیستید).")
+        await progress.finish("خطا: اجازه حذف برخی از این پیام‌ها را ندارید (ممکن است خیلی قدیمی باشند یا ادمین نباشید).\n"
+                         "برای ادامه از همان نقطه: `.purge resume`")
     except Exception as e:
         logger.error(f"خطا در اجرای دستور .purge: {e}")
-        await event.edit(f"خطا در پاکسازی پیام‌ها: `{e}`")
+        await progress.finish(f"خطا در پاکسازی پیام‌ها: `{e}`\nبرای ادامه از همان نقطه: `.purge resume`")
+
+@client.on(events.NewMessage(pattern=r'^\.gpurge(?:\s+(.+))?$', outgoing=True))
+async def global_purge_command(event):
+    """
+    .gpurge [--since YYYY-MM-DD] [--match متن] [--pm]: پیام‌های شما را در همه گروه‌ها پاک می‌کند.
+    در هر گروه از جستجوی سمت سرور با فیلتر فرستنده (و متن) استفاده می‌شود، نه خواندن کل تاریخچه.
+    چند چت همزمان پردازش می‌شوند؛ محدودیت نرخ هر چت را صف ارسال رعایت می‌کند.
+    --pm چت‌های خصوصی را هم شامل می‌کند (تلگرام آنجا فیلتر فرستنده را نادیده می‌گیرد و تاریخچه کامل خوانده می‌شود).
+    """
+    if event.sender_id != OWNER_ID:
+        return
+
+    try:
+        args = shlex.split(event.pattern_match.group(1) or '')
+        since, match, include_pms = None, None, False
+        i = 0
+        while i < len(args):
+            if args[i] == '--since' and i + 1 < len(args):
+                since = datetime.datetime.strptime(args[i + 1], '%Y-%m-%d').replace(tzinfo=datetime.timezone.utc)
+                i += 2
+            elif args[i] == '--match' and i + 1 < len(args):
+                match = args[i + 1]
+                i += 2
+            elif args[i] == '--pm':
+                include_pms = True
+                i += 1
+            else:
+                await event.edit("استفاده: `.gpurge [--since YYYY-MM-DD] [--match متن] [--pm]`")
+                return
+    except ValueError as e:
+        await event.edit(f"آرگومان نامعتبر: `{e}`\nاستفاده: `.gpurge [--since YYYY-MM-DD] [--match متن] [--pm]`")
+        return
+
+    try:
+        await event.edit("در حال جمع‌آوری لیست چت‌ها... 🔍")
+        chats = []
+        async for dialog in client.iter_dialogs():
+            if dialog.is_group or (include_pms and dialog.is_user and dialog.id != OWNER_ID):
+                chats.append((dialog.id, dialog.name))
+
+        semaphore = asyncio.Semaphore(4) # حداکثر ۴ چت همزمان
+        results = {} # chat_id -> (name, deleted, error)
+        progress = ProgressReporter(event, "🗑️ پاکسازی سراسری", total=len(chats), unit='چت')
+
+        async def purge_chat(chat_id, name):
+            async with semaphore:
+                deleter = PipelinedDeleter(client, chat_id)
+                # پیام خود دستور در چت فعلی پاک نمی‌شود تا گزارش روی آن نوشته شود
+                offset_id = event.id if chat_id == event.chat_id else 0
+                ids = message_ids(client, chat_id, since=since, from_user='me', search=match,
+                                  offset_id=offset_id, wait_time=0)
+                try:
+                    results[chat_id] = (name, await deleter.run(ids), None)
+                except Exception as e:
+                    logger.warning(f"خطا در پاکسازی چت {chat_id}: {e}")
+                    results[chat_id] = (name, deleter.deleted, e)
+            progress.stage = f"پیام‌های پاک شده: {sum(r[1] for r in results.values())}"
+            progress(len(results))
+
+        started = time.monotonic()
+        with background(): # دستورات دیگر بر این کار طولانی مقدم هستند
+            await asyncio.gather(*(purge_chat(chat_id, name) for chat_id, name in chats))
+
+        touched = sorted((r for r in results.values() if r[1] or r[2]), key=lambda r: -r[1])
+        total = sum(r[1] for r in touched)
+        failed = sum(1 for r in touched if r[2])
+        header = (f"✅ **پاکسازی سراسری تمام شد** ({time.monotonic() - started:.0f} ثانیه)\n"
+                  f"چت‌های بررسی شده: `{len(chats)}` | پیام‌های پاک شده: `{total}` | چت‌های ناموفق: `{failed}`\n")
+        lines = [f"• {name}: `{deleted}`" + (f" ⚠️ `{error}`" if error else "") for name, deleted, error in touched]
+        pages = split_digest(header, lines, separator='\n')
+        await progress.finish(pages[0].strip())
+        for page in pages[1:]:
+            await event.respond(page.strip())
+        logger.info(f"دستور .gpurge اجرا شد: {total} پیام در {len(chats)} چت پاک شد ({failed} خطا).")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .gpurge: {e}")
+        await event.edit(f"خطا در پاکسازی سراسری: `{e}`")
+
 
 @client.on(events.NewMessage(pattern=r'^\.readall(?:@\w+)?$', outgoing=True))
 async def read_all_messages_command(event):
@@ -514,37 +691,39 @@ async def afk_auto_reply_handler(event):
     if sender and sender.bot:
         return
 
-    try:
-        duration = datetime.datetime.now() - AFK_START_TIME if AFK_START_TIME else "ناشناخته"
-        afk_duration_text = f"به مدت **{human_readable_time(duration.total_seconds())}**" if isinstance(duration, datetime.timedelta) else str(duration)
-
-        response_text = (
-            f"سلام، من در حال حاضر AFK هستم. 😴\n"
-            f"**دلیل:** `{AFK_REASON}`\n"
-            f"**مدت زمان AFK:** {afk_duration_text}\n"
-            f"به محض بازگشت پاسخ خواهم داد."
-        )
+    # پاسخ‌های خودکار کار پس‌زمینه هستند و پس از پاسخ دستورات ارسال می‌شوند.
+    with background():
+        try:
+            duration = datetime.datetime.now() - AFK_START_TIME if AFK_START_TIME else "ناشناخته"
+            afk_duration_text = f"به مدت **{human_readable_time(duration.total_seconds())}**" if isinstance(duration, datetime.timedelta) else str(duration)
+
+            response_text = (
+                f"سلام، من در حال حاضر AFK هستم. 😴\n"
+                f"**دلیل:** `{AFK_REASON}`\n"
+                f"**مدت زمان AFK:** {afk_duration_text}\n"
+                f"به محض بازگشت پاسخ خواهم داد."
+            )
         
-        # در گروه‌ها، اگر روی پیام ما ریپلای شده باشد یا ما تگ شده باشیم، پاسخ می‌دهیم.
-        if event.is_group:
-            if event.is_reply and (await event.get_reply_message()).sender_id == OWNER_ID:
-                await event.reply(response_text)
-                LAST_SEEN_MESSAGE[event.chat_id] = event.message.id
-                logger.info(f"پاسخ AFK به {event.sender_id} در گروه {event.chat_id} (ریپلای) ارسال شد.")
-            elif f"@{ (await client.get_me()).username }" in event.raw_text: # اگر یوزرنیم ما تگ شده باشد
+            # در گروه‌ها، اگر روی پیام ما ریپلای شده باشد یا ما تگ شده باشیم، پاسخ می‌دهیم.
+            if event.is_group:
+                if event.is_reply and (await event.get_reply_message()).sender_id == OWNER_ID:
+                    await event.reply(response_text)
+                    LAST_SEEN_MESSAGE[event.chat_id] = event.message.id
+                    logger.info(f"پاسخ AFK به {event.sender_id} در گروه {event.chat_id} (ریپلای) ارسال شد.")
+                elif f"@{ (await client.get_me()).username }" in event.raw_text: # اگر یوزرنیم ما تگ شده باشد
+                    await event.reply(response_text)
+                    LAST_SEEN_MESSAGE[event.chat_id] = event.message.id
+                    logger.info(f"پاسخ AFK به {event.sender_id} در گروه {event.chat_id} (تگ) ارسال شد.")
+            elif event.is_private:
                 await event.reply(response_text)
                 LAST_SEEN_MESSAGE[event.chat_id] = event.message.id
-                logger.info(f"پاسخ AFK به {event.sender_id} در گروه {event.chat_id} (تگ) ارسال شد.")
-        elif event.is_private:
-            await event.reply(response_text)
-            LAST_SEEN_MESSAGE[event.chat_id] = event.message.id
-            logger.info(f"پاسخ AFK به {event.sender_id} در چت خصوصی ارسال شد.")
-
-    except YouBlockedUserError:
-        logger.warning(f"ربات AFK نتوانست به کاربر {event.sender_id} پاسخ دهد: کاربر ربات را بلاک کرده.")
-    except Exception as e:
-        logger.error(f"خطا در ارسال پاسخ AFK به {event.sender_id} در چت {event.chat_id}: {e}")
-        pass # پیام خطا را در چت ارسال نمی‌کنیم تا مزاحمت ایجاد نشود
+                logger.info(f"پاسخ AFK به {event.sender_id} در چت خصوصی ارسال شد.")
+
+        except YouBlockedUserError:
+            logger.warning(f"ربات AFK نتوانست به کاربر {event.sender_id} پاسخ دهد: کاربر ربات را بلاک کرده.")
+        except Exception as e:
+            logger.error(f"خطا در ارسال پاسخ AFK به {event.sender_id} در چت {event.chat_id}: {e}")
+            pass # پیام خطا را در چت ارسال نمی‌کنیم تا مزاحمت ایجاد نشود
 
 
 @client.on(events.NewMessage(pattern=r'^\.afkignore(?:@\w+)?$', outgoing=True))
@@ -685,39 +864,38 @@ async def lowercase_command(event):
         logger.error(f"خطا در اجرای دستور .lowcase: {e}")
         await event.edit(f"خطا در تبدیل به حروف کوچک: `{e}`")
 
-@client.on(events.NewMessage(pattern=r'^\.calc (.*)(?:@\w+)?$', outgoing=True))
+@client.on(events.NewMessage(pattern=r'^\.calc(?: (.*))?(?:@\w+)?$', outgoing=True))
 async def calculate_command(event):
     """
-    .calc <عبارت ریاضی>: یک عبارت ریاضی ساده را محاسبه می‌کند.
-    برای امنیت، فقط از عملیات پایه و توابع math استفاده می‌شود.
+    .calc <عبارت ریاضی>: عبارت را با ارزیاب محدود (selfbot.calculator) محاسبه می‌کند.
+    `.calc x = 2*3` متغیر می‌سازد که در دفعات بعد قابل استفاده است و `ans` نتیجه قبلی است.
+    `.calc` بدون عبارت، متغیرهای تعریف شده را نشان می‌دهد.
     """
     if event.sender_id != OWNER_ID:
         return
 
-    expression = event.pattern_match.group(1)
-    
-    # لیست توابع/مقادیر ایمن که می‌توانند استفاده شوند
-    safe_dict = {
-        'sqrt': math.sqrt, 'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
-        'log': math.log, 'log10': math.log10, 'pi': math.pi, 'e': math.e,
-        'abs': abs, 'round': round, 'sum': sum, 'max': max, 'min': min,
-        'pow': pow, 'len': len # اضافه کردن توابع مفید دیگر
-    }
-    
-    try:
-        # فیلتر کردن عبارت برای حذف هر چیزی که غیر از اعداد، عملگرهای ریاضی و توابع امن باشد
-        # این یک فیلتر قوی است اما ممکن است برخی عبارات معتبر را هم رد کند.
-        # راه حل ایده‌آل یک parser ریاضی کامل است که فراتر از scope این اسکریپت است.
-        
-        # تنها کاراکترهای مجاز را در عبارت نگه دارید. این کار امنیتی مهم است.
-        allowed_chars = "0123456789.+-*/()% " + "".join(c for c in safe_dict.keys())
-        filtered_expression = "".join(c for c in expression if c in allowed_chars)
-
-        # ارزیابی عبارت در یک محیط محدود شده
-        result = eval(filtered_expression, {"__builtins__": None}, safe_dict)
-        await event.edit(f'نتیجه: `{result}`')
-        logger.info(f"دستور .calc با موفقیت اجرا شد. عبارت: '{expression}', نتیجه: {result}")
-    except (SyntaxError, NameError, TypeError, ValueError, ZeroDivisionError) as e:
+    expression = (event.pattern_match.group(1) or "").strip()
+    if not expression:
+        if not calculator.variables:
+            await event.edit("هیچ متغیری تعریف نشده است. مثال: `.calc x = 2*3`")
+            return
+        lines = [f"`{name} = {value}`" for name, value in calculator.variables.items()]
+        await event.edit("**متغیرهای ماشین حساب:**\n" + "\n".join(lines))
+        return
+
+    try:
+        # محاسبه در thread pool انجام می‌شود تا حلقه رویداد هرگز منتظر آن نماند؛
+        # ارزیاب خودش محدودیت زمان و تعداد عملیات را اعمال می‌کند.
+        loop = asyncio.get_running_loop()
+        name, result = await loop.run_in_executor(None, calculator.evaluate, expression)
+        text = f"`{name} = {result}`" if name else f'نتیجه: `{result}`'
+        if len(text) > 4000:
+            text = f"نتیجه ({len(str(result))} کاراکتر) برای نمایش طولانی است؛ در `ans` ذخیره شد."
+        await event.edit(text)
+        logger.info(f"دستور .calc با موفقیت اجرا شد. عبارت: '{expression}'")
+    except CalcError as e:
+        await event.edit(f'عبارت پذیرفته نشد: {e}')
+    except (TypeError, ValueError, ZeroDivisionError, OverflowError) as e:
         logger.error(f"خطا در محاسبه عبارت '{expression}': {e}")
         await event.edit(f'خطا در عبارت ریاضی: `{e}`')
     except Exception as e:
@@ -867,49 +1045,6 @@ async def time_command(event):
         await event.edit(f"خطا در دریافت زمان: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.google (.*)(?:@\w+)?$', outgoing=True))
-async def google_search_command(event):
-    """
-    .google <عبارت جستجو>: یک لینک جستجوی گوگل برای عبارت مورد نظر ایجاد می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    query = event.pattern_match.group(1)
-    if not query:
-        await event.edit("لطفاً عبارتی برای جستجو وارد کنید.")
-        return
-
-    search_url = f"https://www.google.com/search?q={requests.utils.quote(query)}"
-    try:
-        await event.edit(f"نتیجه جستجوی گوگل برای '{query}':\n[اینجا کلیک کنید]({search_url})")
-        logger.info(f"دستور .google با موفقیت اجرا شد برای: '{query}'")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .google: {e}")
-        await event.edit(f"خطا در ایجاد لینک جستجو: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.ddg (.*)(?:@\w+)?$', outgoing=True))
-async def duckduckgo_search_command(event):
-    """
-    .ddg <عبارت جستجو>: یک لینک جستجوی DuckDuckGo برای عبارت مورد نظر ایجاد می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    query = event.pattern_match.group(1)
-    if not query:
-        await event.edit("لطفاً عبارتی برای جستجو وارد کنید.")
-        return
-
-    search_url = f"https://duckduckgo.com/?q={requests.utils.quote(query)}"
-    try:
-        await event.edit(f"نتیجه جستجوی DuckDuckGo برای '{query}':\n[اینجا کلیک کنید]({search_url})")
-        logger.info(f"دستور .ddg با موفقیت اجرا شد برای: '{query}'")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .ddg: {e}")
-        await event.edit(f"خطا در ایجاد لینک جستجو: `{e}`")
-
-
 @client.on(events.NewMessage(pattern=r'^\.id(?:@\w+)?$', outgoing=True))
 async def get_target_id_command(event):
     """
@@ -923,7 +1058,11 @@ async def get_target_id_command(event):
 
         if target_entity:
             if isinstance(target_entity, User):
-                await event.edit(f"User ID کاربر: `{target_entity.id}`\nنام: {target_entity.first_name}")
+                text = f"User ID کاربر: `{target_entity.id}`\nنام: {target_entity.first_name}"
+                profile = full_users.peek(target_entity.id) # اگر .whois/.pfp قبلاً پروفایل را گرفته باشد، بدون درخواست شبکه
+                if profile and profile.full_user.common_chats_count:
+                    text += f"\nگروه‌های مشترک: {profile.full_user.common_chats_count}"
+                await event.edit(text)
             elif isinstance(target_entity, (Chat, Channel)):
                 await event.edit(f"Chat ID: `{target_entity.id}`\nعنوان: {target_entity.title}")
             else:
@@ -959,46 +1098,68 @@ async def get_target_username_command(event):
         logger.error(f"خطا در اجرای دستور .username: {e}")
         await event.edit(f"خطا در دریافت یوزرنیم: `{e}`")
 
+def format_user_profile(profile):
+    """
+    متن اطلاعات یک کاربر را از پروفایل کش شده (UserProfile) می‌سازد.
+    """
+    user, full_user = profile.user, profile.full_user
+    return (
+        f"**اطلاعات کاربر:**\n"
+        f"نام: {user.first_name or ''} {user.last_name or ''}\n"
+        f"یوزرنیم: @{user.username or 'ندارد'}\n"
+        f"آیدی کاربری: `{user.id}`\n"
+        f"دسترسی‌ها: {('محدود' if user.restricted else 'عادی')}\n"
+        f"وضعیت ربات: {('بله' if user.bot else 'خیر')}\n"
+        f"تأیید شده: {('بله' if user.verified else 'خیر')}\n"
+        f"ساخته شده توسط تلگرام: {('بله' if user.support else 'خیر')}\n"
+        f"وضعیت آنلاین: {('آنلاین' if isinstance(user.status, UserStatusOnline) else 'آفلاین')}\n"
+        f"عکس پروفایل: {profile.photo_count if profile.photo_count is not None else 'نامشخص'} عدد\n"
+        f"گروه‌های مشترک: {full_user.common_chats_count}\n"
+        f"پروفایل: [لینک](tg://user?id={user.id})\n"
+        f"شماره تلفن: `{user.phone or 'مخفی/ندارد'}`\n"
+        f"بیو: {full_user.about or 'ندارد'}"
+    )
+
 @client.on(events.NewMessage(pattern=r'^\.whois (.*)(?:@\w+)?$', outgoing=True))
 @client.on(events.NewMessage(pattern=r'^\.whois(?:@\w+)?$', outgoing=True))
 async def whois_command(event):
     """
     .whois [یوزرنیم/آیدی/ریپلای]: اطلاعات یک کاربر را نمایش می‌دهد.
+    .whois @a @b 123: اطلاعات چند کاربر را به صورت موازی در یک پیام نمایش می‌دهد.
     """
     if event.sender_id != OWNER_ID:
         return
 
     try:
         input_param = event.pattern_match.group(1) if event.pattern_match and event.pattern_match.groups() else None
-        target_entity = await get_target_entity(event, input_param)
+        # چند کاربر را می‌توان با فاصله یا کاما جدا کرد؛ همه به صورت موازی بررسی می‌شوند.
+        params = [p for p in re.split(r'[\s,]+', input_param or '') if p] or [None]
+        targets = await asyncio.gather(*(get_target_entity(event, p) for p in params))
 
-        if not target_entity or not isinstance(target_entity, User):
+        users = [t for t in targets if isinstance(t, User)]
+        if not users:
             await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم. لطفاً یوزرنیم، آیدی یا روی پیام ریپلای کنید.")
             return
-
-        full_user = await client(GetFullUserRequest(target_entity.id))
-        user = full_user.user
-        
-        # اطلاعات دقیق‌تر
-        profile_photos_count = await client.get_profile_photos(user, limit=0, count=True)
-
-        response = (
-            f"**اطلاعات کاربر:**\n"
-            f"نام: {user.first_name} {user.last_name or ''}\n"
-            f"یوزرنیم: @{user.username or 'ندارد'}\n"
-            f"آیدی کاربری: `{user.id}`\n"
-            f"دسترسی‌ها: {('محدود' if user.restricted else 'عادی')}\n"
-            f"وضعیت ربات: {('بله' if user.bot else 'خیر')}\n"
-            f"تأیید شده: {('بله' if user.verified else 'خیر')}\n"
-            f"ساخته شده توسط تلگرام: {('بله' if user.min else 'خیر')}\n"
-            f"وضعیت آنلاین: {('آنلاین' if user.status and hasattr(user.status, 'expires') and (user.status.expires is None or user.status.expires > datetime.datetime.now()) else 'آفلاین')}\n"
-            f"عکس پروفایل: {profile_photos_count} عدد\n"
-            f"پروفایل: [لینک](tg://user?id={user.id})\n"
-            f"شماره تلفن: `{full_user.full_user.phone_numbers[0] if full_user.full_user.phone_numbers else 'مخفی/ندارد'}`\n"
-            f"بیو: {full_user.full_user.about or 'ندارد'}"
-        )
-        await event.edit(response, parse_mode='md')
-        logger.info(f"دستور .whois با موفقیت اجرا شد برای کاربر: {user.id}")
+        if len(params) > 1:
+            await event.edit(f"در حال دریافت اطلاعات {len(users)} کاربر... 🔍")
+
+        profiles = await full_users.get_many(users, photo_count=True)
+        sections = []
+        for param, target in zip(params, targets):
+            if not isinstance(target, User):
+                sections.append(f"**{param}:** کاربر پیدا نشد.")
+                continue
+            profile = profiles[users.index(target)]
+            if isinstance(profile, Exception):
+                sections.append(f"**{param or target.id}:** خطا در دریافت اطلاعات: `{profile}`")
+                continue
+            sections.append(format_user_profile(profile))
+
+        pages = split_digest("", sections)
+        await event.edit(pages[0].strip(), parse_mode='md')
+        for page in pages[1:]:
+            await event.respond(page.strip(), parse_mode='md')
+        logger.info(f"دستور .whois با موفقیت اجرا شد برای کاربران: {[u.id for u in users]}")
     except Exception as e:
         logger.error(f"خطا در اجرای دستور .whois: {e}")
         await event.edit(f"خطا در دریافت اطلاعات کاربر: `{e}`")
@@ -1020,17 +1181,18 @@ async def chat_info_command(event):
             await event.edit("نتوانستم چت مورد نظر را پیدا کنم یا ورودی یک چت نیست. لطفاً یوزرنیم، آیدی یا در داخل چت استفاده کنید.")
             return
 
-        full_chat = await client(GetFullChannelRequest(target_chat.id)) if isinstance(target_chat, Channel) else None
-        
+        meta = await chat_meta.get(target_chat)
+
         response = (
             f"**اطلاعات چت:**\n"
             f"عنوان: {target_chat.title}\n"
             f"آیدی چت: `{target_chat.id}`\n"
             f"نوع: {('کانال' if isinstance(target_chat, Channel) else 'گروه')}\n"
-            f"یوزرنیم: @{target_chat.username or 'ندارد'}\n"
-            f"اعضا: `{full_chat.full_chat.participants_count if full_chat else 'ناشناس'}`\n"
-            f"پین شده: `{full_chat.full_chat.pinned_msg_id if full_chat and full_chat.full_chat.pinned_msg_id else 'خیر'}`\n"
-            f"توضیحات: {full_chat.full_chat.about or 'ندارد' if full_chat else 'ندارد'}"
+            f"یوزرنیم: @{getattr(target_chat, 'username', None) or 'ندارد'}\n"
+            f"اعضا: `{meta.participants_count if meta.participants_count is not None else 'ناشناس'}`\n"
+            f"پین شده: `{meta.pinned_msg_id or 'خیر'}`\n"
+            f"چت متصل: `{meta.linked_chat_id or 'ندارد'}`\n"
+            f"توضیحات: {meta.about or 'ندارد'}"
         )
         await event.edit(response, parse_mode='md')
         logger.info(f"دستور .chatinfo با موفقیت اجرا شد برای چت: {target_chat.id}")
@@ -1039,106 +1201,6 @@ async def chat_info_command(event):
         await event.edit(f"خطا در دریافت اطلاعات چت: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.pfp(?:@\w+)?$', outgoing=True))
-async def get_profile_photo_command(event):
-    """
-    .pfp: عکس پروفایل کاربر ریپلای شده یا خودتان را ارسال می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    try:
-        target_entity = await get_target_entity(event)
-
-        if not target_entity or not isinstance(target_entity, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-
-        photos = await client.get_profile_photos(target_entity, limit=1)
-        if photos:
-            await client.send_file(event.chat_id, photos[0], caption=f"عکس پروفایل {target_entity.first_name}")
-            await event.delete() # پاک کردن دستور اصلی
-            logger.info(f"دستور .pfp با موفقیت اجرا شد برای کاربر: {target_entity.id}")
-        else:
-            await event.edit("این کاربر عکس پروفایل ندارد.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .pfp: {e}")
-        await event.edit(f"خطا در دریافت عکس پروفایل: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.setpfp (.*)(?:@\w+)?$', outgoing=True))
-async def set_profile_photo_command(event):
-    """
-    .setpfp <مسیر_فایل/لینک_عکس>: عکس پروفایل شما را تنظیم می‌کند.
-    مسیر فایل می‌تواند یک فایل محلی یا یک لینک مستقیم به عکس باشد.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    photo_input = event.pattern_match.group(1)
-    if not photo_input:
-        await event.edit("لطفاً مسیر فایل یا لینک عکس را وارد کنید.")
-        return
-
-    try:
-        await event.edit("در حال تنظیم عکس پروفایل...")
-        # اگر لینک باشد
-        if photo_input.startswith("http://") or photo_input.startswith("https://"):
-            if requests:
-                response = requests.get(photo_input, stream=True, timeout=10)
-                response.raise_for_status()
-                temp_file_path = "temp_pfp.jpg"
-                with open(temp_file_path, "wb") as f:
-                    for chunk in response.iter_content(8192):
-                        f.write(chunk)
-                await client(UploadProfilePhotoRequest(file=await client.upload_file(temp_file_path)))
-                os.remove(temp_file_path)
-            else:
-                await event.edit("ماژول 'requests' برای دانلود عکس از لینک نصب نیست.")
-                return
-        # اگر مسیر فایل محلی باشد
-        else:
-            if not os.path.exists(photo_input):
-                await event.edit(f"فایل یافت نشد: `{photo_input}`")
-                return
-            await client(UploadProfilePhotoRequest(file=await client.upload_file(photo_input)))
-
-        await event.edit("✅ عکس پروفایل با موفقیت تنظیم شد!")
-        logger.info(f"دستور .setpfp با موفقیت اجرا شد. عکس از: '{photo_input}'")
-    except PhotoCropSizeSmallError:
-        logger.error(f"خطا در تنظیم عکس پروفایل: عکس خیلی کوچک است.")
-        await event.edit("خطا: عکس خیلی کوچک است، لطفاً عکس بزرگتری را انتخاب کنید.")
-    except WebpageCurlFailedError:
-        logger.error(f"خطا در تنظیم عکس پروفایل: مشکل در دانلود لینک عکس.")
-        await event.edit("خطا در دانلود عکس از لینک. مطمئن شوید لینک معتبر است.")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"خطا در دانلود عکس از لینک با requests: {e}")
-        await event.edit(f"خطا در دانلود عکس از لینک: `{e}`")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .setpfp: {e}")
-        await event.edit(f"خطا در تنظیم عکس پروفایل: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.delpfp(?:@\w+)?$', outgoing=True))
-async def delete_profile_photo_command(event):
-    """
-    .delpfp: آخرین عکس پروفایل شما را حذف می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    try:
-        photos = await client.get_profile_photos('me', limit=1)
-        if photos:
-            await client(DeletePhotosRequest(id=[photos[0]]))
-            await event.edit("✅ آخرین عکس پروفایل شما حذف شد.")
-            logger.info("دستور .delpfp با موفقیت اجرا شد.")
-        else:
-            await event.edit("شما هیچ عکس پروفایلی برای حذف ندارید.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .delpfp: {e}")
-        await event.edit(f"خطا در حذف عکس پروفایل: `{e}`")
-
-
 @client.on(events.NewMessage(pattern=r'^\.react (.+)(?:@\w+)?$', outgoing=True))
 async def react_command(event):
     """
@@ -1161,191 +1223,6 @@ async def react_command(event):
         logger.error(f"خطا در اجرای دستور .react: {e}")
         await event.edit(f"خطا در واکنش نشان دادن: `{e}`")
 
-@client.on(events.NewMessage(pattern=r'^\.ud (.*)(?:@\w+)?$', outgoing=True))
-async def urban_dictionary_command(event):
-    """
-    .ud <کلمه>: معنی یک کلمه را از Urban Dictionary جستجو می‌کند (نیاز به requests).
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not requests:
-        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
-        return
-
-    term = event.pattern_match.group(1).strip()
-    if not term:
-        await event.edit("لطفاً کلمه‌ای برای جستجو در Urban Dictionary وارد کنید.")
-        return
-
-    url = f"http://api.urbandictionary.com/v0/define?term={term}"
-    try:
-        async with client.action(event.chat_id, 'typing'): # نمایش وضعیت "در حال تایپ"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            if data['list']:
-                definition = data['list'][0]['definition']
-                example = data['list'][0]['example']
-                await event.edit(
-                    f"**{term}**\n"
-                    f"**معنی:** `{definition}`\n"
-                    f"**مثال:** `{example}`"
-                )
-                logger.info(f"دستور .ud با موفقیت اجرا شد برای: '{term}'")
-            else:
-                await event.edit(f"معنایی برای '{term}' در Urban Dictionary یافت نشد.")
-    except requests.exceptions.Timeout:
-        logger.error(f"خطا: درخواست UD برای '{term}' به دلیل اتمام زمان انجام نشد.")
-        await event.edit("خطا: زمان درخواست Urban Dictionary به پایان رسید.")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"خطا در درخواست Urban Dictionary برای '{term}': {e}")
-        await event.edit(f"خطا در اتصال به Urban Dictionary: `{e}`")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .ud برای '{term}': {e}")
-        await event.edit(f"خطای ناشناخته در Urban Dictionary: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.weather (.*)(?:@\w+)?$', outgoing=True))
-async def weather_command(event):
-    """
-    .weather <شهر>: آب و هوای یک شهر را نمایش می‌دهد (نیاز به API Key از OpenWeatherMap و requests).
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not requests:
-        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
-        return
-
-    if OWM_API_KEY == 'YOUR_OPENWEATHERMAP_API_KEY_HERE' or not OWM_API_KEY:
-        await event.edit("خطا: API Key برای OpenWeatherMap تنظیم نشده است. لطفاً آن را در کد یا متغیر محیطی 'OWM_API_KEY' تنظیم کنید.")
-        return
-
-    city = event.pattern_match.group(1).strip()
-    if not city:
-        await event.edit("لطفاً نام شهری را برای آب و هوا وارد کنید.")
-        return
-
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={OWM_API_KEY}&units=metric&lang=fa"
-    try:
-        async with client.action(event.chat_id, 'typing'):
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            if data['cod'] == 200:
-                main = data['main']
-                weather_desc = data['weather'][0]['description']
-                temp = main['temp']
-                feels_like = main['feels_like']
-                humidity = main['humidity']
-                wind_speed = data['wind']['speed']
-                city_name = data['name']
-                country = data['sys']['country']
-
-                weather_report = (
-                    f"**آب و هوای {city_name}, {country}:**\n"
-                    f"وضعیت: `{weather_desc.capitalize()}`\n"
-                    f"دما: `{temp}°C` (حس می‌شود: `{feels_like}°C`)\n"
-                    f"رطوبت: `{humidity}%`\n"
-                    f"سرعت باد: `{wind_speed} m/s`"
-                )
-                await event.edit(weather_report)
-                logger.info(f"دستور .weather با موفقیت اجرا شد برای: '{city}'")
-            else:
-                await event.edit(f"خطا در دریافت آب و هوا برای '{city}': {data.get('message', 'خطای ناشناخته')}")
-    except requests.exceptions.Timeout:
-        logger.error(f"خطا: درخواست آب و هوا برای '{city}' به دلیل اتمام زمان انجام نشد.")
-        await event.edit("خطا: زمان درخواست آب و هوا به پایان رسید.")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"خطا در درخواست آب و هوا برای '{city}': {e}")
-        await event.edit(f"خطا در اتصال به سرویس آب و هوا: `{e}`")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .weather برای '{city}': {e}")
-        await event.edit(f"خطای ناشناخته در آب و هوا: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.wiki (.*)(?:@\w+)?$', outgoing=True))
-async def wikipedia_command(event):
-    """
-    .wiki <عبارت جستجو>: خلاصه‌ای از ویکی‌پدیا را برای عبارت مورد نظر نمایش می‌دهد.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not wikipedia:
-        await event.edit("ماژول 'wikipedia' نصب نیست. این دستور کار نمی‌کند. `pip install wikipedia`")
-        return
-
-    query = event.pattern_match.group(1).strip()
-    if not query:
-        await event.edit("لطفاً عبارتی برای جستجو در ویکی‌پدیا وارد کنید.")
-        return
-
-    try:
-        async with client.action(event.chat_id, 'typing'):
-            search_results = wikipedia.search(query, results=1)
-            if search_results:
-                page = wikipedia.page(search_results[0])
-                summary = wikipedia.summary(search_results[0], sentences=3) # 3 جمله اول
-                response_text = (
-                    f"**{page.title}**\n"
-                    f"`{summary}`\n"
-                    f"[ادامه مطلب]({page.url})"
-                )
-                await event.edit(response_text, parse_mode='md', link_preview=False)
-                logger.info(f"دستور .wiki با موفقیت اجرا شد برای: '{query}'")
-            else:
-                await event.edit(f"نتیجه‌ای برای '{query}' در ویکی‌پدیا یافت نشد.")
-    except wikipedia.exceptions.PageError:
-        logger.error(f"خطا: صفحه ویکی‌پدیا برای '{query}' یافت نشد.")
-        await event.edit(f"نتیجه‌ای برای '{query}' در ویکی‌پدیا یافت نشد.")
-    except wikipedia.exceptions.DisambiguationError as e:
-        logger.warning(f"خطا: ابهام‌زدایی برای '{query}'. گزینه‌ها: {e.options}")
-        await event.edit(f"ابهام برای '{query}'. لطفاً دقیق‌تر باشید. گزینه‌های احتمالی: {', '.join(e.options[:3])}...")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .wiki برای '{query}': {e}")
-        await event.edit(f"خطای ناشناخته در ویکی‌پدیا: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.translate (\w{2}) (.*)(?:@\w+)?$', outgoing=True))
-async def translate_command(event):
-    """
-    .translate <کد_زبان_مقصد> <متن>: متن را به زبان مقصد ترجمه می‌کند.
-    مثال: .translate en سلام چطوری -> "Hello, how are you?"
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not TRANSLATOR:
-        await event.edit("ماژول ترجمه (google_trans_new یا deep_translator) نصب نیست. این دستور کار نمی‌کند.")
-        return
-
-    target_lang = event.pattern_match.group(1).lower()
-    text_to_translate = event.pattern_match.group(2)
-
-    if not text_to_translate:
-        await event.edit("لطفاً متنی برای ترجمه وارد کنید.")
-        return
-
-    try:
-        async with client.action(event.chat_id, 'typing'):
-            # اگر از google_trans_new استفاده می‌کنید
-            if hasattr(TRANSLATOR, 'translate'):
-                translated_text = TRANSLATOR.translate(text_to_translate, lang_tgt=target_lang)
-            # اگر از deep_translator.GoogleTranslator استفاده می‌کنید
-            elif hasattr(TRANSLATOR, 'translate_text'):
-                TRANSLATOR.target = target_lang # تغییر زبان مقصد
-                translated_text = TRANSLATOR.translate_text(text_to_translate)
-            else:
-                translated_text = None # نباید اتفاق بیفتد
-
-            if translated_text:
-                await event.edit(f"**ترجمه به {target_lang.upper()}:**\n`{translated_text}`")
-                logger.info(f"دستور .translate با موفقیت اجرا شد به {target_lang} برای: '{text_to_translate}'")
-            else:
-                await event.edit("خطا در ترجمه متن. پاسخ نامعتبر از سرور یا سرویس ترجمه.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .translate برای '{text_to_translate}': {e}")
-        await event.edit(f"خطای ناشناخته در ترجمه: `{e}`")
-
-
 @client.on(events.NewMessage(pattern=r'^\.carbon(?:@\w+)?$', outgoing=True))
 async def carbon_command(event):
     """
@@ -1366,7 +1243,7 @@ async def carbon_command(event):
 
         code_text = replied_message.text
         # URL encode the text
-        encoded_code = requests.utils.quote(code_text)
+        encoded_code = urllib.parse.quote(code_text)
         carbon_url = f"https://carbon.now.sh/?bg=rgba(171,184,195,1)&t=material&wt=none&l=auto&width=680&ds=true&dsyoff=20px&dsblur=68px&wc=true&wa=true&pv=56px&ph=56px&ts=14px&tl=false&ss=true&ssr=false&bs=true&cl=false&code={encoded_code}"
         
         await event.edit(f"کد Carbon شما آماده شد:\n[مشاهده Carbon]({carbon_url})", parse_mode='md', link_preview=False)
@@ -1376,34 +1253,6 @@ async def carbon_command(event):
         await event.edit(f"خطا در ایجاد Carbon: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.figlet (.*)(?:@\w+)?$', outgoing=True))
-async def figlet_command(event):
-    """
-    .figlet <متن>: متن شما را به هنر اسکی (ASCII Art) با استفاده از Figlet تبدیل می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not pyfiglet:
-        await event.edit("ماژول 'pyfiglet' نصب نیست. این دستور کار نمی‌کند. `pip install pyfiglet`")
-        return
-
-    text = event.pattern_match.group(1).strip()
-    if not text:
-        await event.edit("لطفاً متنی برای تبدیل به Figlet وارد کنید.")
-        return
-
-    try:
-        figlet_text = pyfiglet.figlet_format(text)
-        if len(figlet_text) > 4096: # محدودیت طول پیام تلگرام
-            await event.edit("متن Figlet بیش از حد طولانی است و قابل ارسال نیست.")
-            logger.warning(f"متن Figlet برای '{text}' بیش از حد طولانی شد.")
-            return
-        await event.edit(f'```\n{figlet_text}\n```', parse_mode='md')
-        logger.info(f"دستور .figlet با موفقیت اجرا شد برای: '{text}'")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .figlet برای '{text}': {e}")
-        await event.edit(f"خطا در ایجاد Figlet: `{e}`")
-
 @client.on(events.NewMessage(pattern=r'^\.speedtest(?:@\w+)?$', outgoing=True))
 async def speedtest_command(event):
     """
@@ -1416,36 +1265,51 @@ async def speedtest_command(event):
         await event.edit("ماژول 'speedtest-cli' نصب نیست. این دستور کار نمی‌کند. `pip install speedtest-cli`")
         return
 
+    progress = ProgressReporter(event, "🌐 تست سرعت اینترنت")
     try:
         await event.edit("در حال اجرای تست سرعت اینترنت... این کار ممکن است چند دقیقه طول بکشد. ⏳")
         logger.info("شروع تست سرعت اینترنت...")
 
-        # اجرای speedtest-cli به عنوان یک زیرپروسس
-        process = subprocess.Popen(['speedtest', '--simple', '--share'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate(timeout=120) # حداکثر 120 ثانیه انتظار
+        # هر مرحله speedtest-cli مسدودکننده است، پس در thread pool اجرا می‌شود تا حلقه رویداد آزاد بماند
+        loop = asyncio.get_running_loop()
+        tester = None
+        stages = [
+            ("انتخاب بهترین سرور...", None),
+            ("تست دانلود...", lambda: tester.download()),
+            ("تست آپلود...", lambda: tester.upload()),
+            ("ساخت لینک اشتراک‌گذاری...", lambda: tester.results.share()),
+        ]
+
+        async def run_stages():
+            nonlocal tester
+            for step, (label, work) in enumerate(stages):
+                progress.set_stage(label, step, len(stages))
+                if work is None:
+                    tester = await loop.run_in_executor(None, lambda: speedtest.Speedtest(secure=True))
+                    await loop.run_in_executor(None, tester.get_best_server)
+                else:
+                    await loop.run_in_executor(None, work)
 
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8').strip()
-            logger.error(f"خطا در اجرای speedtest-cli: {error_msg}")
-            await event.edit(f"خطا در اجرای تست سرعت: `{error_msg}`")
-            return
+        await asyncio.wait_for(run_stages(), timeout=120) # حداکثر 120 ثانیه انتظار
 
-        result_text = stdout.decode('utf-8').strip()
-        
-        # استخراج لینک اشتراک‌گذاری اگر وجود داشته باشد
-        share_link_match = re.search(r'Share results: (https?://www\.speedtest\.net/result/[^\s]+)', result_text)
-        share_link = share_link_match.group(1) if share_link_match else "لینک اشتراک‌گذاری موجود نیست."
+        results = tester.results
+        server = results.server
+        result_text = (f"Ping: {results.ping:.1f} ms\n"
+                       f"Download: {results.download / 1e6:.2f} Mbit/s\n"
+                       f"Upload: {results.upload / 1e6:.2f} Mbit/s\n"
+                       f"Server: {server.get('sponsor', '?')} ({server.get('name', '?')}, {server.get('country', '?')})")
+        share_link = results.share() or "لینک اشتراک‌گذاری موجود نیست."
 
-        await event.edit(f"**نتایج تست سرعت:**\n"
-                         f"```\n{result_text}\n```\n"
-                         f"[مشاهده در Speedtest.net]({share_link})", parse_mode='md', link_preview=True)
+        await progress.finish(f"**نتایج تست سرعت:**\n"
+                              f"```\n{result_text}\n```\n"
+                              f"[مشاهده در Speedtest.net]({share_link})", parse_mode='md', link_preview=True)
         logger.info("دستور .speedtest با موفقیت اجرا شد.")
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         logger.error("تست سرعت به دلیل اتمام زمان متوقف شد.")
-        await event.edit("خطا: تست سرعت به دلیل اتمام زمان (۲ دقیقه) متوقف شد.")
+        await progress.finish("خطا: تست سرعت به دلیل اتمام زمان (۲ دقیقه) متوقف شد.")
     except Exception as e:
         logger.error(f"خطا در اجرای دستور .speedtest: {e}")
-        await event.edit(f"خطای ناشناخته در تست سرعت: `{e}`")
+        await progress.finish(f"خطای ناشناخته در تست سرعت: `{e}`")
 
 
 @client.on(events.NewMessage(pattern=r'^\.ipinfo(?:@\w+)?$', outgoing=True))
@@ -1527,7 +1391,7 @@ async def sysinfo_command(event):
 
         # اطلاعات سیستم عامل
         os_name = os.name
-        platform_system = os.sys.platform # 'linux', 'win32', 'darwin'
+        platform_system = sys.platform # 'linux', 'win32', 'darwin'
         
         # زمان فعال بودن سیستم
         boot_time_timestamp = psutil.boot_time()
@@ -1536,6 +1400,10 @@ async def sysinfo_command(event):
         system_uptime_duration = current_datetime - boot_datetime
         system_uptime_text = human_readable_time(system_uptime_duration.total_seconds())
 
+        cache_stats = entity_cache.stats()
+        directory_stats = peer_directory.stats()
+        upload_stats = upload_cache.stats()
+
         info_text = (
             f"**اطلاعات سیستم:**\n"
             f"سیستم عامل: `{platform_system} ({os_name})`\n"
@@ -1552,7 +1420,13 @@ async def sysinfo_command(event):
             f"کل: `{total_disk} GB`\n"
             f"استفاده شده: `{used_disk} GB`\n"
             f"آزاد: `{free_disk} GB`\n"
-            f"درصد استفاده: `{disk_percent}%`"
+            f"درصد استفاده: `{disk_percent}%`\n\n"
+            f"**کش entity:**\n"
+            f"اندازه: `{cache_stats['size']}`\n"
+            f"نرخ موفقیت: `{cache_stats['hit_rate']:.0%}` (`{cache_stats['hits']}` موفق، `{cache_stats['negative_hits']}` منفی، `{cache_stats['misses']}` ناموفق)\n"
+            f"یوزرنیم از دایرکتوری: `{directory_stats['directory_hits']}`، از شبکه: `{directory_stats['network_resolves']}`\n\n"
+            f"**کش آپلود:**\n"
+            f"فایل‌ها: `{upload_stats['entries']}` | استفاده مجدد: `{upload_stats['hits']}` | آپلود جدید: `{upload_stats['misses']}`"
         )
         await event.edit(info_text)
         logger.info("دستور .sysinfo با موفقیت اجرا شد.")
@@ -1561,219 +1435,11 @@ async def sysinfo_command(event):
         await event.edit(f"خطا در دریافت اطلاعات سیستم: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.imdb (.*)(?:@\w+)?$', outgoing=True))
-async def imdb_search_command(event):
-    """
-    .imdb <عنوان فیلم/سریال>: اطلاعات یک فیلم یا سریال را از IMDB نمایش می‌دهد.
-    نیاز به API Key از OMDb API دارد.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not requests:
-        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
-        return
-    if OMDB_API_KEY == 'YOUR_OMDB_API_KEY_HERE' or not OMDB_API_KEY:
-        await event.edit("خطا: API Key برای OMDb API تنظیم نشده است. لطفاً آن را در کد یا متغیر محیطی 'OMDB_API_KEY' تنظیم کنید.")
-        return
-
-    title = event.pattern_match.group(1).strip()
-    if not title:
-        await event.edit("لطفاً عنوان فیلم یا سریال را وارد کنید.")
-        return
-
-    url = f"http://www.omdbapi.com/?t={requests.utils.quote(title)}&apikey={OMDB_API_KEY}"
-    try:
-        await event.edit(f"در حال جستجوی `{title}` در IMDB... 🎬")
-        response = requests.get(url, timeout=7)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get('Response') == 'True':
-            poster_url = data.get('Poster')
-            
-            # تهیه متن اطلاعات
-            info_lines = [
-                f"**عنوان:** `{data.get('Title')}`",
-                f"**سال:** `{data.get('Year')}`",
-                f"**ژانر:** `{data.get('Genre')}`",
-                f"**کارگردان:** `{data.get('Director')}`",
-                f"**بازیگران:** `{data.get('Actors')}`",
-                f"**امتیاز IMDB:** `{data.get('imdbRating')}/10` ({data.get('imdbVotes')} رأی)",
-                f"**خلاصه داستان:** `{data.get('Plot')}`",
-                f"**لینک IMDB:** [imdb.com/title/{data.get('imdbID')}/](https://www.imdb.com/title/{data.get('imdbID')}/)"
-            ]
-            info_text = "\n".join(info_lines)
-
-            # اگر پوستر موجود است، آن را ارسال می‌کنیم
-            if poster_url and poster_url != "N/A":
-                await client.send_file(event.chat_id, poster_url, caption=info_text, parse_mode='md')
-                await event.delete() # پاک کردن دستور اصلی
-            else:
-                await event.edit(info_text, parse_mode='md', link_preview=False)
-
-            logger.info(f"دستور .imdb با موفقیت اجرا شد برای: '{title}'")
-        else:
-            await event.edit(f"فیلم یا سریال `{title}` در IMDB یافت نشد. {data.get('Error', '')}")
-    except requests.exceptions.Timeout:
-        logger.error(f"خطا: درخواست IMDB برای '{title}' به دلیل اتمام زمان انجام نشد.")
-        await event.edit("خطا: زمان درخواست IMDB به پایان رسید.")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"خطا در درخواست IMDB برای '{title}': {e}")
-        await event.edit(f"خطا در اتصال به سرویس IMDB: `{e}`")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .imdb برای '{title}': {e}")
-        await event.edit(f"خطای ناشناخته در IMDB: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.sendfile (.*)(?:@\w+)?$', outgoing=True))
-async def send_file_command(event):
-    """
-    .sendfile <مسیر_فایل>: یک فایل از مسیر مشخص شده را ارسال می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    file_path = event.pattern_match.group(1).strip()
-    if not file_path:
-        await event.edit("لطفاً مسیر فایل را وارد کنید.")
-        return
-    
-    if not os.path.exists(file_path):
-        await event.edit(f"خطا: فایل در مسیر `{file_path}` یافت نشد.")
-        return
-
-    try:
-        await event.edit(f"در حال ارسال فایل: `{os.path.basename(file_path)}`...")
-        await client.send_file(event.chat_id, file_path)
-        await event.delete() # پاک کردن دستور اصلی
-        logger.info(f"دستور .sendfile با موفقیت اجرا شد. فایل: '{file_path}'")
-    except ChatSendMediaForbiddenError:
-        logger.error(f"خطا: اجازه ارسال رسانه در این چت وجود ندارد.")
-        await event.edit("خطا: اجازه ارسال فایل در این چت را ندارید.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .sendfile برای '{file_path}': {e}")
-        await event.edit(f"خطا در ارسال فایل: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.downloadmedia(?:@\w+)?$', outgoing=True))
-async def download_media_command(event):
-    """
-    .downloadmedia: فایل رسانه‌ای (عکس، ویدئو، سند) پیام ریپلای شده را دانلود می‌کند.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not event.is_reply:
-        await event.edit("برای دانلود رسانه، روی پیامی که حاوی رسانه است ریپلای کنید.")
-        return
-
-    try:
-        replied_message = await event.get_reply_message()
-        if not replied_message.media:
-            await event.edit("پیام ریپلای شده حاوی رسانه نیست.")
-            return
-
-        await event.edit("در حال دانلود رسانه... 📥")
-        download_path = await client.download_media(replied_message)
-        if download_path:
-            await event.edit(f"✅ رسانه در: `{download_path}` ذخیره شد.")
-            logger.info(f"دستور .downloadmedia با موفقیت اجرا شد. رسانه پیام {replied_message.id} در '{download_path}' ذخیره شد.")
-        else:
-            await event.edit("خطا در دانلود رسانه.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .downloadmedia: {e}")
-        await event.edit(f"خطا در دانلود رسانه: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.pin(?:@\w+)?$', outgoing=True))
-async def pin_message_command(event):
-    """
-    .pin: پیامی که روی آن ریپلای شده را پین می‌کند (اگر ادمین باشید).
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    if not event.is_reply:
-        await event.edit("برای پین کردن پیام، روی آن ریپلای کنید.")
-        return
-
-    try:
-        replied_message = await event.get_reply_message()
-        if event.is_private:
-            await client.pin_message(event.chat_id, replied_message.id)
-            await event.edit("✅ پیام با موفقیت پین شد.")
-            logger.info(f"دستور .pin با موفقیت اجرا شد. پیام ID: {replied_message.id} در چت خصوصی پین شد.")
-        elif event.is_group or event.is_channel:
-            # بررسی کنیم که آیا کاربر ادمین است و اجازه پین کردن دارد
-            can_pin = False
-            try:
-                my_participant = await client.get_participant(event.chat_id, OWNER_ID)
-                if isinstance(my_participant, (ChannelParticipantAdmin, ChannelParticipantCreator)):
-                    if my_participant.admin_rights and my_participant.admin_rights.pin_messages:
-                        can_pin = True
-            except (UserNotParticipantError, UserAdminInvalidError, ChannelPrivateError, ValueError):
-                pass
-            
-            if can_pin:
-                await client.pin_message(event.chat_id, replied_message.id)
-                await event.edit("✅ پیام با موفقیت پین شد.")
-                logger.info(f"دستور .pin با موفقیت اجرا شد. پیام ID: {replied_message.id} در چت {event.chat_id} پین شد.")
-            else:
-                await event.edit("شما اجازه پین کردن پیام در این چت را ندارید (ادمین نیستید یا حق پین کردن ندارید).")
-        else:
-            await event.edit("این دستور در این نوع چت پشتیبانی نمی‌شود.")
-
-    except ChatAdminRequiredError:
-        await event.edit("خطا: شما ادمین این چت نیستید یا دسترسی لازم را ندارید.")
-        logger.warning(f"کاربر {OWNER_ID} در چت {event.chat_id} ادمین نیست یا حق پین ندارد.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .pin: {e}")
-        await event.edit(f"خطا در پین کردن پیام: `{e}`")
-
-@client.on(events.NewMessage(pattern=r'^\.unpin(?:@\w+)?$', outgoing=True))
-async def unpin_message_command(event):
-    """
-    .unpin: آخرین پیام پین شده را از حالت پین خارج می‌کند (اگر ادمین باشید).
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    try:
-        if event.is_group or event.is_channel:
-            # بررسی حقوق ادمین
-            can_unpin = False
-            try:
-                my_participant = await client.get_participant(event.chat_id, OWNER_ID)
-                if isinstance(my_participant, (ChannelParticipantAdmin, ChannelParticipantCreator)):
-                    if my_participant.admin_rights and my_participant.admin_rights.pin_messages: # حق پین برای unpin هم لازم است
-                        can_unpin = True
-            except (UserNotParticipantError, UserAdminInvalidError, ChannelPrivateError, ValueError):
-                pass
-
-            if can_unpin:
-                chat_full = await client(GetFullChannelRequest(event.chat_id))
-                if chat_full.full_chat.pinned_msg_id:
-                    await client.unpin_message(event.chat_id, chat_full.full_chat.pinned_msg_id)
-                    await event.edit("✅ آخرین پیام پین شده با موفقیت از حالت پین خارج شد.")
-                    logger.info(f"دستور .unpin با موفقیت اجرا شد در چت {event.chat_id}.")
-                else:
-                    await event.edit("هیچ پیام پین شده‌ای در این چت یافت نشد.")
-            else:
-                await event.edit("شما اجازه خارج کردن پیام از پین در این چت را ندارید (ادمین نیستید یا حق پین کردن ندارید).")
-        elif event.is_private:
-            await event.edit("قابلیت unpin برای چت‌های خصوصی در حال حاضر به سادگی قابل دسترسی نیست.")
-        else:
-            await event.edit("این دستور فقط برای گروه‌ها/کانال‌ها یا چت خصوصی کار می‌کند.")
-    except ChatAdminRequiredError:
-        await event.edit("خطا: شما ادمین این چت نیستید یا دسترسی لازم را ندارید.")
-        logger.warning(f"کاربر {OWNER_ID} در چت {event.chat_id} ادمین نیست یا حق unpin ندارد.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .unpin: {e}")
-        await event.edit(f"خطا در خارج کردن پیام از پین: `{e}`")
-
-
 @client.on(events.NewMessage(pattern=r'^\.forward (\d+)(?:@\w+)?$', outgoing=True))
 async def forward_last_messages_command(event):
     """
     .forward <تعداد>: N پیام آخر در چت فعلی را به 'Saved Messages' (یا چت پاسخ‌داده شده) فوروارد می‌کند.
+    پیام‌ها از قدیمی به جدید، صفحه به صفحه خوانده و در دسته‌های ۱۰۰تایی (بدون شکستن آلبوم‌ها) فوروارد می‌شوند.
     """
     if event.sender_id != OWNER_ID:
         return
@@ -1788,497 +1454,226 @@ async def forward_last_messages_command(event):
 
         target_chat = await client.get_entity('me') # پیش‌فرض: Saved Messages
         if event.is_reply:
-            replied_message = await event.get_reply_message()
             # اگر روی یک کاربر/ربات ریپلای شده باشد، به آن چت خصوصی فوروارد می‌کند.
             # اگر روی پیام در یک گروه/کانال ریپلای شده باشد، به آن گروه/کانال فوروارد می‌کند.
             target_entity_from_reply = await get_target_entity(event)
             if target_entity_from_reply:
                 target_chat = target_entity_from_reply
-
-
-        messages_to_forward = []
-        # iter_messages با offset_id به عقب برمی‌گردد.
-        # ابتدا خود دستور forward را حذف می‌کنیم تا در لیست پیام‌های فوروارد نباشد.
-        await event.delete() 
-
-        async for msg in client.iter_messages(event.chat_id, limit=count, offset_id=event.message.id):
-            messages_to_forward.append(msg)
-        
-        # فوروارد از قدیمی به جدید
-        messages_to_forward.reverse() 
-        
-        if messages_to_forward:
-            await client.send_message(event.chat_id, f"در حال فوروارد {len(messages_to_forward)} پیام به {target_chat.title if hasattr(target_chat, 'title') else target_chat.first_name}...", delete_in=3)
-            # اگر target_chat یک کاربر باشد
-            if isinstance(target_chat, User):
-                # با استفاده از forward_messages
-                await client.forward_messages(target_chat, messages_to_forward, from_peer=event.chat_id)
-            else: # اگر گروه یا کانال باشد
-                await client.forward_messages(target_chat, messages_to_forward, from_peer=event.chat_id)
-
-            logger.info(f"دستور .forward با موفقیت اجرا شد. {len(messages_to_forward)} پیام فوروارد شد به {target_chat.id}.")
+        target_name = utils.get_display_name(target_chat)
+
+        # قدیمی‌ترین پیام بازه با یک درخواست پیدا می‌شود (add_offset)، سپس بازه از قدیمی به جدید خوانده می‌شود.
+        # خود دستور (event.id) با max_id کنار گذاشته می‌شود.
+        oldest = await client.get_messages(event.chat_id, limit=1, offset_id=event.id, add_offset=count - 1)
+        min_id = oldest[0].id - 1 if oldest else 0 # کمتر از N پیام: از ابتدای چت
+
+        await event.edit(f"در حال فوروارد حداکثر {count} پیام به {target_name}... 📤")
+        progress = ProgressReporter(event, f"📤 فوروارد به {target_name}", total=count, unit='پیام')
+        forwarder = StreamingForwarder(client, event.chat_id, target_chat,
+                                       on_progress=lambda forwarded, seen: progress(forwarded))
+        messages = client.iter_messages(event.chat_id, limit=count, reverse=True, min_id=min_id,
+                                        max_id=event.id, wait_time=0)
+        with background(): # دستورات دیگر در صف ارسال بر این کار طولانی مقدم هستند
+            forwarded = await forwarder.run(messages)
+
+        if forwarded:
+            await progress.finish(f"✅ `{forwarded}` پیام به {target_name} فوروارد شد.")
+            logger.info(f"دستور .forward با موفقیت اجرا شد. {forwarded} پیام فوروارد شد به {target_chat.id}.")
         else:
-            await client.send_message(event.chat_id, "هیچ پیامی برای فوروارد کردن پیدا نشد.", delete_in=3)
+            await progress.finish("هیچ پیامی برای فوروارد کردن پیدا نشد.")
+        await asyncio.sleep(3)
+        await event.delete()
     except Exception as e:
         logger.error(f"خطا در اجرای دستور .forward: {e}")
-        await client.send_message(event.chat_id, f"خطا در فوروارد کردن پیام‌ها: `{e}`", delete_in=5)
+        await event.edit(f"خطا در فوروارد کردن پیام‌ها: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.kick(?:@\w+)?$', outgoing=True))
-async def kick_command(event):
+@client.on(events.NewMessage(pattern=r'^\.uptime(?:@\w+)?$', outgoing=True))
+async def uptime_command(event):
     """
-    .kick: کاربری که روی پیامش ریپلای شده را از گروه بیرون می‌کند (اگر ادمین باشید و حق حذف داشته باشید).
+    .uptime: مدت زمان فعال بودن اسکریپت را نمایش می‌دهد.
     """
     if event.sender_id != OWNER_ID:
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای کیک کردن کاربر، روی پیام او ریپلای کنید.")
-        return
-
-    try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
 
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-
-        if target_user.id == OWNER_ID:
-            await event.edit("شما نمی‌توانید خودتان را کیک کنید!")
-            return
-        
-        # بررسی حقوق ادمین
-        my_rights = await get_admin_rights(event.chat_id, OWNER_ID)
-        if not my_rights or not my_rights.ban_users:
-            await event.edit("شما ادمین نیستید یا حق حذف کاربر را ندارید.")
-            return
-
-        # کیک کردن کاربر
-        await client.kick_participant(event.chat_id, target_user.id)
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت کیک شد.")
-        await event.delete(replied_message) # پاک کردن پیام ریپلای شده
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} از چت {event.chat_id} کیک شد.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه کیک کردن این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را کیک کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .kick: {e}")
-        await event.edit(f"خطا در کیک کردن کاربر: `{e}`")
+    global SCRIPT_START_TIME
+    if 'SCRIPT_START_TIME' not in globals():
+        SCRIPT_START_TIME = datetime.datetime.now() # اگر به دلیلی تنظیم نشده بود، اینجا تنظیم شود.
 
-@client.on(events.NewMessage(pattern=r'^\.ban(?:@\w+)?$', outgoing=True))
-async def ban_command(event):
-    """
-    .ban: کاربری که روی پیامش ریپلای شده را از گروه بن می‌کند (اگر ادمین باشید و حق بن داشته باشید).
-    """
-    if event.sender_id != OWNER_ID:
-        return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای بن کردن کاربر، روی پیام او ریپلای کنید.")
-        return
+    uptime_duration = datetime.datetime.now() - SCRIPT_START_TIME
+    uptime_text = human_readable_time(uptime_duration.total_seconds())
 
     try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-
-        if target_user.id == OWNER_ID:
-            await event.edit("شما نمی‌توانید خودتان را بن کنید!")
-            return
-        
-        my_rights = await get_admin_rights(event.chat_id, OWNER_ID)
-        if not my_rights or not my_rights.ban_users:
-            await event.edit("شما ادمین نیستید یا حق بن کردن کاربر را ندارید.")
-            return
-
-        # بن کردن کاربر
-        await client.edit_permissions(event.chat_id, target_user.id, view_messages=False) # ban = cannot view messages
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت بن شد.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} از چت {event.chat_id} بن شد.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه بن کردن این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را بن کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
+        await event.edit(f"اسکریپت به مدت: `{uptime_text}` فعال است.")
+        logger.info(f"دستور .uptime با موفقیت اجرا شد. Uptime: {uptime_text}")
     except Exception as e:
-        logger.error(f"خطا در اجرای دستور .ban: {e}")
-        await event.edit(f"خطا در بن کردن کاربر: `{e}`")
+        logger.error(f"خطا در اجرای دستور .uptime: {e}")
+        await event.edit(f"خطا در دریافت زمان فعالیت: `{e}`")
 
-@client.on(events.NewMessage(pattern=r'^\.unban(?:@\w+)?$', outgoing=True))
-async def unban_command(event):
+@client.on(events.NewMessage(pattern=r'^\.restart(?:@\w+)?$', outgoing=True))
+async def restart_command(event):
     """
-    .unban: کاربری که روی پیامش ریپلای شده را از بن خارج می‌کند (اگر ادمین باشید و حق بن داشته باشید).
+    .restart: اسکریپت را ری‌استارت می‌کند (با استفاده از os.execv).
+    **توجه: این دستور اسکریپت را به طور کامل قطع کرده و دوباره از ابتدا اجرا می‌کند.
+    ممکن است نیاز به اجرای مجدد از ترمینال باشد.**
     """
     if event.sender_id != OWNER_ID:
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای خارج کردن کاربر از بن، روی پیام او ریپلای کنید.")
-        return
 
     try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-        
-        my_rights = await get_admin_rights(event.chat_id, OWNER_ID)
-        if not my_rights or not my_rights.ban_users:
-            await event.edit("شما ادمین نیستید یا حق بن/آن‌بن کردن کاربر را ندارید.")
-            return
-
-        # آن‌بن کردن کاربر
-        await client.edit_permissions(event.chat_id, target_user.id, view_messages=True, send_messages=True, send_media=True, send_stickers=True, send_gifs=True, send_games=True, send_inline=True, embed_links=True)
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت آن‌بن شد.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} در چت {event.chat_id} آن‌بن شد.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه آن‌بن کردن این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را آن‌بن کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
+        await event.edit("🔄 در حال ری‌استارت کردن اسکریپت...")
+        logger.warning("اسکریپت در حال ری‌استارت شدن است.")
+        # این باعث می‌شود پایتون یک پروسه جدید از خودش را با آرگومان‌های فعلی اجرا کند.
+        # این تنها راه نسبتاً تمیز برای ری‌استارت کردن یک اسکریپت پایتون است.
+        peer_directory.save() # موجودیت‌های دیده شده تا الان در سشن ذخیره شوند تا بعد از ری‌استارت دوباره resolve نشوند
+        state_snapshot.save() # وضعیت AFK و کش‌ها پس از ری‌استارت بازیابی می‌شوند
+        python = sys.executable
+        os.execv(python, [python] + sys.argv)
     except Exception as e:
-        logger.error(f"خطا در اجرای دستور .unban: {e}")
-        await event.edit(f"خطا در آن‌بن کردن کاربر: `{e}`")
+        logger.error(f"خطا در اجرای دستور .restart: {e}")
+        await event.edit(f"خطا در ری‌استارت کردن اسکریپت: `{e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.mute(?: (\d+[smhd])?)?(?:@\w+)?$', outgoing=True))
-async def mute_command(event):
+@client.on(events.NewMessage(pattern=r'^\.reload(?:@\w+)?$', outgoing=True))
+async def reload_command(event):
     """
-    .mute [مدت زمان]: کاربری که روی پیامش ریپلای شده را در گروه میوت می‌کند.
-    مدت زمان: s=ثانیه, m=دقیقه, h=ساعت, d=روز. مثال: .mute 1h
+    .reload: کد دستورات را از فایل اسکریپت دوباره بارگذاری می‌کند، بدون قطع اتصال.
+    کلاینت، کش‌ها، صف دانلود و وضعیت AFK حفظ می‌شوند؛ فقط تغییرات پکیج selfbot به .restart نیاز دارند.
+    پلاگین‌ها هم از فایل‌هایشان دوباره import می‌شوند.
+    اگر کد جدید خطا داشته باشد، کد قبلی فعال می‌ماند.
     """
     if event.sender_id != OWNER_ID:
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای میوت کردن کاربر، روی پیام او ریپلای کنید.")
-        return
 
     try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-
-        if target_user.id == OWNER_ID:
-            await event.edit("شما نمی‌توانید خودتان را میوت کنید!")
-            return
-
-        my_rights = await get_admin_rights(event.chat_id, OWNER_ID)
-        if not my_rights or not my_rights.ban_users: # حق بن برای میوت کردن هم لازم است
-            await event.edit("شما ادمین نیستید یا حق میوت کردن کاربر را ندارید.")
-            return
-
-        duration_str = event.pattern_match.group(1)
-        until_date = None
-        mute_reason = "بی‌دلیل"
-
-        if duration_str:
-            match = re.match(r'(\d+)([smhd])', duration_str)
-            if match:
-                value = int(match.group(1))
-                unit = match.group(2)
-                
-                if unit == 's':
-                    until_date = datetime.datetime.now() + datetime.timedelta(seconds=value)
-                    mute_reason = f"{value} ثانیه"
-                elif unit == 'm':
-                    until_date = datetime.datetime.now() + datetime.timedelta(minutes=value)
-                    mute_reason = f"{value} دقیقه"
-                elif unit == 'h':
-                    until_date = datetime.datetime.now() + datetime.timedelta(hours=value)
-                    mute_reason = f"{value} ساعت"
-                elif unit == 'd':
-                    until_date = datetime.datetime.now() + datetime.timedelta(days=value)
-                    mute_reason = f"{value} روز"
-            else:
-                await event.edit("فرمت مدت زمان نامعتبر است. مثال: `1h`, `30m`, `5d`")
-                return
-        
-        # میوت کردن کاربر (فقط cannot send messages)
-        await client.edit_permissions(event.chat_id, target_user.id, send_messages=False, until_date=until_date)
-        
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) به مدت **{mute_reason}** میوت شد.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} در چت {event.chat_id} میوت شد برای {mute_reason}.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه میوت کردن این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را میوت کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
+        await event.edit("🔄 در حال بارگذاری مجدد دستورات...")
+        plugins.unload() # پلاگین‌ها در اولین استفاده بعدی دوباره از فایل import می‌شوند
+        try:
+            result = reload_script(globals(), client, preserve=RELOAD_PRESERVE)
+        except Exception:
+            plugins.load_startup() # کد قبلی فعال می‌ماند؛ پلاگین‌های همیشه‌فعال آن دوباره بارگذاری می‌شوند
+            plugins.start()
+            raise
+        plugins.load_startup() # `plugins` حالا رجیستری ساخته شده توسط کد جدید است
+        plugins.start()
+        await event.edit(f"✅ دستورات دوباره بارگذاری شدند: `{result.added}` هندلر در `{result.seconds * 1000:.0f}` میلی‌ثانیه (اتصال و کش‌ها حفظ شدند).")
+        logger.info("دستور .reload با موفقیت اجرا شد.")
     except Exception as e:
-        logger.error(f"خطا در اجرای دستور .mute: {e}")
-        await event.edit(f"خطا در میوت کردن کاربر: `{e}`")
+        logger.error(f"خطا در اجرای دستور .reload: {e}")
+        await event.edit(f"خطا در بارگذاری مجدد (کد قبلی همچنان فعال است): `{type(e).__name__}: {e}`")
 
 
-@client.on(events.NewMessage(pattern=r'^\.unmute(?:@\w+)?$', outgoing=True))
-async def unmute_command(event):
+@client.on(events.NewMessage(pattern=r'^\.(?:kill|کیل)(?:@\w+)?$', outgoing=True))
+async def kill_command(event):
     """
-    .unmute: کاربری که روی پیامش ریپلای شده را از میوت خارج می‌کند.
+    .kill: وضعیت را ذخیره می‌کند و اتصال را فوراً قطع می‌کند (اسکریپت خارج می‌شود).
     """
     if event.sender_id != OWNER_ID:
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای آن‌میوت کردن کاربر، روی پیام او ریپلای کنید.")
-        return
-
-    try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
 
-        my_rights = await get_admin_rights(event.chat_id, OWNER_ID)
-        if not my_rights or not my_rights.ban_users: # حق بن برای آن‌میوت کردن هم لازم است
-            await event.edit("شما ادمین نیستید یا حق آن‌میوت کردن کاربر را ندارید.")
-            return
-
-        # آن‌میوت کردن کاربر (بازگرداندن همه دسترسی‌های ارسال پیام)
-        await client.edit_permissions(event.chat_id, target_user.id, send_messages=True, send_media=True, send_stickers=True, send_gifs=True, send_games=True, send_inline=True, embed_links=True)
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت آن‌میوت شد.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} در چت {event.chat_id} آن‌میوت شد.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه آن‌میوت کردن این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را آن‌میوت کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .unmute: {e}")
-        await event.edit(f"خطا در آن‌میوت کردن کاربر: `{e}`")
+    await event.edit("💀 در حال خاموش کردن سلف...")
+    logger.info("دستور .kill اجرا شد؛ اسکریپت خاموش می‌شود.")
+    peer_directory.save()
+    state_snapshot.save()
+    await client.disconnect() # run_until_disconnected در main برمی‌گردد
 
 
-@client.on(events.NewMessage(pattern=r'^\.promote(?:@\w+)?$', outgoing=True))
-async def promote_command(event):
+async def send_exec_output(event, header, output):
     """
-    .promote: کاربر ریپلای شده را به ادمین گروه/کانال ارتقا می‌دهد (فقط سازنده).
-    **هشدار: این دستور فقط توسط مالک (سازنده) چت قابل اجراست و بسیار قدرتمند است.**
+    خروجی .exec/.aexec را نمایش می‌دهد؛ خروجی طولانی به صورت فایل متنی (ریپلای به همین پیام) ارسال می‌شود.
     """
-    if event.sender_id != OWNER_ID:
+    output = output.rstrip() or "(خروجی ندارد)"
+    if len(header) + len(output) <= 3800:
+        await event.edit(f"{header}\n```\n{output}\n```")
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای ارتقا به ادمین، روی پیام کاربر ریپلای کنید.")
-        return
-
-    try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-        
-        if target_user.id == OWNER_ID:
-            await event.edit("شما نمی‌توانید خودتان را ارتقا دهید (شما از قبل مالک هستید یا بالاترین دسترسی را دارید).")
-            return
-
-        # بررسی اینکه آیا خود کاربر (صاحب ربات) سازنده چت است
-        try:
-            my_participant = await client.get_participant(event.chat_id, OWNER_ID)
-            if not isinstance(my_participant, ChannelParticipantCreator):
-                await event.edit("این دستور فقط توسط سازنده چت قابل اجراست.")
-                return
-        except (UserNotParticipantError, ChannelPrivateError):
-            await event.edit("شما عضو این چت نیستید یا چت خصوصی است.")
-            return
-
-        # ارتقا کاربر به ادمین با تمام حقوق (مثلاً)
-        full_rights = ChatBannedRights(
-            until_date=None,
-            view_messages=False, send_messages=False, send_media=False, send_stickers=False,
-            send_gifs=False, send_games=False, send_inline=False, embed_links=False,
-            send_polls=False, change_info=True, edit_messages=True, delete_messages=True,
-            ban_users=True, invite_users=True, pin_messages=True, add_admins=False, # add_admins فقط توسط سازنده
-            manage_call=True
-        )
-        await client.edit_admin(event.chat_id, target_user.id, change_info=True, post_messages=True, edit_messages=True, delete_messages=True,
-                                ban_users=True, invite_users=True, pin_messages=True, add_admins=False, anonymous=False, title='ادمین')
-        
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت به ادمین ارتقا یافت.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} در چت {event.chat_id} به ادمین ارتقا یافت.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه ارتقا این کاربر را ندارم.")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را ارتقا دهد (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .promote: {e}")
-        await event.edit(f"خطا در ارتقا کاربر: `{e}`")
+    document = io.BytesIO(output.encode('utf-8'))
+    document.name = 'output.txt'
+    await client.send_file(event.chat_id, document, caption=header, reply_to=event.id)
+    await event.edit(f"{header}\n(خروجی {len(output)} کاراکتری به صورت فایل ارسال شد.)")
 
 
-@client.on(events.NewMessage(pattern=r'^\.demote(?:@\w+)?$', outgoing=True))
-async def demote_command(event):
+@client.on(events.NewMessage(pattern=r'^\.exec(?:@\w+)?\s+([\s\S]+)$', outgoing=True))
+async def exec_command(event):
     """
-    .demote: کاربر ریپلای شده را از ادمینی خارج می‌کند (فقط سازنده).
-    **هشدار: این دستور فقط توسط مالک (سازنده) چت قابل اجراست و بسیار قدرتمند است.**
+    .exec <کد پایتون>: کد (یک یا چند خط) را در یک پروسه جداگانه با محدودیت CPU، حافظه و زمان اجرا می‌کند.
+    stdout و stderr برگردانده می‌شوند و مقدار عبارت آخر مثل مفسر تعاملی چاپ می‌شود.
+    کد به client دسترسی ندارد؛ برای کار با تلگرام از .aexec استفاده کنید.
+    **هشدار: کد با دسترسی‌های کاربر سیستم اجرا می‌شود!** فقط کدهای مورد اعتماد خود را اجرا کنید.
     """
     if event.sender_id != OWNER_ID:
         return
-    if not event.is_group and not event.is_channel:
-        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
-        return
-    if not event.is_reply:
-        await event.edit("برای خارج کردن از ادمینی، روی پیام کاربر ریپلای کنید.")
-        return
 
+    code_to_execute = strip_code_fence(event.pattern_match.group(1))
     try:
-        replied_message = await event.get_reply_message()
-        target_user = await get_target_entity(event)
-
-        if not target_user or not isinstance(target_user, User):
-            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
-            return
-
-        if target_user.id == OWNER_ID:
-            await event.edit("شما نمی‌توانید خودتان را از ادمینی خارج کنید!")
-            return
-
-        # بررسی اینکه آیا خود کاربر (صاحب ربات) سازنده چت است
-        try:
-            my_participant = await client.get_participant(event.chat_id, OWNER_ID)
-            if not isinstance(my_participant, ChannelParticipantCreator):
-                await event.edit("این دستور فقط توسط سازنده چت قابل اجراست.")
-                return
-        except (UserNotParticipantError, ChannelPrivateError):
-            await event.edit("شما عضو این چت نیستید یا چت خصوصی است.")
-            return
-
-        # خارج کردن کاربر از ادمینی (با تنظیم حقوق به None)
-        await client.edit_admin(event.chat_id, target_user.id, is_admin=False)
-        
-        await event.edit(f"✅ کاربر [{target_user.first_name}](tg://user?id={target_user.id}) با موفقیت از ادمینی خارج شد.")
-        await event.delete(replied_message)
-        logger.info(f"کاربر {target_user.id} توسط {OWNER_ID} در چت {event.chat_id} از ادمینی خارج شد.")
-    except UserAdminRightsForbiddenError:
-        await event.edit("من اجازه خارج کردن این کاربر از ادمینی را ندارم.")
-        logger.warning(f"ربات نتوانست کاربر {target_user.id} را از ادمینی خارج کند (حقوق ادمین کافی نیست).")
-    except ChatAdminRequiredError:
-        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
-        logger.warning(f"ربات در چت {event.chat_id} ادمین نیست.")
+        await event.edit("⏳ در حال اجرای کد در پروسه جداگانه...")
+        # پروسه فرزند جدا است، پس حلقه رویداد حتی با حلقه بی‌نهایت یا sleep طولانی متوقف نمی‌شود.
+        result = await run_code(code_to_execute, timeout=EXEC_TIMEOUT, cpu_seconds=EXEC_CPU_SECONDS, memory_mb=EXEC_MEMORY_MB)
+        if result.timed_out:
+            status = f"⏱ پس از {EXEC_TIMEOUT} ثانیه متوقف شد"
+        elif result.truncated:
+            status = "✂️ خروجی بیش از حد بزرگ بود و اجرا متوقف شد"
+        elif result.returncode < 0 and -result.returncode == getattr(signal, 'SIGXCPU', None):
+            status = f"⏱ محدودیت {EXEC_CPU_SECONDS} ثانیه CPU تمام شد"
+        elif result.returncode:
+            status = f"❌ خطا (کد خروج `{result.returncode}`)"
+        else:
+            status = "✅ اجرا شد"
+        output = result.stdout + (f"\n--- stderr ---\n{result.stderr}" if result.stderr else "")
+        await send_exec_output(event, f"**{status}** در `{result.seconds:.2f}` ثانیه", output)
+        logger.info(f"دستور .exec اجرا شد (کد خروج {result.returncode}). کد: '{code_to_execute}'")
     except Exception as e:
-        logger.error(f"خطا در اجرای دستور .demote: {e}")
-        await event.edit(f"خطا در خارج کردن کاربر از ادمینی: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.uptime(?:@\w+)?$', outgoing=True))
-async def uptime_command(event):
-    """
-    .uptime: مدت زمان فعال بودن اسکریپت را نمایش می‌دهد.
-    """
-    if event.sender_id != OWNER_ID:
-        return
-
-    global SCRIPT_START_TIME
-    if 'SCRIPT_START_TIME' not in globals():
-        SCRIPT_START_TIME = datetime.datetime.now() # اگر به دلیلی تنظیم نشده بود، اینجا تنظیم شود.
-
-    uptime_duration = datetime.datetime.now() - SCRIPT_START_TIME
-    uptime_text = human_readable_time(uptime_duration.total_seconds())
+        logger.error(f"خطا در اجرای دستور .exec: {e}")
+        await event.edit(f"**خطا در اجرای کد:**\n```\n{e}\n```")
 
-    try:
-        await event.edit(f"اسکریپت به مدت: `{uptime_text}` فعال است.")
-        logger.info(f"دستور .uptime با موفقیت اجرا شد. Uptime: {uptime_text}")
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .uptime: {e}")
-        await event.edit(f"خطا در دریافت زمان فعالیت: `{e}`")
 
-@client.on(events.NewMessage(pattern=r'^\.restart(?:@\w+)?$', outgoing=True))
-async def restart_command(event):
+@client.on(events.NewMessage(pattern=r'^\.aexec(?:@\w+)?\s+([\s\S]+)$', outgoing=True))
+async def aexec_command(event):
     """
-    .restart: اسکریپت را ری‌استارت می‌کند (با استفاده از os.execv).
-    **توجه: این دستور اسکریپت را به طور کامل قطع کرده و دوباره از ابتدا اجرا می‌کند.
-    ممکن است نیاز به اجرای مجدد از ترمینال باشد.**
+    .aexec <کد پایتون>: کد را داخل خود ربات با امکان await در سطح بالا اجرا می‌کند (client، event و reply در دسترس‌اند).
+    هر اجرا یک task جداگانه است که با `.aexec cancel` لغو و پس از AEXEC_TIMEOUT ثانیه خودکار متوقف می‌شود.
+    کد همگام (sync) طولانی همچنان حلقه رویداد را متوقف می‌کند؛ برای آن از .exec استفاده کنید.
     """
     if event.sender_id != OWNER_ID:
         return
 
-    try:
-        await event.edit("🔄 در حال ری‌استارت کردن اسکریپت...")
-        logger.warning("اسکریپت در حال ری‌استارت شدن است.")
-        # این باعث می‌شود پایتون یک پروسه جدید از خودش را با آرگومان‌های فعلی اجرا کند.
-        # این تنها راه نسبتاً تمیز برای ری‌استارت کردن یک اسکریپت پایتون است.
-        python = os.sys.executable
-        os.execv(python, [python] + os.sys.argv)
-    except Exception as e:
-        logger.error(f"خطا در اجرای دستور .restart: {e}")
-        await event.edit(f"خطا در ری‌استارت کردن اسکریپت: `{e}`")
-
-
-@client.on(events.NewMessage(pattern=r'^\.exec (.*)(?:@\w+)?$', outgoing=True))
-async def exec_command(event):
-    """
-    .exec <کد پایتون>: یک خط کد پایتون را اجرا می‌کند.
-    **هشدار: این دستور بسیار خطرناک است!** فقط کدهای مورد اعتماد خود را اجرا کنید.
-    اجرای کدهای مخرب می‌تواند به سیستم شما آسیب برساند یا حساب تلگرام شما را به خطر بیندازد.
-    """
-    if event.sender_id != OWNER_ID:
+    code_to_execute = strip_code_fence(event.pattern_match.group(1))
+    if code_to_execute == 'cancel':
+        running = [task for task in AEXEC_TASKS.values() if not task.done()]
+        for task in running:
+            task.cancel()
+        await event.edit(f"🛑 `{len(running)}` اجرای .aexec لغو شد." if running else "هیچ .aexec در حال اجرایی وجود ندارد.")
         return
 
-    code_to_execute = event.pattern_match.group(1)
     try:
-        # برای امنیت، یک دیکشنری خالی به عنوان locals و globals فراهم می‌کنیم.
-        # البته، این هنوز کامل نیست و امکان دسترسی به برخی توابع built-in وجود دارد.
-        # استفاده از exec با دقت فراوان و فقط برای کدهای مطمئن توصیه می‌شود.
-        # eval برای عبارات ساده امن‌تر است. exec برای دستورات چند خطی یا پیچیده‌تر.
-        
-        # بهتر است از یک Sandbox (محیط ایزوله) برای اجرای کد استفاده شود
-        # اما پیاده‌سازی Sandbox از پیچیدگی این فایل فراتر می‌رود.
-        
-        # اجرای کد در یک محیط محدود شده
-        output_buffer = io.StringIO()
-        exec(
-            code_to_execute,
-            {"client": client, "event": event, "logger": logger, "__builtins__": {}}, # دسترسی محدود
-            {"_result": None, "_print_capture": output_buffer}
-        )
-        result = output_buffer.getvalue()
-        if not result: # اگر کدی چیزی چاپ نکرد، ممکن است متغیری را تنظیم کرده باشد
-            result = "کد اجرا شد (خروجی متنی ندارد)."
-        
-        await event.edit(f"**خروجی اجرای کد:**\n```python\n{result}\n```")
-        logger.info(f"دستور .exec با موفقیت اجرا شد. کد: '{code_to_execute}'")
+        await event.edit("⏳ در حال اجرا... (لغو با `.aexec cancel`)")
+        namespace = {
+            'client': client, 'event': event, 'reply': await event.get_reply_message() if event.is_reply else None,
+            'asyncio': asyncio, 'events': events, 'utils': utils, 'entity_cache': entity_cache, 'logger': logger,
+        }
+        started = time.perf_counter()
+        task = asyncio.create_task(run_async_snippet(code_to_execute, namespace))
+        AEXEC_TASKS[event.id] = task
+        try:
+            await asyncio.wait({task}, timeout=AEXEC_TIMEOUT)
+        finally:
+            AEXEC_TASKS.pop(event.id, None)
+        seconds = time.perf_counter() - started
+        if not task.done():
+            task.cancel()
+            await event.edit(f"**⏱ پس از {AEXEC_TIMEOUT} ثانیه لغو شد.**")
+        elif task.cancelled():
+            await event.edit(f"**🛑 پس از `{seconds:.2f}` ثانیه لغو شد.**")
+        elif task.exception() is not None:
+            await send_exec_output(event, f"**❌ خطا** پس از `{seconds:.2f}` ثانیه", format_exception(task.exception()))
+        else:
+            output, value = task.result()
+            if value is not None:
+                output += repr(value)
+            await send_exec_output(event, f"**✅ اجرا شد** در `{seconds:.2f}` ثانیه", output)
+        logger.info(f"دستور .aexec اجرا شد. کد: '{code_to_execute}'")
     except Exception as e:
-        logger.error(f"خطا در اجرای دستور .exec: {e}")
+        logger.error(f"خطا در اجرای دستور .aexec: {e}")
         await event.edit(f"**خطا در اجرای کد:**\n```\n{e}\n```")
 
-# برای دستور .exec نیاز به import io داریم
-import io
-
 
 # --- لیست جامع دستورات برای نمایش در .help ---
 COMMANDS_LIST = {
@@ -2288,7 +1683,8 @@ COMMANDS_LIST = {
     ".chatid": "آیدی چت فعلی را نمایش می‌دهد.",
     ".info": "اطلاعات حساب شما را نشان می‌دهد.",
     ".del": "پیام ریپلای شده را پاک می‌کند (اگر خودتان یا ادمین با حق حذف باشید).",
-    ".purge [تعداد]": "N پیام آخر ارسالی شما را پاک می‌کند (پیش‌فرض: ۱۰).",
+    ".purge [تعداد|from-reply|resume]": "N پیام آخر ارسالی شما (پیش‌فرض: ۱۰) یا همه از پیام ریپلای شده به بعد را پاک می‌کند؛ resume پاکسازی نیمه‌کاره را ادامه می‌دهد.",
+    ".gpurge [--since YYYY-MM-DD] [--match متن] [--pm]": "پیام‌های شما را در همه گروه‌ها (و با --pm در چت‌های خصوصی) پاک می‌کند.",
     ".readall": "تمام پیام‌های خوانده نشده را به عنوان خوانده شده علامت می‌زند.",
     ".type <متن>": "شبیه‌سازی می‌کند که در حال تایپ متنی هستید و سپس آن را ارسال می‌کند.",
     ".afk [دلیل]": "حالت AFK (دور از کیبورد) را فعال می‌کند. به پیام‌های خصوصی و گروه‌ها پاسخ می‌دهد.",
@@ -2301,7 +1697,7 @@ COMMANDS_LIST = {
     ".reverse <متن>": "متن ارسالی را برعکس می‌کند.",
     ".upcase <متن>": "متن را به حروف بزرگ تبدیل می‌کند.",
     ".lowcase <متن>": "متن را به حروف کوچک تبدیل می‌کند.",
-    ".calc <عبارت>": "یک عبارت ریاضی ساده را محاسبه می‌کند (مثال: .calc 2+2*2).",
+    ".calc <عبارت>": "عبارت ریاضی را محاسبه می‌کند (مثال: .calc 2+2*2)؛ `.calc x = 5` متغیر می‌سازد، `ans` نتیجه قبلی است و `.calc` بدون عبارت متغیرها را نشان می‌دهد.",
     ".quote": "یک نقل قول تصادفی نمایش می‌دهد.",
     ".dice": "یک تاس مجازی پرتاب می‌کند (۱ تا ۶).",
     ".coin": "یک سکه مجازی پرتاب می‌کند (شیر یا خط).",
@@ -2310,48 +1706,75 @@ COMMANDS_LIST = {
     ".gm": "ارسال پیام 'صبح بخیر'.",
     ".gn": "ارسال پیام 'شب بخیر'.",
     ".time": "زمان فعلی را نمایش می‌دهد.",
-    ".google <عبارت>": "یک لینک جستجوی گوگل برای عبارت مورد نظر ایجاد می‌کند.",
-    ".ddg <عبارت>": "یک لینک جستجوی DuckDuckGo برای عبارت مورد نظر ایجاد می‌کند.",
     ".id": "آیدی کاربر ریپلای شده یا چت فعلی را نمایش می‌دهد.",
     ".username": "یوزرنیم کاربر ریپلای شده یا خودتان را نمایش می‌دهد.",
     ".whois [یوزرنیم/آیدی/ریپلای]": "اطلاعات یک کاربر را نمایش می‌دهد.",
     ".chatinfo [یوزرنیم/آیدی/ریپلای]": "اطلاعات یک چت (گروه/کانال) را نمایش می‌دهد.",
-    ".pfp": "عکس پروفایل کاربر ریپلای شده یا خودتان را ارسال می‌کند.",
-    ".setpfp <مسیر/لینک>": "عکس پروفایل شما را تنظیم می‌کند.",
-    ".delpfp": "آخرین عکس پروفایل شما را حذف می‌کند.",
     ".react <اموجی>": "به پیامی که روی آن ریپلای شده، با اموجی واکنش نشان می‌دهد.",
-    ".ud <کلمه>": "معنی یک کلمه را از Urban Dictionary جستجو می‌کند.",
-    ".weather <شهر>": "آب و هوای یک شهر را نمایش می‌دهد (نیاز به OWM API Key).",
-    ".wiki <عبارت>": "خلاصه‌ای از ویکی‌پدیا را برای عبارت مورد نظر نمایش می‌دهد.",
-    ".translate <کد_زبان> <متن>": "متن را به زبان مقصد ترجمه می‌کند (مثال: .translate en سلام).",
     ".carbon": "متن ریپلای شده را به فرمت 'Carbon' تبدیل می‌کند (ارسال لینک Carbon.sh).",
-    ".figlet <متن>": "متن شما را به هنر اسکی (ASCII Art) با استفاده از Figlet تبدیل می‌کند.",
     ".speedtest": "تست سرعت اینترنت (دانلود، آپلود، پینگ) را انجام می‌دهد.",
     ".ipinfo": "اطلاعات IP عمومی شما را نمایش می‌دهد.",
     ".sysinfo": "اطلاعات سیستم عامل، CPU و RAM را نمایش می‌دهد.",
-    ".imdb <عنوان>": "اطلاعات یک فیلم/سریال را از IMDB نمایش می‌دهد (نیاز به OMDb API Key).",
-    ".sendfile <مسیر_فایل>": "یک فایل از مسیر مشخص شده را ارسال می‌کند.",
-    ".downloadmedia": "فایل رسانه‌ای پیام ریپلای شده را دانلود می‌کند.",
-    ".pin": "پیام ریپلای شده را پین می‌کند (نیاز به دسترسی ادمین).",
-    ".unpin": "آخرین پیام پین شده را از حالت پین خارج می‌کند (نیاز به دسترسی ادمین).",
     ".forward <تعداد>": "N پیام آخر را به Saved Messages یا چت ریپلای شده فوروارد می‌کند.",
-    ".kick": "کاربر ریپلای شده را از گروه بیرون می‌کند (نیاز به ادمین بودن و حق بن).",
-    ".ban": "کاربر ریپلای شده را از گروه بن می‌کند (نیاز به ادمین بودن و حق بن).",
-    ".unban": "کاربر ریپلای شده را از بن خارج می‌کند (نیاز به ادمین بودن و حق بن).",
-    ".mute [مدت زمان]": "کاربر ریپلای شده را در گروه میوت می‌کند (نیاز به ادمین بودن و حق بن).",
-    ".unmute": "کاربر ریپلای شده را از میوت خارج می‌کند (نیاز به ادمین بودن و حق بن).",
-    ".promote": "کاربر ریپلای شده را به ادمین گروه/کانال ارتقا می‌دهد (فقط سازنده).",
-    ".demote": "کاربر ریپلای شده را از ادمینی خارج می‌کند (فقط سازنده).",
     ".uptime": "مدت زمان فعال بودن اسکریپت را نمایش می‌دهد.",
     ".restart": "اسکریپت را ری‌استارت می‌کند (ممکن است نیاز به اجرای مجدد از ترمینال باشد).",
-    ".exec <کد پایتون>": "**بسیار خطرناک!** یک خط کد پایتون را اجرا می‌کند. فقط کدهای مورد اعتماد را اجرا کنید."
+    ".reload": "کد دستورات و پلاگین‌ها را بدون قطع اتصال دوباره بارگذاری می‌کند (کش‌ها و وضعیت‌ها حفظ می‌شوند).",
+    ".kill": "وضعیت را ذخیره کرده و سلف را فوراً خاموش می‌کند.",
+    ".وضعیت": "تنظیمات روشن/خاموش پلاگین‌ها (ساعت، منشی، فونت و ...) و آمار کش‌ها را نمایش می‌دهد.",
+    ".help / .راهنما": "همین راهنما.",
+    ".exec <کد پایتون>": "**خطرناک!** کد پایتون را در پروسه جداگانه با محدودیت زمان، CPU و حافظه اجرا می‌کند؛ خروجی طولانی به صورت فایل ارسال می‌شود.",
+    ".aexec <کد پایتون>": "**خطرناک!** کد async (با await و دسترسی به client) را داخل ربات اجرا می‌کند؛ `.aexec cancel` اجراهای در حال انجام را لغو می‌کند."
 }
 
 
-@client.on(events.NewMessage(pattern=r'^\.help(?:@\w+)?$', outgoing=True))
+@client.on(events.NewMessage(pattern=r'^\.([\s\S]+)$', outgoing=True))
+async def plugin_command(event):
+    """
+    دستورات پلاگین‌ها (از جمله دستورات چندکلمه‌ای مثل `.clock on`) را اجرا می‌کند؛
+    ماژول پلاگین فقط در اولین استفاده از یکی از دستوراتش import می‌شود.
+    """
+    if event.sender_id != OWNER_ID:
+        return
+    matched = plugins.match(event.pattern_match.group(1))
+    if matched is None:
+        return
+    name, args = matched
+
+    try:
+        await plugins.run(name, event, args)
+        logger.info(f"دستور .{name} (پلاگین) با موفقیت اجرا شد.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .{name}: {e}")
+        await event.edit(f"خطا در اجرای دستور: `{e}`")
+
+
+@client.on(events.NewMessage(pattern=r'^\.وضعیت(?:@\w+)?$', outgoing=True))
+async def status_command(event):
+    """
+    .وضعیت: تنظیمات روشن/خاموش پلاگین‌های بارگذاری شده و آمار کش‌ها را نمایش می‌دهد.
+    """
+    if event.sender_id != OWNER_ID:
+        return
+
+    try:
+        cache_stats = entity_cache.stats()
+        directory_stats = peer_directory.stats()
+        lines = ["<b>Current Self-Bot Settings:</b>"]
+        lines.extend(plugins.status_lines())
+        lines.append(f"🗂️ Entity Cache: <b>{cache_stats['size']}</b> entries, hit rate <b>{cache_stats['hit_rate']:.0%}</b> (usernames from directory: {directory_stats['directory_hits']}, from network: {directory_stats['network_resolves']})")
+        lines.append(f"🚦 Flood Waits: <b>{client.scheduler.flood_waits}</b> (paused buckets: {len(client.scheduler.paused())})")
+        lines.append(f"🧩 Loaded Plugins: <b>{', '.join(plugins.loaded) or 'None'}</b>")
+        await event.edit("\n".join(lines), parse_mode='html')
+        logger.info("دستور .وضعیت با موفقیت اجرا شد.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .وضعیت: {e}")
+        await event.edit(f"خطا در نمایش وضعیت: `{e}`")
+
+
+@client.on(events.NewMessage(pattern=r'^\.(?:help|راهنما)(?:@\w+)?$', outgoing=True))
 async def help_command(event):
     """
-    .help: لیستی از دستورات موجود را نمایش می‌دهد.
+    .help / .راهنما: لیستی از دستورات موجود (دستورات اصلی و پلاگین‌ها) را نمایش می‌دهد.
     """
     if event.sender_id != OWNER_ID:
         return
@@ -2369,14 +1792,31 @@ async def help_command(event):
     # تلگرام محدودیت ۴۰۹۶ کاراکتر برای هر پیام دارد.
     MAX_MESSAGE_LENGTH = 4000 
 
-    for cmd, desc in sorted(COMMANDS_LIST.items()):
-        cmd_line = f"`{cmd}`: {desc}\n"
+    # هر دستور: (توضیح، وابستگی نصب‌نشده یا None). دستورات پلاگین‌ها از manifest خوانده می‌شوند،
+    # بدون import ماژول‌هایشان؛ وجود وابستگی‌ها هم فقط با جستجوی spec بررسی می‌شود.
+    all_commands = {}
+    for cmd, desc in COMMANDS_LIST.items():
+        dependency = COMMAND_DEPENDENCIES.get(cmd.split()[0])
+        all_commands[cmd] = (desc, dependency[1] if dependency and not dependency[0] else None)
+    for _, cmd, desc in plugins.help_entries():
+        all_commands[f".{cmd}"] = (desc, plugins.missing_dependency(cmd))
+
+    sent_first_page = False
+    for cmd, (desc, missing) in sorted(all_commands.items()):
+        cmd_line = f"`{cmd}`: {desc}"
+        if missing:
+            cmd_line += f" (⚠️ نیازمند `pip install {missing}`)"
+        cmd_line += "\n"
         if current_length + len(cmd_line) > MAX_MESSAGE_LENGTH - 200: # 200 کاراکتر برای هشدار و ادامه پیام
             help_text_parts.append("\n**...ادامه در پیام بعدی...**\n")
             
-            # ارسال صفحه فعلی و شروع صفحه جدید
+            # ارسال صفحه فعلی و شروع صفحه جدید؛ صفحه اول جایگزین پیام دستور می‌شود و بقیه پیام جدید هستند
             final_help_text = "".join(help_text_parts)
-            await event.edit(final_help_text, parse_mode='md')
+            if sent_first_page:
+                await event.respond(final_help_text, parse_mode='md')
+            else:
+                await event.edit(final_help_text, parse_mode='md')
+                sent_first_page = True
             
             help_text_parts = []
             page_number += 1
@@ -2394,7 +1834,10 @@ async def help_command(event):
     final_help_text = "".join(help_text_parts)
 
     try:
-        await event.edit(final_help_text, parse_mode='md')
+        if sent_first_page:
+            await event.respond(final_help_text, parse_mode='md')
+        else:
+            await event.edit(final_help_text, parse_mode='md')
         logger.info("دستور .help با موفقیت اجرا شد.")
     except Exception as e:
         logger.error(f"خطا در اجرای دستور .help: {e}")
@@ -2422,9 +1865,15 @@ async def main():
         return
 
     try:
+        # بازیابی وضعیت ذخیره شده قبل از دریافت اولین آپدیت
+        if state_snapshot.restore():
+            print("✅ وضعیت قبلی (AFK، پاسخ‌های داده شده، کش‌ها) بازیابی شد.")
+        startup_profiler.mark('restore state')
+
         # اتصال به تلگرام
         await client.start()
         user_me = await client.get_me()
+        startup_profiler.mark('connect + login')
         print(f"✅ متصل شد! حساب: @{user_me.username or user_me.first_name} (ID: {user_me.id})")
         print(f"✅ مالک (Owner ID) تنظیم شده: `{OWNER_ID}`")
         if user_me.id != OWNER_ID:
@@ -2432,6 +1881,13 @@ async def main():
             print(f"لطفاً 'OWNER_ID' را به `{user_me.id}` تغییر دهید تا از امنیت کامل اطمینان حاصل کنید.")
             print("در غیر این صورت، ربات فقط به پیام‌های کاربر با ID فعلی 'OWNER_ID' پاسخ خواهد داد.")
 
+        peer_directory.start_autosave()
+        state_snapshot.start_autosave() # ذخیره دوره‌ای و هنگام SIGTERM
+        plugins.start() # حلقه‌های پلاگین‌ها (ساعت پروفایل، بررسی نشست‌ها، صف دانلود و ...)
+        startup_profiler.mark('startup tasks')
+        if startup_profiler.enabled:
+            print(startup_profiler.report())
+
         print("اسکریپت در حال گوش دادن به دستورات است. (پیشوند دستورات: .)")
         print("برای دستورات بیشتر، در تلگرام `.help` را ارسال کنید.")
         print("\n** ⚠️ هشدار جدی: این اسکریپت به شدت در تضاد با شرایط استفاده از تلگرام است. مسئولیت کامل و عواقب احتمالی با شماست. ⚠️ **")
@@ -2462,7 +1918,9 @@ async def main():
         print("اگر برای اولین بار است که اجرا می‌کنید، ممکن است به دلیل مشکلات احراز هویت باشد.")
         print("فایل سشن (.session) را حذف کرده و مجدداً امتحان کنید.")
         input("کلید Enter را فشار دهید تا خارج شوید...")
+    finally:
+        state_snapshot.save() # ذخیره نهایی وضعیت هنگام خاموشی
 
-if __name__ == '__main__':
+if __name__ == '__main__' and not is_reloading():
     # Telethon و asyncio با هم کار می‌کنند
     asyncio.run(main())
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Shared runtime pieces used by the self-bot script and its plugins (caches, stores, schedulers)."""
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Cached admin rights per chat for the moderation commands.
+
+Our own permissions in a chat are fetched once (one GetParticipant/GetFullChat) and kept
+for a while. The full admin list, needed when asking about somebody else, is paged with
+iter_participants(filter=ChannelParticipantsAdmins) instead of a single capped request.
+Admin-change updates for a chat drop its cached entries, so the cache never outlives a
+promotion or demotion we are told about.
+"""
+import asyncio
+import logging
+import time
+
+from telethon import events, utils
+from telethon.errors.rpcerrorlist import ChannelPrivateError, ChatAdminRequiredError, UserNotParticipantError
+from telethon.tl import types
+from telethon.tl.custom import ParticipantPermissions
+
+logger = logging.getLogger(__name__)
+
+# Updates after which a chat's admin set or our own rights in it may have changed.
+ADMIN_UPDATES = (
+    types.UpdateChannelParticipant,
+    types.UpdateChatParticipant,
+    types.UpdateChatParticipantAdmin,
+    types.UpdateChatParticipants,
+    types.UpdateChannel,
+)
+
+
+def update_chat_id(update):
+    """Marked chat id an admin-related update refers to, or None."""
+    if getattr(update, 'channel_id', None):
+        return utils.get_peer_id(types.PeerChannel(update.channel_id))
+    chat_id = getattr(update, 'chat_id', None) or getattr(getattr(update, 'participants', None), 'chat_id', None)
+    return utils.get_peer_id(types.PeerChat(chat_id)) if chat_id else None
+
+
+class AdminRightsService:
+    """Our own permissions and the admin list of each chat, cached with a TTL."""
+
+    def __init__(self, client, ttl=600):
+        self.client = client
+        self.ttl = ttl
+        self._own = {}      # chat_id -> (expires, ParticipantPermissions or None)
+        self._admins = {}   # chat_id -> (expires, {user_id: ParticipantPermissions})
+        self._inflight = {}
+        self._self_id = None
+        self.hits = 0
+        self.misses = 0
+
+    def install(self):
+        """Registers the update handler that invalidates chats on admin changes."""
+        self.client.add_event_handler(self._on_admin_update, events.Raw(types=ADMIN_UPDATES))
+
+    async def permissions(self, chat_id, user_id=None):
+        """ParticipantPermissions of a user (default: ourselves) in a chat, or None if not a member/unknown."""
+        if user_id is None or user_id == await self._get_self_id():
+            return await self._cached(self._own, chat_id, self._fetch_own)
+        admins = await self._cached(self._admins, chat_id, self._fetch_admins)
+        return (admins or {}).get(user_id)
+
+    async def can(self, chat_id, right):
+        """True if we are the creator or an admin holding `right` (e.g. 'delete_messages') in the chat."""
+        perms = await self.permissions(chat_id)
+        return bool(perms and perms.is_admin and getattr(perms, right))
+
+    def invalidate(self, chat_id):
+        self._own.pop(chat_id, None)
+        self._admins.pop(chat_id, None)
+
+    # --- internals ---
+
+    async def _get_self_id(self):
+        if self._self_id is None:
+            me = await self.client.get_me(input_peer=True)
+            self._self_id = me.user_id
+        return self._self_id
+
+    async def _cached(self, table, chat_id, fetch):
+        entry = table.get(chat_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        key = (id(table), chat_id)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(fetch(chat_id))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        value = await asyncio.shield(pending)
+        table[chat_id] = (time.monotonic() + self.ttl, value)
+        return value
+
+    async def _fetch_own(self, chat_id):
+        try:
+            return await self.client.get_permissions(chat_id, 'me')
+        except (UserNotParticipantError, ChannelPrivateError, ValueError, TypeError):
+            return None  # Not a member, or not a group/channel (e.g. a private chat)
+
+    async def _fetch_admins(self, chat_id):
+        admins = {}
+        try:
+            async for user in self.client.iter_participants(chat_id, filter=types.ChannelParticipantsAdmins):
+                is_chat = not isinstance(user.participant, (types.ChannelParticipantAdmin, types.ChannelParticipantCreator))
+                admins[user.id] = ParticipantPermissions(user.participant, is_chat)
+        except (ChatAdminRequiredError, ChannelPrivateError, ValueError, TypeError) as e:
+            logger.warning(f"Could not list admins of {chat_id}: {e}")
+        return admins
+
+    async def _on_admin_update(self, update):
+        chat_id = update_chat_id(update)
+        if chat_id is not None and (chat_id in self._own or chat_id in self._admins):
+            logger.info(f"Admin change in {chat_id}; dropping its cached rights.")
+            self.invalidate(chat_id)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Resolves many peer ids at once for list commands.
+
+Ids already in the entity cache are answered immediately. The rest are looked up in the
+session (no network) to get their input peers. Those are fetched in chunks through
+client.get_entity(list), which Telethon turns into one GetUsers/GetChannels/GetChats call per
+peer type, with a bounded number of chunks in flight. Ids the session has never seen cannot
+be fetched without an access hash. They are reported as unresolved right away rather than
+tried one by one until they time out. show_entity_list() uses this to render rule lists
+(auto-replies, reaction targets, ...) with names filled in as they arrive.
+"""
+import asyncio
+import html
+import logging
+import time
+
+from telethon import utils
+from telethon.errors import MessageNotModifiedError
+from telethon.tl.types import User
+
+from selfbot.report_queue import split_digest
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResolver:
+    """Cache-first, chunked and concurrent entity resolution for lists of ids."""
+
+    def __init__(self, client, cache, concurrency=4, chunk_size=100, timeout=15):
+        self.client = client
+        self.cache = cache
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+    async def resolve(self, ids, on_progress=None):
+        """
+        Returns {id: entity or None} for the given ids. on_progress(partial_results), if given,
+        is awaited after the cached ids are known and again after every fetched chunk.
+        """
+        results = {}
+        to_fetch = []
+        for peer_id in dict.fromkeys(ids):
+            entity = self.cache.peek(peer_id)
+            if entity is not None:
+                results[peer_id] = entity
+                continue
+            try:
+                to_fetch.append((peer_id, self.client.session.get_input_entity(peer_id)))
+            except (ValueError, TypeError):
+                results[peer_id] = None  # Never seen by this session: no access hash to fetch it with
+        if on_progress:
+            await on_progress(results)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                try:
+                    entities = await asyncio.wait_for(
+                        self.client.get_entity([peer for _, peer in chunk]), timeout=self.timeout
+                    )
+                except Exception as e:
+                    logger.warning(f"Batch lookup of {len(chunk)} peers failed: {e}")
+                    entities = [None] * len(chunk)
+            for (peer_id, _), entity in zip(chunk, entities):
+                if entity is not None:
+                    self.cache.put(entity)
+                results[peer_id] = entity
+            if on_progress:
+                await on_progress(results)
+
+        chunks = [to_fetch[i:i + self.chunk_size] for i in range(0, len(to_fetch), self.chunk_size)]
+        await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return results
+
+
+def display_name(entity):
+    """First name / title of a resolved entity for list output."""
+    return utils.get_display_name(entity) or str(utils.get_peer_id(entity))
+
+
+def entity_label(entity_id, resolved, final):
+    """HTML label for an id in a list: its name once resolved, a placeholder while pending."""
+    if entity_id not in resolved:
+        return f"<i>…</i> (ID: <code>{entity_id}</code>)" if not final else f"Unknown Entity (ID: <code>{entity_id}</code>)"
+    entity = resolved[entity_id]
+    if entity is None:
+        return f"Unknown Entity (ID: <code>{entity_id}</code>)"
+    name = html.escape(display_name(entity))
+    link = f"<a href='tg://user?id={entity_id}'>{name}</a>" if isinstance(entity, User) else f"<b>{name}</b>"
+    return f"{link} (ID: <code>{entity_id}</code>)"
+
+
+async def show_entity_list(event, resolver, header, rows, format_line):
+    """
+    Renders a list whose rows reference entity ids, filling names in as `resolver` finds them.
+    rows are (entity_id or None, data); format_line(data, label) returns one HTML line.
+    Output longer than one message continues in follow-up messages.
+    """
+    resolved = {}
+    last_render = 0.0
+
+    def pages(final):
+        lines = [format_line(data, entity_label(entity_id, resolved, final) if entity_id else "") for entity_id, data in rows]
+        return split_digest(header, lines, separator='\n')
+
+    async def on_progress(partial):
+        nonlocal last_render
+        resolved.update(partial)
+        if time.monotonic() - last_render >= 1.5:  # Keep progressive edits well under the edit rate limit
+            last_render = time.monotonic()
+            try:
+                await event.edit(pages(False)[0], parse_mode='html')
+            except MessageNotModifiedError:
+                pass
+
+    await resolver.resolve([entity_id for entity_id, _ in rows if entity_id], on_progress)
+    final_pages = pages(True)
+    try:
+        await event.edit(final_pages[0], parse_mode='html')
+    except MessageNotModifiedError:
+        pass
+    for page in final_pages[1:]:
+        await event.respond(page, parse_mode='html')
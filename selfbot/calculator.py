@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded arithmetic evaluator for `.calc`.
+
+The old command filtered the input down to a set of characters and handed the rest to eval(),
+so `9**9**9` or a huge factorial could keep the event loop busy for minutes. Expressions are
+now parsed with ast and checked against a whitelist of node types, then evaluated by walking
+the tree. Every step counts against an operation limit and the wall-clock budget. A single C
+call holds the GIL and cannot be interrupted by the deadline, so every operator and function
+that could do unbounded work in one call (powers, products, shifts, factorial, round's
+ndigits, lcm, sum's start value) has its arguments checked *before* it runs, and no single
+operation can produce a number larger than `max_bits`. The parsed tree of an expression is cached,
+so repeating a calculation skips parsing and validation. `name = expr` stores a variable,
+which later calls can use, and `ans` always holds the last result. evaluate() is synchronous;
+the bot runs it in the thread pool, off the event loop.
+"""
+import ast
+import logging
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CalcError(ValueError):
+    """The expression is not allowed or exceeds a limit; the message is shown to the user."""
+
+
+_BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: None, ast.LShift: None,
+    ast.RShift: operator.rshift, ast.BitAnd: operator.and_, ast.BitOr: operator.or_, ast.BitXor: operator.xor,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg, ast.Invert: operator.invert, ast.Not: operator.not_}
+_COMPARE_OPS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+_ALLOWED_NODES = (
+    ast.Expression, ast.Module, ast.Expr, ast.Assign, ast.Name, ast.Load, ast.Store, ast.Constant,
+    ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.And, ast.Or, ast.Compare, ast.IfExp, ast.Call, ast.Tuple, ast.List,
+    *_BIN_OPS, *_UNARY_OPS, *_COMPARE_OPS,
+)
+
+CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+
+
+class Calculator:
+    """Evaluates arithmetic expressions under fixed limits and keeps the user's variables."""
+
+    def __init__(self, max_bits=4096, max_exponent=10000, max_operations=10000, max_items=1000,
+                 time_budget=1.0, max_length=500, cache_size=256):
+        self.max_bits = max_bits                # largest integer result, in bits (~1233 digits)
+        self.max_exponent = max_exponent        # largest exponent / factorial argument
+        self.max_operations = max_operations    # evaluated nodes per expression
+        self.max_items = max_items              # largest list/tuple literal
+        self.time_budget = time_budget          # seconds per expression
+        self.max_length = max_length            # characters per expression
+        self.cache_size = cache_size
+        self.variables = {}
+        self._cache = OrderedDict()             # expression text -> (target name or None, validated tree)
+        self._lock = threading.Lock()           # one evaluation at a time; the counters below are shared
+        self._functions = {
+            'sqrt': math.sqrt, 'sin': math.sin, 'cos': math.cos, 'tan': math.tan, 'asin': math.asin,
+            'acos': math.acos, 'atan': math.atan, 'atan2': math.atan2, 'sinh': math.sinh, 'cosh': math.cosh,
+            'tanh': math.tanh, 'log': math.log, 'log10': math.log10, 'log2': math.log2, 'exp': math.exp,
+            'floor': math.floor, 'ceil': math.ceil, 'trunc': math.trunc, 'degrees': math.degrees,
+            'radians': math.radians, 'hypot': math.hypot, 'gcd': math.gcd, 'lcm': self._lcm,
+            'abs': abs, 'round': self._round, 'int': int, 'float': float, 'sum': self._sum, 'max': max,
+            'min': min, 'len': len, 'pow': self._pow_function, 'factorial': self._factorial,
+            'comb': self._comb, 'perm': self._perm,
+        }
+
+    # --- public ---
+
+    def evaluate(self, text):
+        """
+        Evaluates `text` ("expr" or "name = expr"). Returns (name, value); name is None for a plain
+        expression. Raises CalcError for rejected input and the usual arithmetic errors otherwise.
+
+        >>> calc = Calculator()
+        >>> calc.evaluate('x = 2**10')
+        ('x', 1024)
+        >>> calc.evaluate('x // 4 + ans')
+        (None, 1280)
+        >>> calc.evaluate('9**9**9')  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        selfbot.calculator.CalcError: exponent too large
+        >>> calc.evaluate('round(1, -10**1000)')  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        selfbot.calculator.CalcError: ndigits too large
+        """
+        with self._lock:
+            target, tree = self._compile(text)
+            self._operations = 0
+            self._deadline = time.monotonic() + self.time_budget
+            value = self._eval(tree)
+            if target:
+                self.variables[target] = value
+            self.variables['ans'] = value
+            return target, value
+
+    def dump(self):
+        """Variables as JSON data, for the state snapshot."""
+        return {name: value for name, value in self.variables.items()
+                if isinstance(value, (int, float, bool, list))}
+
+    def load(self, data):
+        self.variables.update(data)
+
+    # --- parsing ---
+
+    def _compile(self, text):
+        text = text.strip()
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+        if not text:
+            raise CalcError("عبارت خالی است")
+        if len(text) > self.max_length:
+            raise CalcError(f"عبارت طولانی‌تر از {self.max_length} کاراکتر است")
+        try:
+            module = ast.parse(text, mode='exec')
+        except SyntaxError as e:
+            raise CalcError(f"عبارت نامعتبر: {e.msg}") from None
+        if len(module.body) != 1:
+            raise CalcError("فقط یک عبارت یا یک انتساب مجاز است")
+        statement = module.body[0]
+        if isinstance(statement, ast.Assign):
+            if len(statement.targets) != 1 or not isinstance(statement.targets[0], ast.Name):
+                raise CalcError("فقط انتساب به یک نام ساده مجاز است: `x = 2*3`")
+            target, tree = statement.targets[0].id, statement.value
+            if target in self._functions or target in CONSTANTS:
+                raise CalcError(f"نام `{target}` رزرو شده است")
+        elif isinstance(statement, ast.Expr):
+            target, tree = None, statement.value
+        else:
+            raise CalcError("فقط عبارات ریاضی مجاز هستند")
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise CalcError(f"`{type(node).__name__}` مجاز نیست")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise CalcError("فقط اعداد مجاز هستند")
+            if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords
+                                               or node.func.id not in self._functions):
+                raise CalcError("فقط توابع مجاز را می‌توان صدا زد (مثلاً `sqrt(2)`)")
+            if isinstance(node, (ast.Tuple, ast.List)) and len(node.elts) > self.max_items:
+                raise CalcError(f"لیست بیش از {self.max_items} عضو دارد")
+        self._cache[text] = (target, tree)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return target, tree
+
+    # --- evaluation ---
+
+    def _eval(self, node):
+        self._operations += 1
+        if self._operations > self.max_operations:
+            raise CalcError(f"عبارت بیش از {self.max_operations} عملیات دارد")
+        if time.monotonic() > self._deadline:
+            raise CalcError(f"محاسبه بیش از {self.time_budget:g} ثانیه طول کشید")
+
+        if isinstance(node, ast.Constant):
+            return self._check(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in self.variables:
+                return self.variables[node.id]
+            if node.id in CONSTANTS:
+                return CONSTANTS[node.id]
+            raise CalcError(f"متغیر `{node.id}` تعریف نشده است")
+        if isinstance(node, ast.BinOp):
+            left, right = self._eval(node.left), self._eval(node.right)
+            return self._check(self._binary(type(node.op), left, right))
+        if isinstance(node, ast.UnaryOp):
+            return self._check(_UNARY_OPS[type(node.op)](self._eval(node.operand)))
+        if isinstance(node, ast.BoolOp):
+            value = self._eval(node.values[0])
+            for operand in node.values[1:]:
+                if bool(value) == isinstance(node.op, ast.Or):
+                    break
+                value = self._eval(operand)
+            return value
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator)
+                if not _COMPARE_OPS[type(op)](left, right):
+                    return False
+                left = right
+            return True
+        if isinstance(node, ast.IfExp):
+            return self._eval(node.body) if self._eval(node.test) else self._eval(node.orelse)
+        if isinstance(node, (ast.Tuple, ast.List)):
+            return [self._eval(element) for element in node.elts]
+        if isinstance(node, ast.Call):
+            args = [self._eval(arg) for arg in node.args]
+            return self._check(self._functions[node.func.id](*args))
+        raise CalcError(f"`{type(node).__name__}` مجاز نیست")
+
+    def _binary(self, op, left, right):
+        if op is ast.Pow:
+            return self._power(left, right)
+        if op is ast.LShift:
+            if isinstance(left, int) and isinstance(right, int) and right > 0 and left.bit_length() + right > self.max_bits:
+                raise CalcError("نتیجه بیش از حد بزرگ است")
+            return left << right
+        if op is ast.Mult:
+            if isinstance(left, int) and isinstance(right, int) and left.bit_length() + right.bit_length() > self.max_bits + 1:
+                raise CalcError("نتیجه بیش از حد بزرگ است")
+            if isinstance(left, list) or isinstance(right, list):
+                raise CalcError("ضرب لیست مجاز نیست")
+        return _BIN_OPS[op](left, right)
+
+    def _power(self, base, exponent, modulus=None):
+        if modulus is not None:
+            return pow(base, exponent, modulus)   # modular powers stay below the modulus
+        if isinstance(exponent, (int, float)) and abs(exponent) > self.max_exponent:
+            raise CalcError(f"توان بزرگ‌تر از {self.max_exponent} مجاز نیست")
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 \
+                and (abs(base).bit_length() - 1) * exponent > self.max_bits:
+            raise CalcError("نتیجه بیش از حد بزرگ است")
+        return base ** exponent
+
+    def _pow_function(self, base, exponent, modulus=None):
+        return self._power(base, exponent, modulus)
+
+    def _round(self, x, ndigits=None):
+        # round(int, -n) computes 10**n in a single call
+        if ndigits is not None and (not isinstance(ndigits, int) or abs(ndigits) > self.max_exponent // 10):
+            raise CalcError(f"تعداد ارقام round حداکثر {self.max_exponent // 10} است")
+        return round(x, ndigits)
+
+    def _lcm(self, *values):
+        # One pair at a time, so each step's operands are already below max_bits
+        result = 1
+        for value in values:
+            result = self._check(math.lcm(result, value))
+        return result
+
+    def _sum(self, values, start=0):
+        # A list start value would make sum() concatenate lists quadratically in one call
+        if not isinstance(start, (int, float)):
+            raise CalcError("مقدار شروع sum باید عدد باشد")
+        return sum(values, start)
+
+    def _factorial(self, n):
+        if not isinstance(n, int) or n > self.max_exponent // 10:
+            raise CalcError(f"factorial فقط برای اعداد صحیح تا {self.max_exponent // 10}")
+        return math.factorial(n)
+
+    def _comb(self, n, k):
+        if not isinstance(n, int) or n > self.max_exponent // 10:
+            raise CalcError(f"comb فقط برای n تا {self.max_exponent // 10}")
+        return math.comb(n, k)
+
+    def _perm(self, n, k=None):
+        if not isinstance(n, int) or n > self.max_exponent // 10:
+            raise CalcError(f"perm فقط برای n تا {self.max_exponent // 10}")
+        return math.perm(n, k)
+
+    def _check(self, value):
+        """Rejects integers above max_bits and over-long lists; floats overflow on their own."""
+        if isinstance(value, int) and value.bit_length() > self.max_bits:
+            raise CalcError("نتیجه بیش از حد بزرگ است")
+        if isinstance(value, list) and len(value) > self.max_items:
+            raise CalcError(f"لیست بیش از {self.max_items} عضو دارد")
+        return value
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+TTL cache of full-chat metadata (member count, pinned message, about, linked chat).
+
+GetFullChannel/GetFullChat are heavyweight requests; commands that only need one field of
+them read it from here instead. Pin/unpin and chat-edit updates patch or drop the cached
+entry, so repeated moderation in one chat does not re-fetch it.
+"""
+import asyncio
+import logging
+import time
+from collections import namedtuple
+
+from telethon import events, utils
+from telethon.tl import types
+from telethon.tl.functions.channels import GetFullChannelRequest
+from telethon.tl.functions.messages import GetFullChatRequest
+
+logger = logging.getLogger(__name__)
+
+ChatMeta = namedtuple('ChatMeta', 'chat_id title participants_count pinned_msg_id about linked_chat_id fetched')
+
+PIN_UPDATES = (types.UpdatePinnedChannelMessages, types.UpdatePinnedMessages)
+
+
+def _update_chat_id(update):
+    if getattr(update, 'channel_id', None):
+        return utils.get_peer_id(types.PeerChannel(update.channel_id))
+    peer = getattr(update, 'peer', None)
+    return utils.get_peer_id(peer) if peer is not None else None
+
+
+class ChatMetaCache:
+    """Full-chat metadata by marked chat id, kept for `ttl` seconds or until an update changes it."""
+
+    def __init__(self, client, ttl=300, max_chats=500):
+        self.client = client
+        self.ttl = ttl
+        self.max_chats = max_chats
+        self._entries = {}   # chat_id -> (expires, ChatMeta)
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def install(self):
+        """Registers the handlers that keep cached entries in sync with pin and chat-edit updates."""
+        self.client.add_event_handler(self._on_pin_update, events.Raw(types=PIN_UPDATES))
+        self.client.add_event_handler(self._on_channel_update, events.Raw(types=types.UpdateChannel))
+        self.client.add_event_handler(self._on_chat_action, events.ChatAction())
+
+    async def get(self, chat):
+        """Returns the ChatMeta of a Chat/Channel entity or marked chat id."""
+        chat_id = chat if isinstance(chat, int) else utils.get_peer_id(chat)
+        entry = self._entries.get(chat_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        pending = self._inflight.get(chat_id)
+        if pending is None:
+            pending = self._inflight[chat_id] = asyncio.ensure_future(self._fetch(chat, chat_id))
+            pending.add_done_callback(lambda _: self._inflight.pop(chat_id, None))
+        return await asyncio.shield(pending)
+
+    def peek(self, chat_id):
+        entry = self._entries.get(chat_id)
+        return entry[1] if entry and entry[0] > time.monotonic() else None
+
+    def note_pinned(self, chat_id, msg_id):
+        """Records a message we pinned as the chat's latest pinned message."""
+        self._patch(chat_id, pinned_msg_id=msg_id)
+
+    def note_unpinned(self, chat_id, msg_id):
+        """Drops the cached pinned id if that message was unpinned (the next one is unknown)."""
+        meta = self.peek(chat_id)
+        if meta and meta.pinned_msg_id == msg_id:
+            self.invalidate(chat_id)
+
+    def invalidate(self, chat_id):
+        self._entries.pop(chat_id, None)
+
+    def dump(self):
+        """Unexpired entries as plain lists (for StateSnapshot)."""
+        now = time.monotonic()
+        return [list(meta) for expires, meta in self._entries.values() if expires > now]
+
+    def load(self, rows):
+        """Re-adds dumped entries for what is left of their TTL, judged by their fetch time."""
+        now = time.time()
+        for row in rows:
+            meta = ChatMeta(*row)
+            remaining = self.ttl - (now - meta.fetched)
+            if remaining > 0:
+                self._store(meta.chat_id, meta)
+                self._entries[meta.chat_id] = (time.monotonic() + remaining, meta)
+
+    # --- internals ---
+
+    async def _fetch(self, chat, chat_id):
+        peer_type = utils.resolve_id(chat_id)[1]
+        if peer_type is types.PeerChannel:
+            full = await self.client(GetFullChannelRequest(chat if not isinstance(chat, int) else await self.client.get_input_entity(chat_id)))
+        elif peer_type is types.PeerChat:
+            full = await self.client(GetFullChatRequest(utils.resolve_id(chat_id)[0]))
+        else:
+            raise ValueError(f"{chat_id} is not a group or channel")
+        title = next((c.title for c in full.chats if utils.get_peer_id(c) == chat_id), None)
+        fc = full.full_chat
+        participants_count = getattr(fc, 'participants_count', None)
+        if participants_count is None and isinstance(getattr(fc, 'participants', None), types.ChatParticipants):
+            participants_count = len(fc.participants.participants)
+        linked = getattr(fc, 'linked_chat_id', None)
+        meta = ChatMeta(
+            chat_id=chat_id,
+            title=title,
+            participants_count=participants_count,
+            pinned_msg_id=getattr(fc, 'pinned_msg_id', None),
+            about=fc.about,
+            linked_chat_id=utils.get_peer_id(types.PeerChannel(linked)) if linked else None,
+            fetched=time.time(),
+        )
+        self._store(chat_id, meta)
+        return meta
+
+    def _store(self, chat_id, meta):
+        if chat_id not in self._entries and len(self._entries) >= self.max_chats:
+            now = time.monotonic()
+            for key in [k for k, (expires, _) in self._entries.items() if expires <= now] or [next(iter(self._entries))]:
+                del self._entries[key]
+        self._entries[chat_id] = (time.monotonic() + self.ttl, meta)
+
+    def _patch(self, chat_id, **fields):
+        entry = self._entries.get(chat_id)
+        if entry:
+            self._entries[chat_id] = (entry[0], entry[1]._replace(**fields))
+
+    async def _on_pin_update(self, update):
+        chat_id = _update_chat_id(update)
+        meta = self.peek(chat_id)
+        if meta is None:
+            return
+        if update.pinned:
+            self._patch(chat_id, pinned_msg_id=max(update.messages + [meta.pinned_msg_id or 0]))
+        elif meta.pinned_msg_id in update.messages:
+            self.invalidate(chat_id)
+
+    async def _on_channel_update(self, update):
+        # Sent for title/about/username changes among others; the update itself carries no fields.
+        self.invalidate(utils.get_peer_id(types.PeerChannel(update.channel_id)))
+
+    async def _on_chat_action(self, event):
+        meta = self.peek(event.chat_id)
+        if meta is None:
+            return
+        if event.new_title:
+            self._patch(event.chat_id, title=event.new_title)
+        elif (event.user_joined or event.user_added) and meta.participants_count is not None:
+            self._patch(event.chat_id, participants_count=meta.participants_count + len(event.user_ids or [0]))
+        elif (event.user_left or event.user_kicked) and meta.participants_count is not None:
+            self._patch(event.chat_id, participants_count=max(0, meta.participants_count - len(event.user_ids or [0])))
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent, deduplicated and resumable media download queue.
+
+Every download is an item keyed by the media's Telegram id and access hash, so asking for
+the same document twice returns the existing item (or the finished file) instead of
+fetching it again. Items and their progress are kept in a JSON state file. A restart picks
+up queued and interrupted items. Large documents resume from the last contiguous part that
+completed. At most `concurrency` items download at a time, and files go to one directory
+under stable names instead of the working directory.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+
+from selfbot.fast_transfer import BIG_FILE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+QUEUED, ACTIVE, DONE, FAILED = 'queued', 'active', 'done', 'failed'
+
+
+def media_key(message):
+    """'<id>:<access_hash>' of a message's document or photo, or None if it has neither."""
+    media = message.document or message.photo
+    if media is None or not hasattr(media, 'access_hash'):
+        return None
+    return f"{media.id}:{media.access_hash}"
+
+
+class DownloadManager:
+    """Queue of media downloads persisted to `state_path`, run `concurrency` at a time."""
+
+    def __init__(self, client, transfer, directory='downloads', state_path='downloads.json',
+                 concurrency=2, keep_finished=200, save_interval=1.0):
+        self.client = client
+        self.transfer = transfer
+        self.directory = directory
+        self.state_path = state_path
+        self.keep_finished = keep_finished
+        self.save_interval = save_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._items = self._load()
+        self._tasks = {}        # key -> asyncio.Task
+        self._callbacks = {}    # key -> [progress_callback]
+        self._last_save = 0.0
+
+    def start(self):
+        """Resumes queued and interrupted items from the state file; items already running are left alone."""
+        for item in self._items.values():
+            if item['status'] in (QUEUED, ACTIVE) and item['key'] not in self._tasks:
+                item['status'] = QUEUED
+                self._spawn(item)
+
+    async def enqueue(self, message, progress_callback=None):
+        """Queues a message's media and returns its item; known media returns the existing item."""
+        key = media_key(message)
+        if key is None:
+            raise ValueError("Message has no downloadable media")
+        item = self._items.get(key)
+        if item and item['status'] == DONE and not os.path.exists(item['path']):
+            item = None  # The file was removed since; fetch it again
+        if item is None:
+            item = self._items[key] = {
+                'key': key,
+                'chat_id': message.chat_id,
+                'msg_id': message.id,
+                'name': message.file.name or f"{'photo' if message.photo else 'document'}_{message.id}{message.file.ext or ''}",
+                'size': message.file.size or 0,
+                'path': None,
+                'status': QUEUED,
+                'parts': 0,
+                'done_bytes': 0,
+                'error': None,
+                'added': time.time(),
+                'finished': None,
+            }
+            item['path'] = os.path.join(self.directory, f"{key.split(':')[0]}_{item['name']}")
+            self._save(force=True)
+        elif item['status'] == FAILED:
+            item['status'] = QUEUED
+            item['error'] = None
+        if progress_callback:
+            self._callbacks.setdefault(key, []).append(progress_callback)
+        if item['status'] == QUEUED and key not in self._tasks:
+            self._spawn(item, message)
+        return item
+
+    async def wait(self, key):
+        """Waits for an item to finish and returns it (status DONE or FAILED)."""
+        task = self._tasks.get(key)
+        if task is not None:
+            return await asyncio.shield(task)
+        return self._items.get(key)
+
+    def items(self, status=None):
+        """Items in the order they were added, optionally only those with the given status."""
+        items = sorted(self._items.values(), key=lambda i: i['added'])
+        return [i for i in items if status is None or i['status'] == status]
+
+    def clear_finished(self):
+        """Drops finished and failed records (the downloaded files stay on disk)."""
+        removed = [k for k, i in self._items.items() if i['status'] in (DONE, FAILED)]
+        for key in removed:
+            del self._items[key]
+        self._save(force=True)
+        return len(removed)
+
+    # --- internals ---
+
+    def _spawn(self, item, message=None):
+        task = asyncio.ensure_future(self._run(item, message))
+        self._tasks[item['key']] = task
+        task.add_done_callback(lambda _: self._tasks.pop(item['key'], None))
+
+    async def _run(self, item, message):
+        async with self._semaphore:
+            item['status'] = ACTIVE
+            self._save(force=True)
+            try:
+                if message is None:
+                    # After a restart: fetch the message again for a fresh file reference.
+                    message = await self.client.get_messages(item['chat_id'], ids=item['msg_id'])
+                    if message is None or media_key(message) != item['key']:
+                        raise ValueError("The source message or its media no longer exists")
+                os.makedirs(self.directory, exist_ok=True)
+                await self._download(item, message)
+                item['status'] = DONE
+                item['finished'] = time.time()
+            except Exception as e:
+                logger.warning(f"Download of {item['name']} failed: {e}")
+                item['status'] = FAILED
+                item['error'] = str(e)
+            finally:
+                self._callbacks.pop(item['key'], None)
+                self._save(force=True)
+        return item
+
+    async def _download(self, item, message):
+        def progress(done, total):
+            item['done_bytes'] = done
+            for callback in self._callbacks.get(item['key'], ()):
+                callback(done, total)
+            self._save()
+
+        if message.document is not None and message.document.size > BIG_FILE_THRESHOLD:
+            def checkpoint(parts):
+                item['parts'] = parts
+
+            await self.transfer.download(message.document, item['path'], progress_callback=progress,
+                                         first_part=item['parts'], on_checkpoint=checkpoint)
+        else:
+            # Small files are fetched in one go; a partial copy is never left under the final name.
+            partial = item['path'] + '.part'
+            await self.client.download_media(message, file=partial, progress_callback=progress)
+            os.replace(partial, item['path'])
+        item['done_bytes'] = item['size']
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return {item['key']: item for item in json.load(f)}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_save < self.save_interval:
+            return
+        self._last_save = now
+        finished = [i for i in self.items() if i['status'] in (DONE, FAILED)]
+        for item in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._items[item['key']]
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(list(self._items.values()), f)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+LRU + TTL cache in front of client.get_entity().
+
+Entities are indexed by marked peer id and by every lowercase username they carry, so a user
+looked up once by @name is also found by id (and the other way round). Unknown usernames are
+cached negatively for a shorter time, so repeating a typo does not cost another
+ResolveUsername. Ids are not: an id Telethon cannot find yet resolves as soon as an update
+or dialog brings its access hash. Concurrent lookups of the same key share one request.
+With a PeerDirectory attached, usernames missing from memory are looked up in the persisted
+session first. get_input() serves callers that only address a peer; it answers from memory
+or from the session without fetching the full entity.
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+
+from telethon import utils
+from telethon.errors.rpcerrorlist import UsernameInvalidError, UsernameNotOccupiedError
+
+logger = logging.getLogger(__name__)
+
+_USERNAME_RE = re.compile(r'^(?:@|(?:https?://)?(?:www\.)?(?:t|telegram)\.me/)?([a-zA-Z][\w]{3,31})/?$')
+
+# Errors that mean "this username does not exist", as opposed to network or flood trouble or
+# an id whose access hash we have not seen yet (ValueError), which may resolve a moment later.
+NOT_FOUND_ERRORS = (UsernameInvalidError, UsernameNotOccupiedError)
+
+
+def cache_key(value):
+    """Normalizes an id or username to a cache key; returns None for things not worth caching (links, phones)."""
+    if isinstance(value, int):
+        return value
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if re.fullmatch(r'-?\d+', value):
+        return int(value)
+    match = _USERNAME_RE.match(value)
+    return match.group(1).lower() if match else None
+
+
+def entity_usernames(entity):
+    names = []
+    if getattr(entity, 'username', None):
+        names.append(entity.username.lower())
+    for extra in getattr(entity, 'usernames', None) or ():
+        if getattr(extra, 'active', True) and extra.username:
+            names.append(extra.username.lower())
+    return names
+
+
+class EntityCache:
+    """Caches resolved entities by id and username with expiry and hit-rate metrics."""
+
+    def __init__(self, client, max_size=5000, ttl=600, negative_ttl=300, directory=None):
+        self.client = client
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()   # key -> (expires, entity or None, error or None)
+        self._inflight = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    async def get(self, value):
+        """Drop-in for client.get_entity(value), served from the cache when possible."""
+        key = cache_key(value)
+        if key is None:
+            return await self.client.get_entity(value)
+
+        entry = self._lookup(key)
+        if entry is not None:
+            entity, error = entry
+            if error is not None:
+                self.negative_hits += 1
+                raise error
+            self.hits += 1
+            return entity
+
+        self.misses += 1
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(self._resolve(key))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def get_input(self, value):
+        """Drop-in for client.get_input_entity(value): a cached entity or stored peer, without a request when possible."""
+        key = cache_key(value)
+        entry = self._lookup(key) if key is not None else None
+        if entry is not None:
+            entity, error = entry
+            if error is not None:
+                self.negative_hits += 1
+                raise error
+            self.hits += 1
+            return utils.get_input_peer(entity)
+        self.misses += 1
+        if isinstance(key, str) and self.directory is not None:
+            return await self.directory.resolve(key, full=False)
+        return await self.client.get_input_entity(value)  # Ids are looked up in the session by Telethon
+
+    def peek(self, value):
+        """Returns a cached entity without any network request (or None)."""
+        key = cache_key(value)
+        entry = self._lookup(key) if key is not None else None
+        return entry[0] if entry else None
+
+    def put(self, entity, ttl=None):
+        """Stores an entity already at hand (e.g. a message sender) under its id and usernames."""
+        if entity is None:
+            return
+        expires = time.monotonic() + (ttl or self.ttl)
+        try:
+            keys = [utils.get_peer_id(entity)]
+        except (TypeError, ValueError):
+            return
+        keys.extend(entity_usernames(entity))
+        for key in keys:
+            self._store(key, (expires, entity, None))
+
+    def invalidate(self, value):
+        key = cache_key(value)
+        entry = self._entries.pop(key, None) if key is not None else None
+        if entry and entry[1] is not None:
+            for other in [utils.get_peer_id(entry[1])] + entity_usernames(entry[1]):
+                self._entries.pop(other, None)
+
+    def stats(self):
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+    # --- internals ---
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _resolve(self, key):
+        try:
+            if isinstance(key, str) and self.directory is not None:
+                entity = await self.directory.resolve(key)
+            else:
+                entity = await self.client.get_entity(key)  # Ids are looked up in the session by Telethon
+        except NOT_FOUND_ERRORS as e:
+            self._store(key, (time.monotonic() + self.negative_ttl, None, e))
+            raise
+        self.put(entity)
+        if key not in self._entries:
+            self._store(key, (time.monotonic() + self.ttl, entity, None))  # e.g. an unmarked id
+        return entity
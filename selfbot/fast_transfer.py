@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-connection file transfers for large media.
+
+Telethon moves a file one part at a time over the client's single connection, so a multi-GB
+transfer is bound by one round trip per part. Here a file is split into fixed-size parts that
+are fetched or uploaded by several extra MTProto senders at once, each with its own connection
+to the DC holding the file. Downloads write every part straight to its offset in a file
+preallocated to the final size. For another DC the authorization is exported once and its key
+is shared by the remaining senders. The senders exist only for the duration of one transfer.
+"""
+import asyncio
+import inspect
+import logging
+import os
+
+from telethon import utils
+from telethon.crypto import AuthKey
+from telethon.errors.rpcerrorlist import FloodWaitError
+from telethon.helpers import generate_random_long
+from telethon.network import MTProtoSender
+from telethon.tl import types
+from telethon.tl.alltlobjects import LAYER
+from telethon.tl.functions import InvokeWithLayerRequest
+from telethon.tl.functions.auth import ExportAuthorizationRequest, ImportAuthorizationRequest
+from telethon.tl.functions.upload import GetFileRequest, SaveBigFilePartRequest
+
+logger = logging.getLogger(__name__)
+
+PART_SIZE = 512 * 1024            # Valid for both upload.getFile and upload.saveBigFilePart
+BIG_FILE_THRESHOLD = 10 * 1024 * 1024   # Telegram's split between small and big uploads
+DEFAULT_CONNECTIONS = 4
+
+
+class ParallelTransfer:
+    """Downloads and uploads files over `connections` parallel senders."""
+
+    def __init__(self, client, connections=DEFAULT_CONNECTIONS):
+        self.client = client
+        self.connections = connections
+
+    async def download(self, media, path, progress_callback=None, first_part=0, on_checkpoint=None):
+        """
+        Downloads a Document (or a message/media holding one) to `path` and returns the path.
+        progress_callback(done_bytes, total_bytes) is called as parts complete.
+
+        For resumable downloads, on_checkpoint(parts) is called whenever the number of
+        contiguous completed parts from the start grows. A later call with first_part=parts
+        continues the same file. When on_checkpoint is given, a failed download leaves the
+        partial file in place instead of removing it.
+        """
+        document = media
+        if isinstance(document, types.Message):
+            document = document.media
+        if isinstance(document, types.MessageMediaDocument):
+            document = document.document
+        if not isinstance(document, types.Document):
+            raise TypeError("Parallel download only handles documents")
+        dc_id, location = utils.get_input_location(document)
+        size = document.size
+        part_count = (size + PART_SIZE - 1) // PART_SIZE
+        if first_part and not os.path.exists(path):
+            first_part = 0
+
+        flags = os.O_RDWR | os.O_CREAT | (0 if first_part else os.O_TRUNC)
+        fd = os.open(path, flags, 0o644)
+        try:
+            os.ftruncate(fd, size)  # Preallocate so parts can land at their offsets in any order
+            done = first_part * PART_SIZE
+            finished = set()
+            prefix = first_part
+
+            async def fetch(sender, index):
+                nonlocal done, prefix
+                offset = index * PART_SIZE
+                result = await self._send(sender, GetFileRequest(location, offset, PART_SIZE, precise=False))
+                _write_at(fd, result.bytes, offset)
+                done += len(result.bytes)
+                finished.add(index)
+                if on_checkpoint and prefix in finished:
+                    while prefix in finished:
+                        finished.discard(prefix)
+                        prefix += 1
+                    await _maybe_await(on_checkpoint(prefix))
+                if progress_callback:
+                    await _maybe_await(progress_callback(min(done, size), size))
+
+            await self._run_parts(dc_id, range(first_part, part_count), fetch)
+        except BaseException:
+            os.close(fd)
+            if on_checkpoint is None:
+                try:
+                    os.remove(path)  # Never leave a preallocated file with holes behind
+                except OSError:
+                    pass
+            raise
+        os.close(fd)
+        return path
+
+    async def upload(self, path, progress_callback=None, file_name=None):
+        """
+        Uploads a file from disk and returns the InputFile/InputFileBig to pass to send_file.
+        Files under Telegram's 10 MB big-file threshold go through the client's own upload.
+        """
+        size = os.path.getsize(path)
+        if size <= BIG_FILE_THRESHOLD:
+            return await self.client.upload_file(path, progress_callback=progress_callback)
+        file_id = generate_random_long()
+        part_count = (size + PART_SIZE - 1) // PART_SIZE
+        done = 0
+
+        with open(path, 'rb') as f:
+            fd = f.fileno()
+
+            async def save(sender, index):
+                nonlocal done
+                data = _read_at(fd, PART_SIZE, index * PART_SIZE)
+                if not await self._send(sender, SaveBigFilePartRequest(file_id, index, part_count, data)):
+                    raise RuntimeError(f"Failed to upload file part {index}")
+                done += len(data)
+                if progress_callback:
+                    await _maybe_await(progress_callback(done, size))
+
+            await self._run_parts(self.client.session.dc_id, range(part_count), save)
+        return types.InputFileBig(file_id, part_count, file_name or os.path.basename(path))
+
+    # --- internals ---
+
+    async def _run_parts(self, dc_id, parts, work):
+        """Runs work(sender, index) for every part index, spread over up to `connections` senders."""
+        queue = asyncio.Queue()
+        for index in parts:
+            queue.put_nowait(index)
+        if queue.empty():
+            return
+        senders = await self._create_senders(dc_id, min(self.connections, queue.qsize()))
+
+        async def worker(sender):
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await work(sender, index)
+
+        try:
+            await asyncio.gather(*(worker(sender) for sender in senders))
+        finally:
+            await asyncio.gather(*(sender.disconnect() for sender in senders), return_exceptions=True)
+
+    async def _create_senders(self, dc_id, count):
+        client = self.client
+        home = dc_id == client.session.dc_id
+        auth_key = client.session.auth_key if home else None
+        senders = []
+        try:
+            for _ in range(count):
+                sender = await self._connect(dc_id, auth_key)
+                senders.append(sender)
+                if auth_key is None:
+                    # First sender to a foreign DC: import our authorization there once.
+                    auth = await client(ExportAuthorizationRequest(dc_id))
+                    client._init_request.query = ImportAuthorizationRequest(id=auth.id, bytes=auth.bytes)
+                    await sender.send(InvokeWithLayerRequest(LAYER, client._init_request))
+                    auth_key = AuthKey(sender.auth_key.key)
+        except BaseException:
+            await asyncio.gather(*(s.disconnect() for s in senders), return_exceptions=True)
+            raise
+        logger.info(f"Opened {len(senders)} transfer connections to DC {dc_id}")
+        return senders
+
+    async def _connect(self, dc_id, auth_key):
+        client = self.client
+        dc = await client._get_dc(dc_id)
+        sender = MTProtoSender(auth_key, loggers=client._log)
+        await sender.connect(client._connection(
+            dc.ip_address, dc.port, dc.id,
+            loggers=client._log, proxy=client._proxy, local_addr=client._local_addr,
+        ))
+        return sender
+
+    @staticmethod
+    async def _send(sender, request):
+        while True:
+            try:
+                return await sender.send(request)
+            except FloodWaitError as e:
+                logger.warning(f"Flood wait of {e.seconds}s during a parallel transfer")
+                await asyncio.sleep(e.seconds)
+
+
+def _write_at(fd, data, offset):
+    if hasattr(os, 'pwrite'):
+        os.pwrite(fd, data, offset)
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)  # No pwrite (Windows): the event loop is single-threaded anyway
+        os.write(fd, data)
+
+
+def _read_at(fd, size, offset):
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+async def _maybe_await(result):
+    if inspect.isawaitable(result):
+        await result
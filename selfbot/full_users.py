@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+TTL cache of full user profiles (users.UserFull plus the profile photo count).
+
+GetFullUser and the photo count request are independent, so a miss issues both at once
+instead of one after the other. The cached object is shared by every command that needs a
+user's bio, current profile photo or photo count, and several users are fetched concurrently.
+"""
+import asyncio
+import logging
+import time
+from collections import namedtuple
+
+from telethon import utils
+from telethon.tl.functions.users import GetFullUserRequest
+
+logger = logging.getLogger(__name__)
+
+# user: the User object, full_user: types.UserFull (about, profile_photo, ...), photo_count: int or None
+UserProfile = namedtuple('UserProfile', 'user full_user photo_count')
+
+
+class FullUserCache:
+    """Full user profiles by user id, kept for `ttl` seconds."""
+
+    def __init__(self, client, entity_cache=None, ttl=300, concurrency=8, max_users=1000):
+        self.client = client
+        self.entity_cache = entity_cache
+        self.ttl = ttl
+        self.max_users = max_users
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._entries = {}   # user_id -> (expires, UserProfile)
+        self._inflight = {}
+
+    async def get(self, user, photo_count=False):
+        """UserProfile for a User/InputUser/id; photo_count=True also makes sure the photo count is known."""
+        user_id = user if isinstance(user, int) else utils.get_peer_id(user)
+        entry = self._entries.get(user_id)
+        if entry and entry[0] > time.monotonic() and (entry[1].photo_count is not None or not photo_count):
+            return entry[1]
+        key = (user_id, photo_count)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(self._fetch(user, user_id, photo_count))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def get_many(self, users, photo_count=False):
+        """Profiles for several users fetched concurrently; failed lookups come back as the exception."""
+        return await asyncio.gather(*(self.get(u, photo_count) for u in users), return_exceptions=True)
+
+    def peek(self, user_id):
+        entry = self._entries.get(user_id)
+        return entry[1] if entry and entry[0] > time.monotonic() else None
+
+    def invalidate(self, user_id):
+        self._entries.pop(user_id, None)
+
+    async def _fetch(self, user, user_id, photo_count):
+        async with self._semaphore:
+            cached = self.peek(user_id)
+            if cached is not None and photo_count:
+                # Only the count is missing.
+                count = await self.client.get_profile_photos(user, limit=0)
+                profile = cached._replace(photo_count=count.total)
+            else:
+                requests = [self.client(GetFullUserRequest(user))]
+                if photo_count:
+                    requests.append(self.client.get_profile_photos(user, limit=0))
+                results = await asyncio.gather(*requests)
+                full = results[0]
+                user_obj = next((u for u in full.users if u.id == full.full_user.id), None)
+                profile = UserProfile(user_obj, full.full_user, results[1].total if photo_count else None)
+                if self.entity_cache is not None and user_obj is not None:
+                    self.entity_cache.put(user_obj)
+        if len(self._entries) >= self.max_users:
+            now = time.monotonic()
+            for key in [k for k, (expires, _) in self._entries.items() if expires <= now] or [next(iter(self._entries))]:
+                del self._entries[key]
+        self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+        return profile
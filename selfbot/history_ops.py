@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk operations over chat history: pipelined deletion with resumable checkpoints, and
+streaming forwarding.
+
+Message ids are read page by page from the server (with server-side sender filtering where
+Telegram supports it). Full batches of 100 ids are deleted in the background while the next
+page is being read, with a bounded number of delete requests in flight. Progress is saved
+as the oldest id of the completed batch prefix, so an interrupted run can continue from
+there: anything newer is already gone.
+
+Forwarding reads oldest first and sends album-safe batches of up to 100 ids. Only one
+forward request is in flight so the target keeps the original order, but the next page is
+read while it runs. Pacing and flood waits are left to the client's outbound scheduler.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 100   # Telegram's limit for messages.deleteMessages / channels.deleteMessages
+FORWARD_BATCH_SIZE = 100  # Telegram's limit for messages.forwardMessages
+
+
+class CheckpointStore:
+    """Small JSON file of resumable job states, written atomically."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        return self._load().get(str(key))
+
+    def set(self, key, state):
+        data = self._load()
+        data[str(key)] = state
+        self._write(data)
+
+    def clear(self, key):
+        data = self._load()
+        if data.pop(str(key), None) is not None:
+            self._write(data)
+
+    def _write(self, data):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class PipelinedDeleter:
+    """Deletes a stream of message ids in 100-id batches while the stream is still being read."""
+
+    def __init__(self, client, chat, max_in_flight=2, on_progress=None, on_checkpoint=None):
+        self.client = client
+        self.chat = chat
+        self.on_progress = on_progress        # (deleted, seen), may return an awaitable
+        self.on_checkpoint = on_checkpoint    # (oldest_done_id, deleted)
+        self.deleted = 0
+        self.seen = 0
+        self.failed = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._batches = []                    # [(oldest id, done flag)] in stream order
+        self._done_prefix = 0
+        self._tasks = []
+
+    async def run(self, ids):
+        """Consumes an async iterable of ids (newest first) and returns the number deleted."""
+        batch = []
+        try:
+            async for msg_id in ids:
+                self.seen += 1
+                batch.append(msg_id)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    await self._submit(batch)
+                    batch = []
+            if batch:
+                await self._submit(batch)
+            await asyncio.gather(*self._tasks)
+        except BaseException:
+            for task in self._tasks:
+                task.cancel()
+            raise
+        return self.deleted
+
+    async def _submit(self, batch):
+        await self._semaphore.acquire()  # Back-pressure: reading waits while max_in_flight deletes run
+        index = len(self._batches)
+        self._batches.append([min(batch), False])
+        self._tasks.append(asyncio.ensure_future(self._delete(index, batch)))
+
+    async def _delete(self, index, batch):
+        try:
+            affected = await self.client.delete_messages(self.chat, batch)
+            count = sum(a.pts_count for a in affected) if affected else len(batch)
+            self.deleted += count
+            self.failed += len(batch) - count
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning(f"Deleting {len(batch)} messages in {self.chat} failed: {e}")
+            raise
+        finally:
+            self._semaphore.release()
+        self._batches[index][1] = True
+        while self._done_prefix < len(self._batches) and self._batches[self._done_prefix][1]:
+            self._done_prefix += 1
+        if self.on_checkpoint and self._done_prefix:
+            self.on_checkpoint(self._batches[self._done_prefix - 1][0], self.deleted)
+        await _notify(self.on_progress, self.deleted, self.seen)
+
+
+async def _notify(callback, *args):
+    """Calls a progress callback the way Telethon does: plain functions and coroutines both work."""
+    if callback:
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+
+
+async def message_ids(client, chat, since=None, **iter_kwargs):
+    """
+    Yields only the ids of client.iter_messages(chat, **iter_kwargs), so callers never hold full
+    messages. With `since` (an aware datetime) iteration stops at the first older message.
+    """
+    async for message in client.iter_messages(chat, **iter_kwargs):
+        if since is not None and message.date < since:
+            break
+        yield message.id
+
+
+async def album_safe_batches(messages, size=FORWARD_BATCH_SIZE):
+    """
+    Groups an async stream of messages into lists of at most `size` ids without splitting an
+    album (messages sharing a grouped_id) across two lists. Only ids and group ids are kept.
+    """
+    batch = []   # [(id, grouped_id)]
+    async for message in messages:
+        batch.append((message.id, message.grouped_id))
+        if len(batch) < size:
+            continue
+        cut = len(batch)
+        last_group = batch[-1][1]
+        if last_group is not None:
+            # The album may continue in the next page; hold it back whole.
+            while cut > 0 and batch[cut - 1][1] == last_group:
+                cut -= 1
+            cut = cut or len(batch)
+        yield [msg_id for msg_id, _ in batch[:cut]]
+        batch = batch[cut:]
+    if batch:
+        yield [msg_id for msg_id, _ in batch]
+
+
+class StreamingForwarder:
+    """Forwards an oldest-first message stream in order, reading ahead while a batch is sent."""
+
+    def __init__(self, client, source, target, on_progress=None):
+        self.client = client
+        self.source = source
+        self.target = target
+        self.on_progress = on_progress        # (forwarded, seen), may return an awaitable
+        self.forwarded = 0
+        self.seen = 0
+
+    async def run(self, messages):
+        """Consumes an async iterable of messages (oldest first) and returns the number forwarded."""
+        pending = None
+        try:
+            async for ids in album_safe_batches(messages):
+                self.seen += len(ids)
+                if pending is not None:
+                    await pending  # The previous batch must land first to keep the order
+                pending = asyncio.ensure_future(self._forward(ids))
+            if pending is not None:
+                await pending
+        except BaseException:
+            if pending is not None:
+                pending.cancel()
+            raise
+        return self.forwarded
+
+    async def _forward(self, ids):
+        sent = await self.client.forward_messages(self.target, ids, from_peer=self.source)
+        self.forwarded += sum(1 for m in sent if m is not None)
+        await _notify(self.on_progress, self.forwarded, self.seen)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Lazily imported optional dependencies.
+
+A LazyModule stands in for a module that only some commands need. Truth-testing it (the
+`if not requests:` guards in the command handlers) only checks that the module can be found
+(importlib.util.find_spec, no import). The real import, and any one-time setup such as
+wikipedia.set_lang, happens on the first attribute access. A LazyObject does the same for
+an object built from optional modules, such as the translator client.
+"""
+import importlib
+import importlib.util
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def is_available(name):
+    """True if a top-level module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyObject:
+    """Proxy for an object made by `factory()` on first use; falsy if `probe()` says it can't be made."""
+
+    def __init__(self, factory, probe, label):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_probe', probe)
+        object.__setattr__(self, '_label', label)
+        object.__setattr__(self, '_value', None)
+        object.__setattr__(self, '_state', None)   # None: not tried, True: loaded, False: failed
+        object.__setattr__(self, '_available', None)
+        object.__setattr__(self, 'load_time', None)
+
+    @property
+    def available(self):
+        if self._state is not None:
+            return self._state
+        if self._available is None:
+            object.__setattr__(self, '_available', bool(self._probe()))
+        return self._available
+
+    @property
+    def loaded(self):
+        return self._state is True
+
+    def load(self):
+        """Builds the object (once) and returns it, or None if that fails."""
+        if self._state is None:
+            started = time.perf_counter()
+            try:
+                value = self._factory()
+                object.__setattr__(self, '_value', value)
+                object.__setattr__(self, '_state', value is not None)
+            except Exception as e:
+                logger.warning(f"Optional dependency {self._label} could not be loaded: {e}")
+                object.__setattr__(self, '_state', False)
+            object.__setattr__(self, 'load_time', time.perf_counter() - started)
+            if self._state:
+                logger.info(f"Loaded {self._label} on first use in {self.load_time * 1000:.0f} ms")
+        return self._value
+
+    def __bool__(self):
+        return self.available
+
+    def __getattr__(self, attr):
+        value = self.load()
+        if value is None:
+            raise ImportError(f"Optional dependency {self._label} is not available")
+        return getattr(value, attr)
+
+    def __setattr__(self, attr, value):
+        target = self.load()
+        if target is None:
+            raise ImportError(f"Optional dependency {self._label} is not available")
+        setattr(target, attr, value)
+
+    def __repr__(self):
+        state = {None: 'not loaded', True: 'loaded', False: 'unavailable'}[self._state]
+        return f"<lazy {self._label} ({state})>"
+
+
+class LazyModule(LazyObject):
+    """A module imported on first attribute access; setup(module) runs once after the import."""
+
+    def __init__(self, name, setup=None):
+        def factory():
+            module = importlib.import_module(name)
+            if setup is not None:
+                setup(module)
+            return module
+
+        super().__init__(factory, lambda: is_available(name), name)
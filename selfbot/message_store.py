@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-bounded store of recently seen message contents.
+
+Telegram does not hand back the previous text of an edited message or anything at all
+for a deleted one, so edit/delete reporting can only work from what we saw ourselves.
+Messages are kept in a small ring per chat; a global byte budget evicts the oldest
+entries of the least recently active chats first. Evicted entries of monitored chats
+can optionally spill into SQLite so reports still find them later.
+"""
+import logging
+import sqlite3
+import time
+from collections import OrderedDict, namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost (tuple, dict slot, ints) on top of the text bytes.
+ENTRY_OVERHEAD = 120
+
+# Marked peer ids of channels/supergroups start below this value (-100xxxxxxxxxx).
+CHANNEL_ID_FLOOR = -1000000000000
+
+StoredMessage = namedtuple('StoredMessage', 'chat_id msg_id sender_id sender_name text media date')
+
+
+def is_channel_peer(chat_id):
+    """Channel message ids are per-channel; everything else shares one id space."""
+    return chat_id is not None and chat_id <= CHANNEL_ID_FLOOR
+
+
+def media_kind(message):
+    """Returns a short label for the media attached to a message (or '')."""
+    if not getattr(message, 'media', None):
+        return ''
+    if getattr(message, 'photo', None):
+        return 'photo'
+    if getattr(message, 'video', None):
+        return 'video'
+    if getattr(message, 'voice', None):
+        return 'voice'
+    if getattr(message, 'sticker', None):
+        return 'sticker'
+    if getattr(message, 'document', None):
+        return 'document'
+    return type(message.media).__name__
+
+
+class MessageStore:
+    """Per-chat ring buffers of message contents with a global byte budget."""
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, per_chat=300, spill_db=None, spill_max_rows=50000):
+        self.max_bytes = max_bytes
+        self.per_chat = per_chat
+        self.spill_max_rows = spill_max_rows
+        self._chats = OrderedDict()   # chat_id -> OrderedDict(msg_id -> StoredMessage), LRU by activity
+        self._shared_ids = {}         # msg_id -> chat_id for non-channel chats (ids are account-wide)
+        self._bytes = 0
+        self._spill_db = None
+        self._spill_conn = None
+        self._spilled_since_prune = 0
+        self.configure(spill_db=spill_db)
+
+    # --- configuration ---
+
+    def configure(self, max_bytes=None, per_chat=None, spill_db=None):
+        """Updates limits at runtime; passing spill_db='' disables SQLite spill."""
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if per_chat is not None:
+            self.per_chat = per_chat
+        if spill_db is not None and spill_db != self._spill_db:
+            self._close_spill()
+            self._spill_db = spill_db or None
+            if self._spill_db:
+                self._open_spill()
+        self._evict()
+
+    def _open_spill(self):
+        self._spill_conn = sqlite3.connect(self._spill_db)
+        self._spill_conn.execute('''
+            CREATE TABLE IF NOT EXISTS message_archive (
+                chat_id INTEGER NOT NULL,
+                msg_id INTEGER NOT NULL,
+                shared_id BOOLEAN NOT NULL,
+                sender_id INTEGER,
+                sender_name TEXT,
+                date INTEGER,
+                text TEXT,
+                media TEXT,
+                PRIMARY KEY (chat_id, msg_id)
+            )
+        ''')
+        self._spill_conn.execute('CREATE INDEX IF NOT EXISTS idx_message_archive_msg ON message_archive (msg_id)')
+        self._spill_conn.commit()
+
+    def _close_spill(self):
+        if self._spill_conn is not None:
+            self._spill_conn.close()
+            self._spill_conn = None
+
+    # --- writes ---
+
+    def put(self, chat_id, msg_id, sender_id=None, sender_name='', text='', media='', date=None):
+        """Stores (or replaces) the content of one message."""
+        entry = StoredMessage(chat_id, msg_id, sender_id, sender_name or '', text or '', media or '',
+                              int(date if date is not None else time.time()))
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = OrderedDict()
+        else:
+            self._chats.move_to_end(chat_id)
+            old = bucket.pop(msg_id, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+        bucket[msg_id] = entry
+        self._bytes += self._size(entry)
+        if not is_channel_peer(chat_id):
+            self._shared_ids[msg_id] = chat_id
+
+        spilled = []
+        while len(bucket) > self.per_chat:
+            spilled.append(self._pop_oldest(chat_id, bucket))
+        self._evict(spilled)
+
+    def put_message(self, message, sender_name=''):
+        """Stores a Telethon message object."""
+        date = message.date.timestamp() if getattr(message, 'date', None) else None
+        self.put(message.chat_id, message.id, message.sender_id, sender_name,
+                 message.raw_text or '', media_kind(message), date)
+
+    def update_text(self, chat_id, msg_id, text):
+        """Replaces the text of a known message after an edit; returns the previous entry."""
+        previous = self.get(chat_id, msg_id)
+        if previous is not None:
+            self.put(previous.chat_id, msg_id, previous.sender_id, previous.sender_name,
+                     text, previous.media, previous.date)
+        return previous
+
+    def pop(self, chat_id, msg_id):
+        """Removes and returns a message (chat_id may be None for non-channel deletions)."""
+        if chat_id is None:
+            chat_id = self._shared_ids.get(msg_id)
+        entry = None
+        bucket = self._chats.get(chat_id) if chat_id is not None else None
+        if bucket is not None:
+            entry = bucket.pop(msg_id, None)
+            if entry is not None:
+                self._bytes -= self._size(entry)
+                if not bucket:
+                    del self._chats[chat_id]
+        if entry is not None and not is_channel_peer(entry.chat_id):
+            self._shared_ids.pop(msg_id, None)
+        if entry is None:
+            entry = self._spill_lookup(chat_id, msg_id)
+        if self._spill_conn is not None and entry is not None:
+            self._spill_conn.execute('DELETE FROM message_archive WHERE chat_id = ? AND msg_id = ?',
+                                     (entry.chat_id, msg_id))
+            self._spill_conn.commit()
+        return entry
+
+    # --- reads ---
+
+    def get(self, chat_id, msg_id):
+        """Returns the stored entry for a message or None."""
+        if chat_id is None:
+            chat_id = self._shared_ids.get(msg_id)
+        bucket = self._chats.get(chat_id) if chat_id is not None else None
+        if bucket is not None and msg_id in bucket:
+            return bucket[msg_id]
+        return self._spill_lookup(chat_id, msg_id)
+
+    def stats(self):
+        """Returns a small dict describing current memory use."""
+        return {
+            'chats': len(self._chats),
+            'messages': sum(len(b) for b in self._chats.values()),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'spill': bool(self._spill_conn),
+        }
+
+    # --- snapshot ---
+
+    def dump(self):
+        """In-memory entries as plain lists, least recently active chat first (for StateSnapshot)."""
+        return [list(entry) for bucket in self._chats.values() for entry in bucket.values()]
+
+    def load(self, rows):
+        """Re-adds dumped entries in their original order; the usual limits apply."""
+        for row in rows:
+            self.put(*row)
+
+    # --- internals ---
+
+    @staticmethod
+    def _size(entry):
+        return ENTRY_OVERHEAD + len(entry.text.encode('utf-8')) + len(entry.sender_name.encode('utf-8'))
+
+    def _pop_oldest(self, chat_id, bucket):
+        msg_id, entry = bucket.popitem(last=False)
+        self._bytes -= self._size(entry)
+        if not is_channel_peer(chat_id) and self._shared_ids.get(msg_id) == chat_id:
+            del self._shared_ids[msg_id]
+        return entry
+
+    def _evict(self, spilled=None):
+        spilled = spilled if spilled is not None else []
+        while self._bytes > self.max_bytes and self._chats:
+            chat_id, bucket = next(iter(self._chats.items()))
+            spilled.append(self._pop_oldest(chat_id, bucket))
+            if not bucket:
+                del self._chats[chat_id]
+        if spilled and self._spill_conn is not None:
+            self._spill(spilled)
+
+    def _spill(self, entries):
+        try:
+            self._spill_conn.executemany(
+                'INSERT OR REPLACE INTO message_archive '
+                '(chat_id, msg_id, shared_id, sender_id, sender_name, date, text, media) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(e.chat_id, e.msg_id, not is_channel_peer(e.chat_id), e.sender_id, e.sender_name, e.date, e.text, e.media)
+                 for e in entries]
+            )
+            self._spilled_since_prune += len(entries)
+            if self._spilled_since_prune >= 1000:
+                self._spill_conn.execute(
+                    'DELETE FROM message_archive WHERE rowid IN '
+                    '(SELECT rowid FROM message_archive ORDER BY date DESC LIMIT -1 OFFSET ?)',
+                    (self.spill_max_rows,)
+                )
+                self._spilled_since_prune = 0
+            self._spill_conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to spill {len(entries)} messages to SQLite: {e}")
+
+    def _spill_lookup(self, chat_id, msg_id):
+        if self._spill_conn is None:
+            return None
+        if chat_id is None:
+            row = self._spill_conn.execute(
+                'SELECT chat_id, msg_id, sender_id, sender_name, text, media, date FROM message_archive '
+                'WHERE msg_id = ? AND shared_id = 1 LIMIT 1', (msg_id,)
+            ).fetchone()
+        else:
+            row = self._spill_conn.execute(
+                'SELECT chat_id, msg_id, sender_id, sender_name, text, media, date FROM message_archive '
+                'WHERE chat_id = ? AND msg_id = ?', (chat_id, msg_id)
+            ).fetchone()
+        return StoredMessage(*row) if row else None
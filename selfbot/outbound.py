@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+FloodWait-aware scheduling of outbound requests.
+
+Every request that writes something visible (send, edit, delete, reaction, profile update)
+takes a token from two buckets before it is sent: one for its method class in that chat and
+one for the method class account-wide. Command replies are served before background work
+(reports, reactions, the profile clock) waiting on the same buckets. A FloodWait pauses only
+the bucket that received it and the request is retried once the pause is over.
+
+ScheduledTelegramClient applies this to every request automatically, including the ones made
+by Message.edit()/reply()/delete(), so call sites do not change.
+"""
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+
+from telethon import TelegramClient, utils
+from telethon.errors import FloodWaitError, SlowModeWaitError
+from telethon.tl.tlobject import TLRequest
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_BACKGROUND = 1
+
+_priority = contextvars.ContextVar('outbound_priority', default=PRIORITY_COMMAND)
+
+# Request type name -> method class. Everything else (reads, resolves, downloads) is 'other',
+# which is not throttled but still gets per-request-type FloodWait pauses.
+METHOD_CLASSES = {
+    'SendMessageRequest': 'send',
+    'SendMediaRequest': 'send',
+    'SendMultiMediaRequest': 'send',
+    'ForwardMessagesRequest': 'send',
+    'EditMessageRequest': 'edit',
+    'DeleteMessagesRequest': 'delete',
+    'SendReactionRequest': 'reaction',
+    'UpdateProfileRequest': 'profile',
+    'UploadProfilePhotoRequest': 'profile',
+    'DeletePhotosRequest': 'profile',
+}
+
+# (rate per second, burst) for the per-chat and the account-wide bucket of each method class.
+DEFAULT_LIMITS = {
+    'send': ((1.0, 5), (20.0, 30)),
+    'edit': ((1.0, 5), (15.0, 20)),
+    'delete': ((2.0, 5), (10.0, 10)),
+    'reaction': ((0.5, 3), (2.0, 5)),
+    'profile': ((0.5, 2), (0.5, 2)),
+    'other': ((1000.0, 1000), (1000.0, 1000)),
+}
+
+
+@contextlib.contextmanager
+def background():
+    """Marks outbound requests made inside the block (and tasks started from it) as background work."""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'paused_until', 'waiting')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiting = [0, 0]  # waiters per priority
+
+    def delay(self, now):
+        """Seconds until this bucket can hand out a token."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.paused_until:
+            return self.paused_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class OutboundScheduler:
+    """Token buckets per (method class, chat) and per method class, with FloodWait pauses."""
+
+    def __init__(self, limits=None, max_retry_wait=300, max_chat_buckets=2000):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_retry_wait = max_retry_wait
+        self.max_chat_buckets = max_chat_buckets
+        self._buckets = {}
+        self.flood_waits = 0
+
+    def bucket(self, kind, chat=None):
+        key = (kind, chat)
+        b = self._buckets.get(key)
+        if b is None:
+            if chat is not None and len(self._buckets) >= self.max_chat_buckets:
+                self._prune()
+            per_chat, account = self.limits[kind]
+            b = self._buckets[key] = TokenBucket(*(per_chat if chat is not None else account))
+        return b
+
+    async def acquire(self, kind, chat=None, priority=None):
+        priority = _priority.get() if priority is None else priority
+        buckets = [self.bucket(kind, chat), self.bucket(kind)] if chat is not None else [self.bucket(kind)]
+        for b in buckets:
+            b.waiting[priority] += 1
+        try:
+            while True:
+                now = time.monotonic()
+                delay = max(b.delay(now) for b in buckets)
+                if priority > PRIORITY_COMMAND and any(b.tokens < 1 + b.waiting[PRIORITY_COMMAND] for b in buckets):
+                    delay = max(delay, 0.05)  # Leave the tokens to command replies waiting on the same bucket
+                if delay <= 0:
+                    for b in buckets:
+                        b.tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            for b in buckets:
+                b.waiting[priority] -= 1
+
+    async def run(self, kind, chat, call):
+        """Runs call() under the buckets for kind/chat, pausing and retrying on FloodWait."""
+        while True:
+            await self.acquire(kind, chat)
+            try:
+                return await call()
+            except (FloodWaitError, SlowModeWaitError) as e:
+                self.flood_waits += 1
+                paused = self.bucket(kind, chat)
+                paused.paused_until = max(paused.paused_until, time.monotonic() + e.seconds + 1)
+                if e.seconds > self.max_retry_wait:
+                    raise
+                logger.warning(f"Flood wait of {e.seconds}s on {kind} in {chat}; pausing that bucket only.")
+
+    def paused(self):
+        """Returns {(kind, chat): seconds left} for buckets currently paused by a FloodWait."""
+        now = time.monotonic()
+        return {key: round(b.paused_until - now) for key, b in self._buckets.items() if b.paused_until > now}
+
+    def _prune(self):
+        now = time.monotonic()
+        for key, b in list(self._buckets.items()):
+            if key[1] is not None and not any(b.waiting) and b.paused_until <= now:
+                del self._buckets[key]
+
+
+def request_target(request):
+    """Returns (method class, bucket key) for a request; unclassified requests are keyed by type."""
+    kind = METHOD_CLASSES.get(type(request).__name__)
+    if kind is None:
+        return 'other', type(request).__name__
+    peer = getattr(request, 'to_peer', None) or getattr(request, 'peer', None) or getattr(request, 'channel', None)
+    try:
+        chat = utils.get_peer_id(peer) if peer is not None else None
+    except (TypeError, ValueError):
+        chat = None
+    return kind, chat
+
+
+class ScheduledTelegramClient(TelegramClient):
+    """TelegramClient whose requests all go through an OutboundScheduler."""
+
+    def __init__(self, *args, scheduler=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler or OutboundScheduler()
+        # Flood waits are handled by the scheduler, so Telethon must raise them instead of sleeping.
+        self.flood_sleep_threshold = 0
+
+    async def __call__(self, request, ordered=False, flood_sleep_threshold=None):
+        if not isinstance(request, TLRequest):
+            return await self._call(self._sender, request, ordered=ordered)  # Batched request lists
+        kind, chat = request_target(request)
+        return await self.scheduler.run(kind, chat, lambda: self._scheduled_call(request, ordered))
+
+    async def _scheduled_call(self, request, ordered):
+        try:
+            return await self._call(self._sender, request, ordered=ordered)
+        except FloodWaitError:
+            # Telethon remembers flood waits per request type across all chats; the scheduler
+            # keeps them per bucket instead, so other chats are not held back by this one.
+            self._flood_waited_requests.pop(request.CONSTRUCTOR_ID, None)
+            raise
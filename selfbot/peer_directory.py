@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent username/id -> peer directory backed by the Telethon session database.
+
+Telethon already writes every user and chat it sees, from updates and from RPC results,
+into the session's `entities` table: marked id (which encodes the peer type), access hash,
+lowercase username and name. Two things kept that from helping after a restart. The rows
+are only committed when the client disconnects, which an os.exec* restart never does, and
+get_entity('@name') always sends ResolveUsername without looking at them.
+
+This directory commits the session periodically and before restarts, and resolves usernames
+from the stored rows first. A caller that only needs a peer to address gets the stored
+InputPeer with no request at all; one that needs the full entity costs a GetUsers/GetChannels
+by access hash. It only falls back to ResolveUsername when the name is unknown or, for full
+entities, its stored access hash turns out to be stale.
+"""
+import asyncio
+import logging
+
+from telethon import utils
+from telethon.errors.rpcerrorlist import (
+    ChannelInvalidError, ChannelPrivateError, PeerIdInvalidError, UserIdInvalidError
+)
+from telethon.tl import types
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning a stored access hash no longer works for this account.
+STALE_PEER_ERRORS = (ValueError, ChannelInvalidError, ChannelPrivateError, PeerIdInvalidError, UserIdInvalidError)
+
+
+def input_peer_from_row(marked_id, access_hash):
+    """Builds an InputPeer from a stored (marked id, access hash) row."""
+    peer_id, peer_type = utils.resolve_id(marked_id)
+    if peer_type is types.PeerUser:
+        return types.InputPeerUser(peer_id, access_hash)
+    if peer_type is types.PeerChannel:
+        return types.InputPeerChannel(peer_id, access_hash)
+    return types.InputPeerChat(peer_id)
+
+
+class PeerDirectory:
+    """Resolves usernames through the persisted session entities before asking Telegram."""
+
+    def __init__(self, client, save_interval=30):
+        self.client = client
+        self.save_interval = save_interval
+        self.directory_hits = 0
+        self.network_resolves = 0
+        self.stale = 0
+        self._task = None
+
+    def input_peer(self, username):
+        """Returns the stored InputPeer for a username (without '@') or None."""
+        row = self.client.session.get_entity_rows_by_username(username.lower())
+        return input_peer_from_row(*row) if row else None
+
+    async def resolve(self, username, full=True):
+        """
+        Returns the full entity for a username, resolving over the network only when needed.
+        With full=False a stored InputPeer is returned as is; a stale access hash then shows up
+        as an error where the peer is used instead of here.
+        """
+        username = username.lstrip('@').lower()
+        peer = self.input_peer(username)
+        if peer is not None and not full:
+            self.directory_hits += 1
+            return peer
+        if peer is not None:
+            try:
+                entity = await self.client.get_entity(peer)
+                if username in [u.lower() for u in self._usernames(entity)]:
+                    self.directory_hits += 1
+                    return entity
+                logger.info(f"Stored peer for @{username} no longer carries that username.")
+            except STALE_PEER_ERRORS as e:
+                self.stale += 1
+                logger.info(f"Stored access hash for @{username} is stale ({type(e).__name__}); resolving again.")
+        self.network_resolves += 1
+        if not full:
+            return await self.client.get_input_entity(username)
+        return await self.client.get_entity(username)  # ResolveUsername; the result is stored by Telethon
+
+    def save(self):
+        """Commits the entities Telethon has collected so far to the session file."""
+        try:
+            self.client.session.save()
+        except Exception as e:
+            logger.warning(f"Could not save the session's peer directory: {e}")
+
+    def start_autosave(self):
+        """Starts committing the directory every save_interval seconds (call from the running loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._autosave())
+
+    def stats(self):
+        return {'directory_hits': self.directory_hits, 'network_resolves': self.network_resolves, 'stale': self.stale}
+
+    async def _autosave(self):
+        while True:
+            await asyncio.sleep(self.save_interval)
+            self.save()
+
+    @staticmethod
+    def _usernames(entity):
+        names = [entity.username] if getattr(entity, 'username', None) else []
+        names.extend(u.username for u in getattr(entity, 'usernames', None) or () if u.username)
+        return names
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Command plugins of the bot.
+
+Each command group lives in its own module in this package and registers its commands with
+the @command decorator. MANIFEST lists every plugin and its commands with their help text, so
+the dispatcher knows which module owns a command and `.help` can list everything without
+importing a single plugin. A plugin module is imported the first time one of its commands is
+used. Plugins that are not enabled (TG_PLUGINS) are never imported, so memory and startup
+time only grow with what is actually used.
+
+Commands are called as `func(ctx, event, args)`. `ctx` is the PluginContext with the client
+and the shared services, and `args` is the text after the command name. Command names may be
+several words (`.view edit on`); the longest enabled name wins.
+
+Plugins that react to incoming updates or run periodic work are marked 'startup' in the
+manifest and imported when the bot starts instead. Such a module may define:
+  - functions decorated with @listener(event_builder), called as `func(ctx, event)`;
+  - setup(ctx), run once on import (tables, default settings, snapshot sections);
+  - start(ctx), run once the client is connected; a returned coroutine runs as a task;
+  - teardown(ctx), run before the module is dropped by `.reload`;
+  - status(ctx), returning lines for `.وضعیت` (plugins without 'startup' may define it and setup() too).
+unload() removes the listeners and cancels the tasks, so `.reload` never leaves the old code running.
+"""
+import asyncio
+import functools
+import importlib
+import inspect
+import logging
+import sys
+import time
+
+from telethon import utils
+from telethon.errors import RPCError
+
+from selfbot.lazy import is_available
+
+logger = logging.getLogger(__name__)
+
+# plugin -> description, {command: help text}, optional 'startup' and
+# 'requires' ({command: module or tuple of alternative modules}). Must match the @command names in the module.
+MANIFEST = {
+    'moderation': {
+        'description': "مدیریت گروه و کاربران",
+        'commands': {
+            'kick': "کاربر (ریپلای یا آیدی/یوزرنیم) را از گروه بیرون می‌کند.",
+            'ban': "کاربر (ریپلای یا آیدی/یوزرنیم) را از گروه بن می‌کند.",
+            'unban': "کاربر را از بن خارج می‌کند.",
+            'mute': "کاربر را میوت می‌کند؛ مدت اختیاری: `.mute [آیدی] 30m` (s/m/h/d، بدون مدت: دائمی).",
+            'unmute': "کاربر را از میوت خارج می‌کند.",
+            'promote': "کاربر را ادمین می‌کند (فقط سازنده چت).",
+            'demote': "کاربر را از ادمینی خارج می‌کند (فقط سازنده چت).",
+            'pin': "پیام ریپلای شده را پین می‌کند.",
+            'unpin': "آخرین پیام پین شده را از حالت پین خارج می‌کند.",
+            'block': "کاربر (ریپلای یا آیدی/یوزرنیم) را بلاک می‌کند.",
+            'unblock': "کاربر را از بلاک خارج می‌کند.",
+        },
+    },
+    'profile': {
+        'description': "پروفایل، ساعت در اسم/بیو و کپی پروفایل",
+        'startup': True,   # updates the clock and auto bio every minute
+        'commands': {
+            'setpfp': "عکس پروفایل را از مسیر فایل، لینک یا عکس/ویدیوی ریپلای شده تنظیم می‌کند.",
+            'setprofile': "همان `.setpfp` (نام قدیمی).",
+            'delpfp': "عکس‌های پروفایل را حذف می‌کند: `.delpfp [تعداد | all | keep <k>]`.",
+            'setname': "اسم اکانت را تنظیم می‌کند: `.setname [اسم]` یا ریپلای روی متن.",
+            'setbio': "بیو را تنظیم می‌کند: `.setbio [متن]` یا ریپلای روی متن (بدون متن: پاک کردن بیو).",
+            'clock': "نمایش ساعت در اسم: `.clock on | off`.",
+            'bio': "ساعت یا متن خودکار در بیو: `.bio on | off` یا `.bio text on | off`.",
+            'add bio': "متن بیو خودکار را تنظیم می‌کند: `.add bio | [متن]`.",
+            'shapeshifter': "اسم، بیو و عکس کاربر دیگری را کپی می‌کند (پروفایل فعلی قبلش ذخیره می‌شود).",
+            'shapeshifter.s': "همان `.shapeshifter` بدون پیام وضعیت.",
+            'shapeshifter save': "پروفایل فعلی را به عنوان بکاپ ذخیره می‌کند.",
+            'shapeshifter backup': "پروفایل را به آخرین بکاپ برمی‌گرداند.",
+        },
+    },
+    'search': {
+        'description': "جستجو و ترجمه",
+        'commands': {
+            'google': "یک لینک جستجوی گوگل برای عبارت مورد نظر ایجاد می‌کند: `.google <عبارت>`.",
+            'ddg': "یک لینک جستجوی DuckDuckGo برای عبارت مورد نظر ایجاد می‌کند: `.ddg <عبارت>`.",
+            'wiki': "خلاصه‌ای از ویکی‌پدیا را برای عبارت مورد نظر نمایش می‌دهد: `.wiki <عبارت>`.",
+            'ud': "معنی یک کلمه را از Urban Dictionary جستجو می‌کند: `.ud <کلمه>`.",
+            'weather': "آب و هوای یک شهر را نمایش می‌دهد (نیاز به OWM API Key): `.weather <شهر>`.",
+            'translate': "متن را به زبان مقصد ترجمه می‌کند: `.translate <کد_زبان> <متن>` (مثال: .translate en سلام).",
+            'imdb': "اطلاعات یک فیلم/سریال را از IMDB نمایش می‌دهد (نیاز به OMDb API Key): `.imdb <عنوان>`.",
+        },
+        'requires': {
+            'wiki': 'wikipedia',
+            'ud': 'requests',
+            'weather': 'requests',
+            'translate': ('google_trans_new', 'deep_translator'),
+            'imdb': 'requests',
+        },
+    },
+    'media': {
+        'description': "ارسال و دانلود فایل",
+        'startup': True,   # resumes queued and interrupted downloads
+        'commands': {
+            'sendfile': "یک فایل از مسیر مشخص شده را ارسال می‌کند (فایل‌های بزرگ با چند اتصال موازی): `.sendfile [--single] <مسیر_فایل>`.",
+            'downloadmedia': "فایل رسانه‌ای پیام ریپلای شده را دانلود می‌کند (فایل‌های بزرگ با چند اتصال موازی): `.downloadmedia [--single]`.",
+            'downloadall': "رسانه‌های N پیام آخر را به صف دانلود اضافه می‌کند: `.downloadall <تعداد>`.",
+            'downloads': "صف دانلود (در حال انجام، در صف، تمام شده، ناموفق) را نمایش می‌دهد: `.downloads [clear]`.",
+            'transferbench': "سرعت دانلود تک‌اتصالی و موازی سند ریپلای شده را مقایسه می‌کند.",
+            'pfp': "عکس پروفایل کاربر ریپلای شده یا خودتان را ارسال می‌کند: `.pfp [all]` (all: همه عکس‌ها در آلبوم‌های ۱۰تایی).",
+        },
+    },
+    'monshi': {
+        'description': "منشی (پاسخ خودکار)، لیست خاص و ریاکشن خودکار",
+        'startup': True,   # answers incoming messages
+        'commands': {
+            'منشی روشن': "منشی (پاسخ خودکار در پیوی) را فعال می‌کند.",
+            'منشی خاموش': "منشی را غیرفعال می‌کند.",
+            'تنظیم منشی': "پیام پیش‌فرض منشی را تنظیم می‌کند: `.تنظیم منشی [پیام]` یا ریپلای روی پیام.",
+            'تنظیم فرد منتخب': "تنظیم پاسخ خودکار مخصوص یک نفر را شروع می‌کند (آیدی و سپس پیام/رسانه را در پیوی بفرستید).",
+            'تنظیم پاسخ خودکار': "پاسخ خودکار برای پیام دقیقاً برابر با کلید: `.تنظیم پاسخ خودکار [کلید] : [پاسخ]`.",
+            'تنظیم پاسخ شامل خودکار': "پاسخ خودکار برای پیام‌های شامل کلید: `.تنظیم پاسخ شامل خودکار [کلید] : [پاسخ]`.",
+            'حذف پاسخ خودکار': "قانون پاسخ خودکار را حذف می‌کند: `.حذف پاسخ خودکار [کلید]`.",
+            'لیست پاسخ خودکار': "همه قوانین پاسخ خودکار را نمایش می‌دهد.",
+            'منشی پاک کردن': "همه قوانین پاسخ خودکار را حذف می‌کند.",
+            'سکوت': "پیام‌های کاربر (ریپلای یا آیدی/یوزرنیم) برای منشی نادیده گرفته می‌شود.",
+            'حذف سکوت': "کاربر را از لیست سکوت خارج می‌کند.",
+            'اضافه کردن خاص': "کاربر یا چت را به لیست خاص (نادیده گرفته شده توسط منشی) اضافه می‌کند.",
+            'حذف خاص': "کاربر یا چت را از لیست خاص حذف می‌کند.",
+            'لیست خاص': "لیست خاص را نمایش می‌دهد.",
+            'پاک کردن لیست خاص': "کل لیست خاص را پاک می‌کند.",
+            'reaction': "ریاکشن خودکار به پیام‌های افراد/گروه‌های انتخاب شده: `.reaction on | off`.",
+            'لیست ریاکشن': "افراد و گروه‌هایی را که به پیام‌هایشان ریاکشن داده می‌شود نمایش می‌دهد.",
+            'تنظیم ریاکشن': "فرد یا گروه (ریپلای یا آیدی/یوزرنیم) را به لیست ریاکشن اضافه می‌کند.",
+            'حذف ریاکشن': "فرد یا گروه را از لیست ریاکشن حذف می‌کند.",
+            'set reaction': "ایموجی ریاکشن خودکار را تنظیم می‌کند: `.set reaction 👍`.",
+        },
+    },
+    'fonts': {
+        'description': "فونت و متن تزئینی",
+        'commands': {
+            'لیست فونت': "فونت‌های فعال و فونت‌های قابل اضافه کردن را با نمونه نمایش می‌دهد.",
+            'اضافه کردن فونت': "یک فونت را به لیست فعال اضافه می‌کند: `.اضافه کردن فونت [شماره]`.",
+            'حذف فونت': "یک فونت را از لیست فعال حذف می‌کند: `.حذف فونت [شماره]`.",
+            'انواع فونت ساعت': "ساعت فعلی را با همه فونت‌ها نمایش می‌دهد.",
+            'bold': "بولد خودکار پیام‌ها: `.bold on | off` (در حال توسعه).",
+            'figlet': "متن شما را به هنر اسکی (ASCII Art) با استفاده از Figlet تبدیل می‌کند: `.figlet <متن>`.",
+        },
+        'requires': {
+            'figlet': 'pyfiglet',
+        },
+    },
+    'monitoring': {
+        'description': "گزارش پیام‌های ویرایش/حذف شده و نشست‌های جدید",
+        'startup': True,   # records messages of monitored chats as they arrive
+        'commands': {
+            'view edit': "گزارش پیام‌های ویرایش شده در پیوی: `.view edit on | off`.",
+            'view del': "گزارش پیام‌های حذف شده در پیوی: `.view del on | off`.",
+            'view all': "گزارش ویرایش/حذف در گروه‌ها و کانال‌ها: `.view all on | off`.",
+            'view spill': "نگهداری پیام‌های قدیمی چت‌های تحت نظر در دیتابیس: `.view spill on | off`.",
+            'سرعت گزارش': "حداکثر تعداد پیام گزارش در دقیقه: `.سرعت گزارش [تعداد]`.",
+            'ایدی ربات گزارش': "چت یا رباتی که گزارش‌ها به آن ارسال می‌شود: `.ایدی ربات گزارش [آیدی/یوزرنیم]`.",
+            'anti login': "گزارش نشست‌های (لاگین‌های) جدید حساب: `.anti login on | off`.",
+            'hard anti login': "بررسی سخت‌گیرانه‌تر نشست‌ها: `.hard anti login on | off`.",
+        },
+    },
+    'spam': {
+        'description': "ارسال چندباره پیام",
+        'commands': {
+            'send': "پیام یا فایل (ریپلای شده) را چند بار ارسال می‌کند: `.send [تعداد] [متن]`.",
+            'spam': "همان `.send`.",
+            'اسپم': "همان `.send`.",
+            'psend': "پیام شماره‌دار ارسال می‌کند: `.psend [تعداد] [متن]` یا ریپلای و فقط تعداد.",
+            'gsend': "پیام یا فایل را به گروه دیگری ارسال می‌کند: `.gsend [آیدی گروه/یوزرنیم] [تعداد] [متن]`.",
+            'dgsend': "مانند `.gsend` ولی هر پیام بلافاصله پس از ارسال حذف می‌شود.",
+            'dgsend2': "مانند `.gsend` ولی همه پیام‌ها پس از پایان ارسال یکجا حذف می‌شوند.",
+            'dsend': "پیام را در همین چت ارسال و بلافاصله حذف می‌کند: `.dsend [تعداد] [متن]`.",
+            'dsend2': "مانند `.dsend` برای فایل یا متن ریپلای شده.",
+            'سرعت': "فاصله بین ارسال‌ها به ثانیه: `.سرعت [عدد]` (پیش‌فرض 0.5).",
+        },
+    },
+}
+
+
+def command(*names):
+    """Marks a plugin function as the handler of the given command names."""
+    def decorator(func):
+        func.plugin_commands = tuple(name.lower() for name in names)
+        return func
+    return decorator
+
+
+def listener(event):
+    """Marks a plugin function as a handler of `event` (an event builder), active while the plugin is loaded."""
+    def decorator(func):
+        func.plugin_events = getattr(func, 'plugin_events', ()) + (event,)
+        return func
+    return decorator
+
+
+async def resolve_target(ctx, event, arg=None, peer_only=False):
+    """
+    (entity, marked id) a command is aimed at: the replied message's sender, `arg` (id or
+    username, through the entity cache) or else the current chat. (None, None) if `arg` does
+    not resolve. With peer_only=True an `arg` comes back as an InputPeer, which saves fetching
+    the full entity when the command only needs the id or a chat to send to.
+    """
+    if event.is_reply:
+        replied = await event.get_reply_message()
+        if replied and replied.sender:
+            ctx.entity_cache.put(replied.sender)
+            return replied.sender, utils.get_peer_id(replied.sender)
+        return None, None
+    if arg:
+        try:
+            entity = await (ctx.entity_cache.get_input(arg) if peer_only else ctx.entity_cache.get(arg))
+        except (ValueError, RPCError):
+            return None, None
+        return entity, utils.get_peer_id(entity)
+    chat = await event.get_chat()
+    return chat, utils.get_peer_id(chat)
+
+
+class PluginContext:
+    """First argument of every plugin function: the client, the bot's shared services and its `config` dict."""
+
+    def __init__(self, client, **services):
+        self.client = client
+        self.__dict__.update(services)
+
+
+class PluginRegistry:
+    """Routes commands to the enabled plugins, importing each plugin module on first use."""
+
+    def __init__(self, context, enabled=None):
+        self.context = context
+        self.enabled = [name for name in MANIFEST if enabled is None or name in enabled]
+        unknown = set(enabled or ()) - set(MANIFEST)
+        if unknown:
+            logger.warning(f"Unknown plugins ignored: {', '.join(sorted(unknown))}")
+        self._owners = {cmd: name for name in self.enabled for cmd in MANIFEST[name]['commands']}
+        self._longest = max((len(cmd.split()) for cmd in self._owners), default=1)
+        self._handlers = {}   # command -> function, filled as plugins load
+        self._modules = {}    # plugin -> module
+        self._listeners = []  # (callback, event builder) added to the client
+        self._tasks = []
+
+    def owns(self, name):
+        """True if `name` is a command of an enabled plugin (no import needed)."""
+        return name.lower() in self._owners
+
+    def match(self, text):
+        """(command, args) for the longest enabled command `text` starts with, or None."""
+        words = text.split()
+        if not words:
+            return None
+        words[0] = words[0].split('@', 1)[0]   # `.cmd@botname`
+        for n in range(min(len(words), self._longest), 0, -1):
+            name = " ".join(words[:n]).lower()
+            if name in self._owners:
+                rest = text.split(maxsplit=n)
+                return name, rest[n] if len(rest) > n else ""
+        return None
+
+    async def run(self, name, event, args=""):
+        """Runs a plugin command, loading its plugin first if needed."""
+        name = name.lower()
+        handler = self._handlers.get(name)
+        if handler is None:
+            self.load(self._owners[name])
+            handler = self._handlers[name]
+        return await handler(self.context, event, args)
+
+    def load(self, plugin):
+        """Imports a plugin module (once), runs its setup() and registers its commands and listeners."""
+        if plugin in self._modules:
+            return self._modules[plugin]
+        started = time.perf_counter()
+        module = importlib.import_module(f"{__name__}.{plugin}")
+        if hasattr(module, 'setup'):
+            module.setup(self.context)
+        declared = set(MANIFEST[plugin]['commands'])
+        for obj in vars(module).values():
+            if not inspect.isfunction(obj):   # getattr on a LazyModule would import it
+                continue
+            for cmd in getattr(obj, 'plugin_commands', ()):
+                if cmd not in declared:
+                    logger.warning(f"Plugin {plugin} defines {cmd}, which is missing from the manifest")
+                    continue
+                self._handlers[cmd] = obj
+            for event in getattr(obj, 'plugin_events', ()):
+                callback = functools.partial(obj, self.context)
+                self.context.client.add_event_handler(callback, event)
+                self._listeners.append((callback, event))
+        for cmd in declared - set(self._handlers):
+            logger.warning(f"Plugin {plugin} does not implement {cmd} listed in the manifest")
+            self._handlers[cmd] = _missing_command
+        self._modules[plugin] = module
+        logger.info(f"Loaded plugin {plugin} in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return module
+
+    def load_startup(self):
+        """Imports the enabled plugins marked 'startup', so their listeners receive updates from the start."""
+        for plugin in self.enabled:
+            if MANIFEST[plugin].get('startup'):
+                self.load(plugin)
+
+    def start(self):
+        """Runs start(ctx) of the loaded plugins; call from the running loop once the client is connected."""
+        for plugin, module in self._modules.items():
+            if not hasattr(module, 'start'):
+                continue
+            result = module.start(self.context)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                task.add_done_callback(functools.partial(_log_task_end, plugin))
+                self._tasks.append(task)
+
+    def unload(self):
+        """Forgets the loaded plugins so they are imported again, from disk, on next use."""
+        for plugin, module in self._modules.items():
+            if hasattr(module, 'teardown'):
+                try:
+                    module.teardown(self.context)
+                except Exception as e:
+                    logger.warning(f"Teardown of plugin {plugin} failed: {e}")
+            sys.modules.pop(f"{__name__}.{plugin}", None)
+        for callback, event in self._listeners:
+            self.context.client.remove_event_handler(callback, type(event))
+        for task in self._tasks:
+            task.cancel()
+        self._listeners.clear()
+        self._tasks.clear()
+        self._modules.clear()
+        self._handlers.clear()
+
+    @property
+    def loaded(self):
+        return list(self._modules)
+
+    def help_entries(self):
+        """(plugin, command, help text) for every enabled command, read from the manifest only."""
+        for plugin in self.enabled:
+            for cmd, text in MANIFEST[plugin]['commands'].items():
+                yield plugin, cmd, text
+
+    def missing_dependency(self, name):
+        """The module a command needs but that is not installed (checked without importing), or None."""
+        plugin = self._owners.get(name.lower())
+        required = MANIFEST[plugin].get('requires', {}).get(name.lower()) if plugin else None
+        if required is None:
+            return None
+        alternatives = (required,) if isinstance(required, str) else required
+        return None if any(is_available(module) for module in alternatives) else alternatives[0]
+
+    def status_lines(self):
+        """Lines from status(ctx) of every loaded plugin, for `.وضعیت`."""
+        lines = []
+        for plugin, module in self._modules.items():
+            if hasattr(module, 'status'):
+                try:
+                    lines.extend(module.status(self.context))
+                except Exception as e:
+                    lines.append(f"{plugin}: {e}")
+        return lines
+
+
+def _log_task_end(plugin, task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task of plugin {plugin} stopped: {task.exception()!r}")
+
+
+async def _missing_command(ctx, event, args):
+    await event.edit("این دستور در نسخه فعلی پلاگین پیاده‌سازی نشده است.")
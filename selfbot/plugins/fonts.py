@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Unicode "fonts" for digits and Latin letters, and figlet ASCII art.
+
+FONTS holds the predefined character maps. `.اضافه کردن فونت` copies one into the
+custom_fonts table, which marks it active; apply_font() prefers the stored copy. Persian and
+Arabic digits are mapped like their Latin counterparts, so clock strings convert either way.
+"""
+import datetime
+import json
+import logging
+import sqlite3
+
+from selfbot.lazy import LazyModule
+from selfbot.plugins import command
+
+logger = logging.getLogger(__name__)
+
+pyfiglet = LazyModule('pyfiglet')
+
+FONTS = {
+    1: {'name': 'Digits Bold', 'normal': "0123456789", 'map': "𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"},
+    2: {'name': 'Digits Full-width', 'normal': "0123456789", 'map': "０１２３４５６７８９"},
+    3: {'name': 'Digits Superscript', 'normal': "0123456789", 'map': "⁰¹²³⁴⁵⁶⁷⁸⁹"},
+    4: {'name': 'Digits Subscript', 'normal': "0123456789", 'map': "₀₁₂₃₄₅₆₇₈₉"},
+    5: {'name': 'Digits Circled', 'normal': "0123456789", 'map': "⓪①②③④⑤⑥⑦⑧⑨"},
+    6: {'name': 'Digits Double Circled', 'normal': "0123456789", 'map': "⓿❶❷❸❹❺❻❼❽❾"},
+    7: {'name': 'Digits Math Bold', 'normal': "0123456789", 'map': "𝟘𝟙𝟚𝟛𝟜𝟝𝟞𝟟𝟠𝟡"},
+    8: {'name': 'Digits Sans', 'normal': "0123456789", 'map': "𝟢𝟣𝟤𝟥𝟦𝟧𝟨𝟩𝟪𝟫"},
+    9: {'name': 'Digits Monospace', 'normal': "0123456789", 'map': "𝟶𝟷𝟸𝟹𝟺𝟻𝟼𝟽𝟾𝟿"},
+    10: {'name': 'Digits Serif Bold', 'normal': "0123456789", 'map': "𝟎𝟏𝟐𝟑𝟒𝟓𝟔𝟕𝟖𝟗"},
+    11: {'name': 'Latin Bold', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝐚𝐛𝐜𝐝𝐞𝐟𝐠𝐡𝐢𝐣𝐤𝐥𝐦𝐧𝐨𝐩𝐪𝐫𝐬𝐭𝐮𝐯𝐰𝐱𝐲𝐳𝐀𝐁𝐂𝐃𝐄𝐅𝐆𝐇𝐈𝐉𝐊𝐋𝐌𝐍𝐎𝐏𝐐𝐑𝐒𝐓𝐔𝐕𝐖𝐗𝐘𝐙"},
+    12: {'name': 'Latin Italic', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝑎𝑏𝑐𝑑𝑒𝑓𝑔ℎ𝑖𝑗𝑘𝑙𝑚𝑛𝑜𝑝𝑞𝑟𝑠𝑡𝑢𝑣𝑤𝑥𝑦𝑧𝐴𝐵𝐶𝐷𝐸𝐹𝐺𝐻𝐼𝐽𝐾𝐿𝑀𝑁𝑂𝑃𝑄𝑅𝑆𝑇𝑈𝑉𝑊𝑋𝑌𝑍"},
+    13: {'name': 'Latin Bold Italic', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝒂𝒃𝒄𝒅𝒆𝒇𝒈𝒉𝒊𝒋𝒌𝒍𝒎𝒏𝒐𝒑𝒒𝒓𝒔𝒕𝒖𝒗𝒘𝒙𝒚𝒛𝑨𝑩𝑪𝑫𝑬𝑭𝑮𝑯𝑰𝑱𝑲𝑳𝑴𝑵𝑶𝑷𝑸𝑹𝑺𝑻𝑼𝑽𝑾𝑿𝒀𝒁"},
+    14: {'name': 'Latin Script', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝒶𝒷𝒸𝒹𝑒𝒻𝑔𝒽𝒾𝒿𝓀𝓁𝓂𝓃𝑜𝓅𝓆𝓇𝓈𝓉𝓊𝓋𝓌𝓍𝓎𝓏𝒜𝐵𝒞𝒟𝐸𝐹𝒢𝐻𝐼𝒥𝒦𝐿𝑀𝒩𝒪𝒫𝒬𝑅𝒮𝒯𝒰𝒱𝒲𝒳𝒴𝒵"},
+    15: {'name': 'Latin Bold Script', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝓪𝓫𝓬𝓭𝓮𝓯𝓰𝓱𝓲𝓳𝓴𝓵𝓶𝓷𝓸𝓹𝓺𝓻𝓼𝓽𝓾𝓿𝔀𝔁𝔂𝔃𝓐𝓑𝓒𝓓𝓔𝓕𝓖𝓗𝓘𝓙𝓚𝓛𝓜𝓝𝓞𝓟𝓠𝓡𝓢𝓣𝓤𝓥𝓦𝓧𝓨𝓩"},
+    16: {'name': 'Latin Fraktur', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝔞𝔟𝔠𝔡𝔢𝔣𝔤𝔥𝔦𝔧𝔨𝔩𝔪𝔫𝔬𝔭𝔮𝔯𝔰𝔱𝔲𝔳𝔴𝔵𝔶𝔷𝔄𝔅ℭ𝔇𝔈𝔉𝔊ℌℑ𝔍𝔎𝔏𝔐𝔑𝔒𝔓𝔔ℜ𝔖𝔗𝔘𝔙𝔚𝔛𝔜ℨ"},
+    17: {'name': 'Latin Bold Fraktur', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝖆𝖇𝖈𝖉𝖊𝖋𝖌𝖍𝖎𝖏𝖐𝖑𝖒𝖓𝖔𝖕𝖖𝖗𝖘𝖙𝖚𝖛𝖜𝖝𝖞𝖟   Q𝕮𝕱𝕭𝕲𝕳𝕴𝕵𝕷𝕸𝕹𝕬𝕶𝕹𝕺𝕷𝕾𝕿𝕽𝕰𝕷𝕹𝕾𝕹𝕬𝕻𝕼𝕽𝕾𝕿𝖀𝖁𝖂𝖃𝖄𝖅"}, # Some might not exist
+    18: {'name': 'Latin Double-Struck', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝕒𝕓𝕔𝕕𝕖𝕗𝕘𝕙𝕚𝕛𝕜𝕝𝕞𝕟𝕠𝕡   x𝕢𝕣𝕤𝕥𝕦𝕧𝕨𝕩𝕪𝕫𝔸𝔹ℂ𝔻𝔼𝔽𝔾ℍ𝕀𝕁𝕂𝕃𝕄ℕ𝕆ℙℚℝ𝕊𝕋𝕌𝕍𝕎𝕏𝕐ℤ"},
+    19: {'name': 'Latin Monospace', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "𝚊𝚋𝚌𝚍𝚎𝚏𝚐𝚑𝚒𝚓𝚔𝚕𝚖𝚗𝚘𝚙𝚚𝚛𝚜𝚝𝚞𝚟𝚠𝚡𝚢𝚣𝙰𝙱𝙲𝙳𝙴𝙵𝙶𝙷𝙸𝙹𝙺𝙻𝙼𝙽𝙾𝙿𝚀𝚁𝚂𝚃𝚄𝚅𝚆𝚇𝚈𝚉"},
+    20: {'name': 'Latin Circled', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "ⓐⓑⓒⓓⓔⓕⓖⓗⓘⓙⓚⓛⓜⓝⓞⓟⓠⓡⓢⓣⓤⓥⓦⓧⓨⓩⒶⒷⒸⒹⒺⒻⒼⒽⒾⒿⓀⓁⓂⓃⓄⓅⓆⓇⓈⓉⓊⓋⓌⓍⓎⓏ"},
+    21: {'name': 'Latin Squared', 'normal': "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", 'map': "🄰🄱🄲🄳🄴🄵🄶🄷🄸🄹🄺🄻🄼🄽🄾🄿🄠🄬🄢🄣🄤🄥🄦🄧🄨🄩"}, # Limited
+}
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+ARABIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+
+
+def setup(ctx):
+    ctx.settings.create(
+        '''CREATE TABLE IF NOT EXISTS custom_fonts (
+            id INTEGER PRIMARY KEY, -- Using font ID as primary key
+            font_name TEXT NOT NULL,
+            font_map TEXT NOT NULL -- Storing the JSON representation of font mapping
+        )''',
+        defaults={'auto_bold': '0'},
+    )
+
+
+def status(ctx):
+    conn = ctx.settings.connect()
+    try:
+        active_fonts = [f"{row[0]} ({row[1]})" for row in conn.execute('SELECT id, font_name FROM custom_fonts')]
+    finally:
+        conn.close()
+    return [
+        f"🅱️ Auto Bold: <b>{'ON' if ctx.settings.enabled('auto_bold') else 'OFF'}</b>",
+        f"🅰️ Active Fonts: <b>{', '.join(active_fonts) or 'None'}</b>",
+    ]
+
+
+def apply_font(ctx, text, font_id):
+    """Applies a specified font transformation to the text."""
+    if not isinstance(text, str) or not text:
+        return text
+
+    conn = ctx.settings.connect()
+    try:
+        result = conn.execute('SELECT font_map FROM custom_fonts WHERE id = ?', (font_id,)).fetchone()
+    finally:
+        conn.close()
+
+    if not result:
+        # Fallback to predefined if not in DB, though ideally it should be added.
+        if font_id not in FONTS:
+            return text
+        font_data = FONTS[font_id]
+    else:
+        font_data = json.loads(result[0])
+
+    normal_chars = font_data['normal']
+    target_chars = font_data['map']
+
+    converted_text = ""
+    for char in text:
+        if char in PERSIAN_DIGITS:
+            char = str(PERSIAN_DIGITS.find(char))
+        elif char in ARABIC_DIGITS:
+            char = str(ARABIC_DIGITS.find(char))
+        index = normal_chars.find(char)
+        # Some maps are shorter than their alphabet; such characters are kept as they are
+        converted_text += target_chars[index] if 0 <= index < len(target_chars) else char
+    return converted_text
+
+
+@command('لیست فونت')
+async def list_fonts(ctx, event, args):
+    """Displays currently active fonts and available default fonts."""
+    conn = ctx.settings.connect()
+    try:
+        active_fonts = conn.execute('SELECT id, font_name FROM custom_fonts').fetchall()
+    finally:
+        conn.close()
+
+    msg = "<b>فونت‌های فعال:</b>\n"
+    if active_fonts:
+        for font_id, font_name in active_fonts:
+            msg += f"  - {font_id}: {font_name}\n"
+    else:
+        msg += "  <i>هیچ فونتی فعال نیست.</i>\n"
+
+    msg += "\n<b>فونت‌های پیش‌فرض قابل اضافه کردن:</b>\n"
+    active_ids = {row[0] for row in active_fonts}
+    for font_id, font_data in FONTS.items():
+        if font_id not in active_ids:
+            msg += f"  - {font_id}: {font_data['name']} (نمونه: {apply_font(ctx, '00:00 ABC abc', font_id)})\n"
+
+    await event.edit(msg, parse_mode='html')
+
+
+@command('اضافه کردن فونت')
+async def add_font(ctx, event, args):
+    """Adds a predefined font to the active list for use."""
+    try:
+        font_id = int(args.strip())
+    except ValueError:
+        await event.edit("❌ Usage: `.اضافه کردن فونت [شماره]`", parse_mode='html')
+        return
+    if font_id not in FONTS:
+        await event.edit(f"❌ فونت شماره {font_id} یافت نشد. لطفا یک شماره معتبر از لیست فونت‌های پیش‌فرض انتخاب کنید.", parse_mode='html')
+        return
+
+    font_data = FONTS[font_id]
+    conn = ctx.settings.connect()
+    try:
+        conn.execute('INSERT INTO custom_fonts (id, font_name, font_map) VALUES (?, ?, ?)',
+                     (font_id, font_data['name'], json.dumps(font_data)))  # Store mapping as JSON
+        conn.commit()
+        await event.edit(f"✅ فونت <b>{font_data['name']}</b> (شماره {font_id}) اضافه شد.", parse_mode='html')
+    except sqlite3.IntegrityError:
+        await event.edit(f"ℹ️ فونت شماره {font_id} قبلا اضافه شده است.", parse_mode='html')
+    except Exception as e:
+        await event.edit(f"❌ Error adding font: {e}", parse_mode='html')
+    finally:
+        conn.close()
+
+
+@command('حذف فونت')
+async def remove_font(ctx, event, args):
+    """Removes an active font from the list."""
+    try:
+        font_id = int(args.strip())
+    except ValueError:
+        await event.edit("❌ Usage: `.حذف فونت [شماره]`", parse_mode='html')
+        return
+    conn = ctx.settings.connect()
+    try:
+        removed = conn.execute('DELETE FROM custom_fonts WHERE id = ?', (font_id,)).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    if removed:
+        await event.edit(f"✅ فونت شماره {font_id} حذف شد.", parse_mode='html')
+    else:
+        await event.edit(f"ℹ️ فونت شماره {font_id} یافت نشد.", parse_mode='html')
+
+
+@command('انواع فونت ساعت')
+async def show_all_font_clocks(ctx, event, args):
+    """Displays the current time formatted with all available predefined fonts."""
+    now = datetime.datetime.now().strftime("%H:%M")
+    msg = "<b>نمایش ساعت با تمام فونت‌های موجود:</b>\n"
+    for font_id in sorted(FONTS):
+        msg += f"{font_id}- {apply_font(ctx, now, font_id)}\n"
+    await event.edit(msg, parse_mode='html')
+
+
+@command('bold')
+async def toggle_bold_auto(ctx, event, args):
+    """Toggles automatic bold formatting for outgoing messages (not yet applied to outgoing messages)."""
+    mode = args.strip().lower()
+    if mode not in ("on", "off"):
+        await event.edit("❌ Usage: `.bold on | off`", parse_mode='html')
+        return
+    ctx.settings.set('auto_bold', '1' if mode == "on" else '0')
+    if mode == "on":
+        await event.edit("✅ Auto bold: <b>ON</b> (Note: This feature is under development for general outgoing messages.)", parse_mode='html')
+    else:
+        await event.edit("✅ Auto bold: <b>OFF</b>", parse_mode='html')
+
+
+@command('figlet')
+async def figlet_command(ctx, event, args):
+    """
+    .figlet <متن>: متن شما را به هنر اسکی (ASCII Art) با استفاده از Figlet تبدیل می‌کند.
+    """
+    if not pyfiglet:
+        await event.edit("ماژول 'pyfiglet' نصب نیست. این دستور کار نمی‌کند. `pip install pyfiglet`")
+        return
+
+    text = args.strip()
+    if not text:
+        await event.edit("لطفاً متنی برای تبدیل به Figlet وارد کنید.")
+        return
+
+    try:
+        figlet_text = pyfiglet.figlet_format(text)
+        if len(figlet_text) > 4096: # محدودیت طول پیام تلگرام
+            await event.edit("متن Figlet بیش از حد طولانی است و قابل ارسال نیست.")
+            logger.warning(f"متن Figlet برای '{text}' بیش از حد طولانی شد.")
+            return
+        await event.edit(f'```\n{figlet_text}\n```', parse_mode='md')
+        logger.info(f"دستور .figlet با موفقیت اجرا شد برای: '{text}'")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .figlet برای '{text}': {e}")
+        await event.edit(f"خطا در ایجاد Figlet: `{e}`")
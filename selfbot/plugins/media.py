@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Sending and downloading files, and sending profile photos.
+
+Large files move over several parallel connections (ParallelTransfer). Downloads go through
+the persistent DownloadManager queue, so the same media is never fetched twice and
+interrupted downloads continue after a restart; start() resumes them. Both are created in
+setup() from ctx.config and kept across `.reload`.
+"""
+import logging
+import os
+import time
+
+from telethon.errors.rpcerrorlist import ChatSendMediaForbiddenError
+from telethon.tl.types import PhotoEmpty, User
+
+from selfbot.download_manager import DONE, DownloadManager
+from selfbot.fast_transfer import BIG_FILE_THRESHOLD, ParallelTransfer
+from selfbot.plugins import command
+from selfbot.profile_photos import send_photo_history
+from selfbot.progress import ProgressReporter, human_size
+from selfbot.reloader import keep
+from selfbot.report_queue import split_digest
+
+logger = logging.getLogger(__name__)
+
+fast_transfer = None
+download_manager = None
+
+
+def setup(ctx):
+    global fast_transfer, download_manager
+    config = ctx.config
+    # انتقال چنداتصالی فایل‌های بزرگ (بخش‌ها همزمان روی چند اتصال به DC فایل منتقل می‌شوند)
+    fast_transfer = keep('fast_transfer', lambda: ParallelTransfer(ctx.client, config['transfer_connections']))
+    # صف دانلود ماندگار: هر رسانه (شناسه + access hash) فقط یک بار دانلود می‌شود و دانلودهای نیمه‌کاره پس از ری‌استارت ادامه می‌یابند.
+    download_manager = keep('download_manager', lambda: DownloadManager(
+        ctx.client, fast_transfer, directory=config['download_dir'], concurrency=config['download_concurrency']))
+
+
+def start(ctx):
+    download_manager.start()
+
+
+async def _target_user(ctx, event):
+    """فرستنده پیام ریپلای شده، یا در غیر این صورت خودتان."""
+    if event.is_reply:
+        replied_message = await event.get_reply_message()
+        sender = replied_message.sender or await replied_message.get_sender()
+        if sender is not None:
+            ctx.entity_cache.put(sender)
+        return sender
+    return await ctx.client.get_me()
+
+
+@command('pfp')
+async def get_profile_photo_command(ctx, event, args):
+    """
+    .pfp: عکس پروفایل کاربر ریپلای شده یا خودتان را ارسال می‌کند.
+    .pfp all: همه عکس‌های پروفایل را به صورت آلبوم‌های ۱۰تایی ارسال می‌کند.
+    """
+    try:
+        target_entity = await _target_user(ctx, event)
+
+        if not target_entity or not isinstance(target_entity, User):
+            await event.edit("نتوانستم کاربر مورد نظر را پیدا کنم.")
+            return
+
+        if args.strip().lower() == 'all':
+            await event.edit(f"در حال ارسال عکس‌های پروفایل {target_entity.first_name}... 🖼️")
+            profile = await ctx.full_users.get(target_entity, photo_count=True)
+            progress = ProgressReporter(event, f"🖼️ عکس‌های پروفایل {target_entity.first_name}",
+                                        total=profile.photo_count, unit='عکس')
+            sent = await send_photo_history(ctx.client, event.chat_id, target_entity,
+                                            caption=f"عکس‌های پروفایل {target_entity.first_name}",
+                                            on_album=progress)
+            if sent:
+                await progress.finish()
+                await event.delete()
+                logger.info(f"دستور .pfp all با موفقیت اجرا شد: {sent} عکس از کاربر {target_entity.id}")
+            else:
+                await progress.finish("این کاربر عکس پروفایل ندارد.")
+            return
+
+        # عکس فعلی بخشی از پروفایل کامل است که با .whois مشترک کش می‌شود.
+        profile = await ctx.full_users.get(target_entity)
+        photo = profile.full_user.profile_photo
+        if photo and not isinstance(photo, PhotoEmpty):
+            await ctx.client.send_file(event.chat_id, photo, caption=f"عکس پروفایل {target_entity.first_name}")
+            await event.delete() # پاک کردن دستور اصلی
+            logger.info(f"دستور .pfp با موفقیت اجرا شد برای کاربر: {target_entity.id}")
+        else:
+            await event.edit("این کاربر عکس پروفایل ندارد.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .pfp: {e}")
+        await event.edit(f"خطا در دریافت عکس پروفایل: `{e}`")
+
+
+async def upload_local_file(ctx, file_path, progress_callback=None, single=False):
+    """
+    فایل محلی را برای send_file آماده می‌کند: فایل‌های بزرگ با چند اتصال موازی آپلود می‌شوند
+    و نتیجه (InputFileBig) مستقیماً به send_file داده می‌شود؛ بقیه همان مسیر فایل می‌مانند.
+    """
+    if single or os.path.getsize(file_path) <= BIG_FILE_THRESHOLD:
+        return file_path
+    return await fast_transfer.upload(file_path, progress_callback=progress_callback)
+
+
+@command('sendfile')
+async def send_file_command(ctx, event, args):
+    """
+    .sendfile [--single] <مسیر_فایل>: یک فایل از مسیر مشخص شده را ارسال می‌کند.
+    فایل‌های بزرگ با چند اتصال موازی آپلود می‌شوند؛ --single روش تک‌اتصالی قبلی را اجبار می‌کند.
+    """
+    single = args.startswith('--single ')
+    file_path = (args[len('--single '):] if single else args).strip()
+    if not file_path:
+        await event.edit("لطفاً مسیر فایل را وارد کنید.")
+        return
+    
+    if not os.path.exists(file_path):
+        await event.edit(f"خطا: فایل در مسیر `{file_path}` یافت نشد.")
+        return
+
+    progress = ProgressReporter(event, f"📤 ارسال `{os.path.basename(file_path)}`")
+    try:
+        await event.edit(f"در حال ارسال فایل: `{os.path.basename(file_path)}`...")
+        # اگر همین محتوا قبلاً آپلود شده باشد، همان رسانه دوباره ارسال می‌شود
+        await ctx.upload_cache.send_file(
+            event.chat_id, file_path, progress_callback=progress,
+            upload=lambda path: upload_local_file(ctx, path, progress_callback=progress, single=single),
+        )
+        await progress.finish()
+        await event.delete() # پاک کردن دستور اصلی
+        logger.info(f"دستور .sendfile با موفقیت اجرا شد. فایل: '{file_path}'")
+    except ChatSendMediaForbiddenError:
+        logger.error(f"خطا: اجازه ارسال رسانه در این چت وجود ندارد.")
+        await progress.finish("خطا: اجازه ارسال فایل در این چت را ندارید.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .sendfile برای '{file_path}': {e}")
+        await progress.finish(f"خطا در ارسال فایل: `{e}`")
+
+@command('downloadmedia')
+async def download_media_command(ctx, event, args):
+    """
+    .downloadmedia [--single]: فایل رسانه‌ای (عکس، ویدئو، سند) پیام ریپلای شده را دانلود می‌کند.
+    دانلود از صف دانلود انجام می‌شود: رسانه‌ای که قبلاً دانلود شده دوباره دانلود نمی‌شود و فایل‌های
+    بزرگ با چند اتصال موازی و قابل ادامه دریافت می‌شوند. --single بدون صف و با یک اتصال دانلود می‌کند.
+    """
+    if not event.is_reply:
+        await event.edit("برای دانلود رسانه، روی پیامی که حاوی رسانه است ریپلای کنید.")
+        return
+
+    progress = ProgressReporter(event, "📥 دانلود رسانه")
+    try:
+        replied_message = await event.get_reply_message()
+        if not replied_message.media:
+            await event.edit("پیام ریپلای شده حاوی رسانه نیست.")
+            return
+
+        await event.edit("در حال دانلود رسانه... 📥")
+        if args.strip() == '--single':
+            download_path = await ctx.client.download_media(replied_message, progress_callback=progress)
+            await progress.finish(f"✅ رسانه در: `{download_path}` ذخیره شد.")
+            return
+
+        item = await download_manager.enqueue(replied_message, progress_callback=progress)
+        if item['status'] == DONE:
+            await progress.finish(f"✅ این رسانه قبلاً دانلود شده است: `{item['path']}`")
+            return
+        item = await download_manager.wait(item['key'])
+        if item and item['status'] == DONE:
+            await progress.finish(f"✅ رسانه در: `{item['path']}` ذخیره شد.")
+            logger.info(f"دستور .downloadmedia با موفقیت اجرا شد. رسانه پیام {replied_message.id} در '{item['path']}' ذخیره شد.")
+        else:
+            error = item['error'] if item else 'نامشخص'
+            await progress.finish(f"خطا در دانلود رسانه: `{error}`\nبا اجرای دوباره دستور، دانلود از آخرین بخش کامل شده ادامه می‌یابد.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .downloadmedia: {e}")
+        await progress.finish(f"خطا در دانلود رسانه: `{e}`")
+
+
+@command('downloadall')
+async def download_all_command(ctx, event, args):
+    """
+    .downloadall <تعداد>: رسانه‌های N پیام آخر چت فعلی را به صف دانلود اضافه می‌کند.
+    دانلودها با حداکثر TG_DOWNLOAD_CONCURRENCY مورد همزمان انجام می‌شوند؛ وضعیت با .downloads قابل مشاهده است.
+    """
+    if not args.strip().isdigit():
+        await event.edit("استفاده: `.downloadall <تعداد>`")
+        return
+
+    try:
+        count = int(args.strip())
+        await event.edit(f"در حال افزودن رسانه‌های {count} پیام آخر به صف دانلود... 📥")
+        queued = known = 0
+        async for message in ctx.client.iter_messages(event.chat_id, limit=count, offset_id=event.id):
+            if not (message.document or message.photo):
+                continue
+            item = await download_manager.enqueue(message)
+            if item['msg_id'] == message.id and item['chat_id'] == message.chat_id and item['status'] != DONE:
+                queued += 1
+            else:
+                known += 1 # قبلاً دانلود شده یا همین رسانه از پیام دیگری در صف است
+        await event.edit(f"✅ `{queued}` رسانه به صف دانلود اضافه شد (`{known}` مورد تکراری).\n"
+                         f"وضعیت: `.downloads`")
+        logger.info(f"دستور .downloadall اجرا شد: {queued} رسانه در صف، {known} تکراری.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .downloadall: {e}")
+        await event.edit(f"خطا در افزودن به صف دانلود: `{e}`")
+
+
+@command('downloads')
+async def downloads_command(ctx, event, args):
+    """
+    .downloads: دانلودهای در صف، در حال انجام، تمام شده و ناموفق را نمایش می‌دهد.
+    .downloads clear: سوابق دانلودهای تمام شده و ناموفق را پاک می‌کند (فایل‌ها باقی می‌مانند).
+    """
+    try:
+        if args.strip().lower() == 'clear':
+            removed = download_manager.clear_finished()
+            await event.edit(f"✅ `{removed}` سابقه دانلود پاک شد.")
+            return
+
+        sections = []
+        for status, title in (('active', '⏬ در حال دانلود'), ('queued', '🕒 در صف'),
+                              ('failed', '⚠️ ناموفق'), ('done', '✅ تمام شده')):
+            items = download_manager.items(status)
+            if status == 'done':
+                items = items[-10:] # فقط ۱۰ مورد آخر
+            if not items:
+                continue
+            lines = [f"**{title}** ({len(items)}):"]
+            for item in items:
+                line = f"• `{item['name']}` — {human_size(item['size'])}"
+                if status == 'active' and item['size']:
+                    line += f" ({item['done_bytes'] * 100 // item['size']}%)"
+                elif status == 'failed':
+                    line += f" — `{item['error']}`"
+                elif status == 'done':
+                    line += f" — `{item['path']}`"
+                lines.append(line)
+            sections.append("\n".join(lines))
+
+        if not sections:
+            await event.edit("صف دانلود خالی است.")
+            return
+        pages = split_digest("**📥 صف دانلود**", sections)
+        await event.edit(pages[0].strip())
+        for page in pages[1:]:
+            await event.respond(page.strip())
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .downloads: {e}")
+        await event.edit(f"خطا در نمایش صف دانلود: `{e}`")
+
+
+@command('transferbench')
+async def transfer_benchmark_command(ctx, event, args):
+    """
+    .transferbench: سند ریپلای شده را یک بار با روش تک‌اتصالی و یک بار با چند اتصال موازی دانلود
+    می‌کند و زمان و سرعت هر دو را مقایسه می‌کند. فایل‌های آزمایشی پس از اندازه‌گیری حذف می‌شوند.
+    """
+    if not event.is_reply:
+        await event.edit("روی پیامی که حاوی یک فایل (سند) است ریپلای کنید.")
+        return
+
+    paths = []
+    try:
+        replied_message = await event.get_reply_message()
+        document = replied_message.document
+        if document is None:
+            await event.edit("پیام ریپلای شده حاوی سند نیست.")
+            return
+
+        results = []
+        for label, run in (
+            ("تک‌اتصالی", lambda path: ctx.client.download_media(replied_message, file=path)),
+            (f"موازی ({fast_transfer.connections} اتصال)", lambda path: fast_transfer.download(document, path)),
+        ):
+            await event.edit(f"⏱️ بنچمارک انتقال: در حال دانلود {label}...")
+            path = f"transferbench_{replied_message.id}_{len(paths)}.tmp"
+            paths.append(path)
+            started = time.monotonic()
+            await run(path)
+            results.append((label, time.monotonic() - started))
+
+        size_mb = document.size / (1024 * 1024)
+        lines = [f"**بنچمارک انتقال** ({size_mb:.1f} MB)"]
+        for label, elapsed in results:
+            lines.append(f"• {label}: `{elapsed:.1f}` ثانیه — `{size_mb / max(elapsed, 1e-6):.2f}` MB/s")
+        lines.append(f"ضریب بهبود: `{results[0][1] / max(results[1][1], 1e-6):.2f}x`")
+        await event.edit("\n".join(lines))
+        logger.info(f"دستور .transferbench اجرا شد: {results}")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .transferbench: {e}")
+        await event.edit(f"خطا در بنچمارک انتقال: `{e}`")
+    finally:
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
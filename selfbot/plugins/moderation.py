@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Group moderation: kick, ban, mute, promote and pin, plus blocking users.
+
+The target is the sender of the replied message or a user id/username given as the first
+argument. Our own rights and the chat's admin list come from the cached AdminRightsService,
+so a command costs no extra request for the permission checks. Admins are not kicked, banned
+or muted; they have to be demoted first.
+"""
+import datetime
+import logging
+import re
+
+from telethon.errors.rpcerrorlist import ChatAdminRequiredError, RightForbiddenError, UserAdminInvalidError
+from telethon.tl.functions.contacts import BlockRequest, UnblockRequest
+from telethon.tl.types import User
+
+from selfbot.plugins import command
+
+logger = logging.getLogger(__name__)
+
+DURATION_UNITS = {'s': ('seconds', "ثانیه"), 'm': ('minutes', "دقیقه"), 'h': ('hours', "ساعت"), 'd': ('days', "روز")}
+FORBIDDEN_ERRORS = (RightForbiddenError, UserAdminInvalidError)
+
+
+def parse_duration(text):
+    """'30m' -> (timedelta, human text); None if the text is not a duration."""
+    match = re.fullmatch(r'(\d+)([smhd])', text.strip().lower())
+    if not match:
+        return None
+    value, unit = int(match.group(1)), match.group(2)
+    field, label = DURATION_UNITS[unit]
+    return datetime.timedelta(**{field: value}), f"{value} {label}"
+
+
+async def _target_user(ctx, event, arg):
+    """The user a command is aimed at: the replied message's sender, or `arg` (id/username)."""
+    if event.is_reply:
+        replied = await event.get_reply_message()
+        sender = replied.sender or await replied.get_sender()
+    elif arg:
+        try:
+            sender = await ctx.entity_cache.get(int(arg) if arg.lstrip('-').isdigit() else arg)
+        except ValueError:
+            return None
+    else:
+        return None
+    return sender if isinstance(sender, User) else None
+
+
+async def _prepare(ctx, event, arg, action, right='ban_users', creator_only=False, spare_admins=False):
+    """Common checks; returns the target user, or None after telling the user why not."""
+    if not event.is_group and not event.is_channel:
+        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
+        return None
+    target = await _target_user(ctx, event, arg)
+    if target is None:
+        await event.edit(f"برای {action}، روی پیام کاربر ریپلای کنید یا آیدی/یوزرنیم او را بنویسید.")
+        return None
+    if target.is_self:
+        await event.edit(f"شما نمی‌توانید خودتان را {action} کنید!")
+        return None
+    permissions = await ctx.admin_rights.permissions(event.chat_id)
+    if creator_only:
+        if not permissions or not permissions.is_creator:
+            await event.edit("این دستور فقط توسط سازنده چت قابل اجراست.")
+            return None
+    elif not permissions or not permissions.is_admin or not getattr(permissions, right):
+        await event.edit(f"شما ادمین نیستید یا حق {action} را ندارید.")
+        return None
+    if spare_admins and await ctx.admin_rights.permissions(event.chat_id, user_id=target.id):
+        await event.edit(f"کاربر {_mention(target)} ادمین این چت است؛ برای {action} ابتدا او را از ادمینی خارج کنید.")
+        return None
+    return target
+
+
+def _mention(user):
+    return f"[{user.first_name or user.id}](tg://user?id={user.id})"
+
+
+async def _moderate(ctx, event, args, action, apply, done, right='ban_users', creator_only=False, spare_admins=False):
+    """Runs one moderation action with the shared checks and error messages."""
+    arg = args.split()[0] if args.split() and not event.is_reply else ""
+    try:
+        target = await _prepare(ctx, event, arg, action, right=right, creator_only=creator_only, spare_admins=spare_admins)
+        if target is None:
+            return
+        note = await apply(target)
+        await event.edit(f"✅ کاربر {_mention(target)} {done}{note or ''}.")
+        logger.info(f"{action}: user {target.id} in chat {event.chat_id}")
+    except FORBIDDEN_ERRORS:
+        await event.edit(f"من اجازه {action} این کاربر را ندارم (ممکن است ادمین یا سازنده باشد).")
+    except ChatAdminRequiredError:
+        await event.edit("من ادمین این چت نیستم یا حق لازم را ندارم.")
+    except Exception as e:
+        logger.error(f"Error in {action}: {e}")
+        await event.edit(f"خطا در {action}: `{e}`")
+
+
+@command('kick')
+async def kick(ctx, event, args):
+    async def apply(user):
+        await ctx.client.kick_participant(event.chat_id, user)
+    await _moderate(ctx, event, args, "کیک کردن", apply, "کیک شد", spare_admins=True)
+
+
+@command('ban')
+async def ban(ctx, event, args):
+    async def apply(user):
+        await ctx.client.edit_permissions(event.chat_id, user, view_messages=False)
+    await _moderate(ctx, event, args, "بن کردن", apply, "بن شد", spare_admins=True)
+
+
+@command('unban')
+async def unban(ctx, event, args):
+    async def apply(user):
+        await ctx.client.edit_permissions(event.chat_id, user)   # all rights back to the chat defaults
+    await _moderate(ctx, event, args, "آن‌بن کردن", apply, "آن‌بن شد")
+
+
+@command('mute')
+async def mute(ctx, event, args):
+    """.mute [user] [duration]: the duration (30m, 2h, 1d...) may follow the user or stand alone when replying."""
+    words = args.split()
+    duration = parse_duration(words[-1]) if words else None
+    if words and duration is None and (event.is_reply or len(words) > 1):
+        await event.edit("فرمت مدت زمان نامعتبر است. مثال: `1h`, `30m`, `5d`")
+        return
+    user_args = " ".join(words[:-1] if duration else words)
+
+    async def apply(user):
+        until = datetime.datetime.now(datetime.timezone.utc) + duration[0] if duration else None
+        await ctx.client.edit_permissions(event.chat_id, user, until_date=until, send_messages=False)
+        return f" به مدت **{duration[1]}**" if duration else " (دائمی)"
+    await _moderate(ctx, event, user_args, "میوت کردن", apply, "میوت شد", spare_admins=True)
+
+
+@command('unmute')
+async def unmute(ctx, event, args):
+    async def apply(user):
+        await ctx.client.edit_permissions(event.chat_id, user)
+    await _moderate(ctx, event, args, "آن‌میوت کردن", apply, "آن‌میوت شد")
+
+
+@command('promote')
+async def promote(ctx, event, args):
+    async def apply(user):
+        await ctx.client.edit_admin(event.chat_id, user, change_info=True, post_messages=True, edit_messages=True,
+                                    delete_messages=True, ban_users=True, invite_users=True, pin_messages=True,
+                                    add_admins=False, anonymous=False, title='ادمین')
+        ctx.admin_rights.invalidate(event.chat_id)
+    await _moderate(ctx, event, args, "ارتقا به ادمین", apply, "ادمین شد", creator_only=True)
+
+
+@command('demote')
+async def demote(ctx, event, args):
+    async def apply(user):
+        await ctx.client.edit_admin(event.chat_id, user, is_admin=False)
+        ctx.admin_rights.invalidate(event.chat_id)
+    await _moderate(ctx, event, args, "خارج کردن از ادمینی", apply, "از ادمینی خارج شد", creator_only=True)
+
+
+@command('pin')
+async def pin(ctx, event, args):
+    if not event.is_reply:
+        await event.edit("برای پین کردن پیام، روی آن ریپلای کنید.")
+        return
+    try:
+        if (event.is_group or event.is_channel) and not await ctx.admin_rights.can(event.chat_id, 'pin_messages'):
+            await event.edit("شما اجازه پین کردن پیام در این چت را ندارید (ادمین نیستید یا حق پین کردن ندارید).")
+            return
+        await ctx.client.pin_message(event.chat_id, event.reply_to_msg_id, notify=False)
+        if not event.is_private:
+            ctx.chat_meta.note_pinned(event.chat_id, event.reply_to_msg_id)
+        await event.edit("✅ پیام با موفقیت پین شد.")
+    except ChatAdminRequiredError:
+        await event.edit("خطا: شما ادمین این چت نیستید یا دسترسی لازم را ندارید.")
+    except Exception as e:
+        logger.error(f"Error in pin: {e}")
+        await event.edit(f"خطا در پین کردن پیام: `{e}`")
+
+
+@command('unpin')
+async def unpin(ctx, event, args):
+    if not event.is_group and not event.is_channel:
+        await event.edit("این دستور فقط در گروه‌ها/کانال‌ها کار می‌کند.")
+        return
+    try:
+        if not await ctx.admin_rights.can(event.chat_id, 'pin_messages'):
+            await event.edit("شما اجازه خارج کردن پیام از پین در این چت را ندارید (ادمین نیستید یا حق پین کردن ندارید).")
+            return
+        pinned_msg_id = (await ctx.chat_meta.get(event.chat_id)).pinned_msg_id
+        if not pinned_msg_id:
+            await event.edit("هیچ پیام پین شده‌ای در این چت یافت نشد.")
+            return
+        await ctx.client.unpin_message(event.chat_id, pinned_msg_id)
+        ctx.chat_meta.note_unpinned(event.chat_id, pinned_msg_id)
+        await event.edit("✅ آخرین پیام پین شده با موفقیت از حالت پین خارج شد.")
+    except ChatAdminRequiredError:
+        await event.edit("خطا: شما ادمین این چت نیستید یا دسترسی لازم را ندارید.")
+    except Exception as e:
+        logger.error(f"Error in unpin: {e}")
+        await event.edit(f"خطا در خارج کردن پیام از پین: `{e}`")
+
+
+async def _set_blocked(ctx, event, args, blocked):
+    action = "بلاک کردن" if blocked else "آنبلاک کردن"
+    target = await _target_user(ctx, event, args.strip())
+    if target is None:
+        await event.edit(f"برای {action}، روی پیام کاربر ریپلای کنید یا آیدی/یوزرنیم او را بنویسید (فقط کاربر، نه گروه یا کانال).")
+        return
+    try:
+        await ctx.client(BlockRequest(target) if blocked else UnblockRequest(target))
+        await event.edit(f"✅ کاربر {_mention(target)} {'بلاک' if blocked else 'آنبلاک'} شد.")
+        logger.info(f"{action}: user {target.id}")
+    except Exception as e:
+        logger.error(f"Error in {action}: {e}")
+        await event.edit(f"خطا در {action}: `{e}`")
+
+
+@command('block')
+async def block(ctx, event, args):
+    await _set_blocked(ctx, event, args, True)
+
+
+@command('unblock')
+async def unblock(ctx, event, args):
+    await _set_blocked(ctx, event, args, False)
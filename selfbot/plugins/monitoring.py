@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+Reports of edited and deleted messages, and of new logins to the account.
+
+Telegram sends only the ids of deleted messages and only the new text of edited ones, so the
+messages of monitored chats are recorded in the MessageStore as they arrive. Which chats are
+monitored follows the `.view` settings: private chats for `.view edit` / `.view del`, groups
+and channels for `.view all`. Reports are coalesced per chat by the ReportQueue and sent to
+the chat set with `.ایدی ربات گزارش`. The MessageDeleted handler is registered only while a
+deletion view is on, because every deletion in every chat would otherwise wake the bot.
+
+Anti-login compares the account's authorizations with the ones seen before, once a minute.
+"""
+import asyncio
+import functools
+import html
+import json
+import logging
+
+from telethon import events, utils
+from telethon.errors import AuthKeyUnregisteredError
+from telethon.tl.functions.account import GetAuthorizationsRequest
+
+from selfbot.message_store import MessageStore
+from selfbot.outbound import background
+from selfbot.plugins import command, listener, resolve_target
+from selfbot.reloader import keep
+from selfbot.report_queue import ReportQueue
+
+logger = logging.getLogger(__name__)
+
+# Recent message contents of monitored chats; limits are applied from the settings in setup().
+message_store = keep('message_store', MessageStore)
+# chat_id -> (title, kind) for chats seen while monitoring; kind is 'private', 'group' or 'channel'.
+# Deletion updates carry no chat entity, so this is how they are classified and named without RPCs.
+chat_titles = keep('chat_titles', dict)
+report_queue = None
+_deleted_handler = None   # the registered MessageDeleted callback, if any
+# The .view flags and the report chat, read on every incoming message; loaded in setup() and
+# updated by _save(), so recording or reporting a message never queries the settings database.
+_flags = {}
+_FLAG_KEYS = ('view_edit_on', 'view_del_on', 'view_all_on', 'report_bot_id')
+
+
+def setup(ctx):
+    global report_queue
+    ctx.settings.create(defaults={
+        'view_edit_on': '0', 'view_del_on': '0', 'view_all_on': '0', 'report_bot_id': '',
+        'msg_store_kb': '4096', 'msg_store_spill': '0', 'report_window': '3', 'report_rate': '20',
+        'anti_login_on': '0', 'hard_anti_login_on': '0',
+    })
+    _flags.update(ctx.settings.get_many(*_FLAG_KEYS))
+    flags = ctx.settings.get_many('msg_store_kb', 'msg_store_spill', 'report_window', 'report_rate')
+    message_store.configure(max_bytes=int(flags['msg_store_kb'] or 4096) * 1024,
+                            spill_db=ctx.settings.path if flags['msg_store_spill'] == '1' else '')
+    # Edit/delete reports are coalesced per chat into digests and sent at 'report_rate' messages per minute.
+    report_queue = keep('report_queue', lambda: ReportQueue(functools.partial(_send_report, ctx.client)))
+    report_queue.configure(window=float(flags['report_window'] or 3), per_minute=int(flags['report_rate'] or 20))
+    ctx.snapshot.register('chat_titles', lambda: chat_titles, _load_chat_titles)
+    ctx.snapshot.register('message_store', message_store.dump, message_store.load)
+    _sync_deleted_handler(ctx)
+
+
+def start(ctx):
+    return _check_sessions_loop(ctx)
+
+
+def teardown(ctx):
+    global _deleted_handler
+    if _deleted_handler is not None:
+        ctx.client.remove_event_handler(_deleted_handler, events.MessageDeleted)
+        _deleted_handler = None
+
+
+def status(ctx):
+    flags = ctx.settings.get_many('anti_login_on', 'hard_anti_login_on', 'view_edit_on', 'view_del_on', 'view_all_on',
+                                  'msg_store_spill', 'report_bot_id', 'report_rate')
+    on = lambda key: 'ON' if flags[key] == '1' else 'OFF'
+    return [
+        f"🔐 Anti Login: <b>{on('anti_login_on')}</b>",
+        f"🔒 Hard Anti Login (Session Check): <b>{on('hard_anti_login_on')}</b>",
+        f"👁️ View Edited Messages: <b>{on('view_edit_on')}</b>",
+        f"🗑️ View Deleted Messages: <b>{on('view_del_on')}</b>",
+        f"🌐 View All (Group Edits/Deletions): <b>{on('view_all_on')}</b>",
+        f"💾 Message Archive Spill: <b>{on('msg_store_spill')}</b> ({message_store.stats()['messages']} cached)",
+        f"📬 Report Bot ID: <b>{flags['report_bot_id'] or 'Not Set'}</b> (Rate: <b>{flags['report_rate'] or '20'}</b>/min, queued: {report_queue.backlog()})",
+    ]
+
+
+def _load_chat_titles(data):
+    chat_titles.update({int(k): tuple(v) for k, v in data.items()})
+
+
+async def _send_report(client, target, text):
+    with background():
+        await client.send_message(target, text, parse_mode='html', link_preview=False)
+
+
+def _save(ctx, key, value):
+    """Stores a setting, keeping the in-memory copy of the flags current."""
+    ctx.settings.set(key, value)
+    if key in _flags:
+        _flags[key] = str(value)
+
+
+def _sync_deleted_handler(ctx):
+    """Registers the MessageDeleted handler only while one of the deletion views is enabled."""
+    global _deleted_handler
+    wanted = _flags['view_del_on'] == '1' or _flags['view_all_on'] == '1'
+    if wanted and _deleted_handler is None:
+        _deleted_handler = functools.partial(handle_message_deleted, ctx)
+        ctx.client.add_event_handler(_deleted_handler, events.MessageDeleted())
+    elif not wanted and _deleted_handler is not None:
+        ctx.client.remove_event_handler(_deleted_handler, events.MessageDeleted)
+        _deleted_handler = None
+
+
+async def _toggle(ctx, event, args, key, label, usage):
+    mode = args.strip().lower()
+    if mode not in ("on", "off"):
+        await event.edit(f"❌ Usage: `{usage}`", parse_mode='html')
+        return None
+    _save(ctx, key, '1' if mode == "on" else '0')
+    await event.edit(f"✅ {label}: <b>{mode.upper()}</b>", parse_mode='html')
+    return mode == "on"
+
+
+# --- Commands ---
+
+@command('view edit')
+async def toggle_view_edit(ctx, event, args):
+    """Toggles reports of messages edited in private chats."""
+    await _toggle(ctx, event, args, 'view_edit_on', "Viewing edited messages", ".view edit on | off")
+
+
+@command('view del')
+async def toggle_view_del(ctx, event, args):
+    """Toggles reports of messages deleted in private chats."""
+    await _toggle(ctx, event, args, 'view_del_on', "Viewing deleted messages", ".view del on | off")
+    _sync_deleted_handler(ctx)
+
+
+@command('view all')
+async def toggle_view_all(ctx, event, args):
+    """Toggles reports of edits and deletions in groups and channels."""
+    await _toggle(ctx, event, args, 'view_all_on', "Viewing all edits/deletions (groups/channels)", ".view all on | off")
+    _sync_deleted_handler(ctx)
+
+
+@command('view spill')
+async def toggle_view_spill(ctx, event, args):
+    """Toggles spilling evicted messages of monitored chats into SQLite instead of dropping them."""
+    enabled = await _toggle(ctx, event, args, 'msg_store_spill', "Message archive spill to database", ".view spill on | off")
+    if enabled is not None:
+        message_store.configure(spill_db=ctx.settings.path if enabled else '')
+
+
+@command('سرعت گزارش')
+async def set_report_rate(ctx, event, args):
+    """Sets how many report digests may be sent per minute."""
+    try:
+        rate = int(args.strip())
+        if rate < 1:
+            raise ValueError("Rate must be at least 1.")
+    except ValueError:
+        await event.edit("❌ Usage: `.سرعت گزارش [تعداد در دقیقه]` (e.g., `.سرعت گزارش 20`)", parse_mode='html')
+        return
+    ctx.settings.set('report_rate', str(rate))
+    report_queue.configure(per_minute=rate)
+    await event.edit(f"✅ Report rate set to <b>{rate}</b> digest(s) per minute.", parse_mode='html')
+
+
+@command('ایدی ربات گزارش')
+async def set_report_bot_id(ctx, event, args):
+    """Sets the bot or chat that edit/deletion and login reports are sent to."""
+    if not args.strip():
+        await event.edit("❌ Usage: `.ایدی ربات گزارش [user_id/username]`", parse_mode='html')
+        return
+    _, target_id = await resolve_target(ctx, event, args.strip(), peer_only=True)
+    if not target_id:
+        await event.edit("❌ Could not find entity. Please provide a valid ID or username.", parse_mode='html')
+        return
+    _save(ctx, 'report_bot_id', str(target_id))
+    await event.edit(f"✅ Report bot/chat ID set to: <b>{target_id}</b>", parse_mode='html')
+
+
+@command('anti login')
+async def toggle_anti_login(ctx, event, args):
+    """Toggles reports of new sessions."""
+    if await _toggle(ctx, event, args, 'anti_login_on', "Anti login", ".anti login on | off"):
+        ctx.settings.set('known_sessions', '[]')   # report every existing session on the next check
+
+
+@command('hard anti login')
+async def toggle_hard_anti_login(ctx, event, args):
+    """Toggles the stricter session check; new sessions are reported, not terminated."""
+    if await _toggle(ctx, event, args, 'hard_anti_login_on', "Hard anti login (aggressive session check)", ".hard anti login on | off"):
+        ctx.settings.set('known_sessions', '[]')
+
+
+# --- Listeners ---
+
+def _is_monitored_chat(event):
+    """True if edits/deletions in this event's chat are reported, i.e. its messages are worth storing."""
+    if _flags['view_edit_on'] == '1' or _flags['view_del_on'] == '1':
+        return True
+    return _flags['view_all_on'] == '1' and (event.is_group or event.is_channel)
+
+
+def _remember_chat(event):
+    """Caches the title and kind of an event's chat from the entities shipped with the update."""
+    if event.chat_id in chat_titles and event.chat is None:
+        return
+    kind = 'group' if event.is_group else 'channel' if event.is_channel else 'private'
+    title = utils.get_display_name(event.chat) if event.chat else chat_titles.get(event.chat_id, (None,))[0]
+    chat_titles[event.chat_id] = (title, kind)
+
+
+def _clip(text, limit=700):
+    """HTML-escapes report text, shortening it so one event never fills a whole digest."""
+    return html.escape(text if len(text) <= limit else text[:limit] + ' …')
+
+
+def _sender_name(event):
+    """Display name of an event's sender from the entities shipped with the update (no RPC)."""
+    return utils.get_display_name(event.sender) if event.sender else str(event.sender_id)
+
+
+@listener(events.NewMessage(incoming=True))
+async def record_message(ctx, event):
+    """Stores messages of monitored chats for the edit/delete reports."""
+    if _is_monitored_chat(event):
+        message_store.put_message(event.message, _sender_name(event))
+        _remember_chat(event)
+
+
+@listener(events.MessageEdited(incoming=True))
+async def handle_message_edited(ctx, event):
+    """Reports edited messages, reading the previous text from the message store."""
+    if not (_flags['view_edit_on'] == '1' or (_flags['view_all_on'] == '1' and (event.is_group or event.is_channel))):
+        return
+
+    _remember_chat(event)
+    new_text = event.raw_text or ''
+    previous = message_store.update_text(event.chat_id, event.id, new_text)
+    if previous is None:
+        message_store.put_message(event.message, _sender_name(event))  # Track it from now on
+    elif previous.text == new_text:
+        return  # Reaction or markup-only edit, the text itself did not change
+
+    report_chat_id = _flags['report_bot_id']
+    if not report_chat_id:
+        return
+    sender_name = previous.sender_name if previous and previous.sender_name else _sender_name(event)
+    chat_name = utils.get_display_name(event.chat) if event.chat else str(event.chat_id)
+    original_text = f"<code>{_clip(previous.text)}</code>" if previous else "<i>(not seen before the edit)</i>"
+    link = f" — <a href='{event.message.url}'>View</a>" if event.message.url else ""
+    report_item = (
+        f"✏️ <a href='tg://user?id={event.sender_id}'>{html.escape(sender_name)}</a>{link}\n"
+        f"  <b>Original:</b> {original_text}\n"
+        f"  <b>New:</b> <code>{_clip(new_text)}</code>"
+    )
+    report_queue.add(int(report_chat_id), event.chat_id,
+                     f"{html.escape(chat_name)} (<code>{event.chat_id}</code>)", 'edit', report_item)
+
+
+async def handle_message_deleted(ctx, event):
+    """Reports deleted messages; registered by _sync_deleted_handler() only while a deletion view is on."""
+    report_chat_id = _flags['report_bot_id']
+    if not report_chat_id:
+        return
+    for msg_id in event.deleted_ids:
+        # Telegram only sends the ids; the content comes from what we stored when it arrived.
+        # Channel/supergroup deletions carry the chat id, the rest are resolved through the store.
+        stored = message_store.pop(event.chat_id, msg_id)
+        chat_id = stored.chat_id if stored else event.chat_id
+        title, kind = chat_titles.get(chat_id, (None, 'channel' if event.chat_id else None))
+        if _flags['view_del_on'] != '1' and kind not in ('group', 'channel'):
+            continue  # Only "view all" is on, which covers groups and channels
+        if stored:
+            content = f"<code>{_clip(stored.text)}</code>" if stored.text else ""
+            if stored.media:
+                content = f"[{stored.media}] {content}"
+            report_item = (
+                f"🗑️ <code>{msg_id}</code> from <a href='tg://user?id={stored.sender_id}'>{html.escape(stored.sender_name or str(stored.sender_id))}</a>\n"
+                f"  {content or '<i>(empty)</i>'}"
+            )
+        else:
+            report_item = f"🗑️ <code>{msg_id}</code> <i>(content unavailable: not seen while monitoring was on)</i>"
+        chat_title = f"{html.escape(title)} (<code>{chat_id}</code>)" if title else f"<code>{chat_id or 'Unknown Chat'}</code>"
+        report_queue.add(int(report_chat_id), chat_id, chat_title, 'delete', report_item)
+
+
+# --- Anti-login ---
+
+async def _check_sessions_loop(ctx):
+    with background():  # Session checks yield to command replies
+        while True:
+            await asyncio.sleep(60)
+            await check_active_sessions(ctx)
+
+
+async def check_active_sessions(ctx):
+    """
+    Reports authorizations that were not there at the previous check. Sessions are never
+    terminated: the current one cannot be told apart reliably, and ending it would end the bot.
+    """
+    flags = ctx.settings.get_many('anti_login_on', 'hard_anti_login_on', 'report_bot_id', 'known_sessions')
+    if flags['anti_login_on'] != '1' and flags['hard_anti_login_on'] != '1':
+        return
+    report_chat_id = flags['report_bot_id']
+    if not report_chat_id:
+        logger.warning("Anti-login is ON but no report bot ID is set.")
+        return
+
+    try:
+        devices = await ctx.client(GetAuthorizationsRequest())
+        known_hashes = {session['hash'] for session in json.loads(flags['known_sessions'] or '[]')}
+        sessions = [{
+            'hash': auth.hash,
+            'app_name': auth.app_name,
+            'platform': auth.platform,
+            'device_model': auth.device_model,
+            'ip': auth.ip,
+            'country': auth.country,
+            'date_created': auth.date_created.isoformat(),
+            'date_active': auth.date_active.isoformat(),
+        } for auth in devices.authorizations]
+        new_sessions = [session for session in sessions if session['hash'] not in known_hashes]
+
+        if new_sessions:
+            report_msg = "⚠️ <b>New Telegram Session(s) Detected!</b> ⚠️\n"
+            for session in new_sessions:
+                report_msg += (
+                    f"  - App: <code>{html.escape(session['app_name'])}</code>\n"
+                    f"  - Platform: <code>{html.escape(session['platform'])}</code>\n"
+                    f"  - Device: <code>{html.escape(session['device_model'])}</code>\n"
+                    f"  - IP: <code>{session['ip']}</code> ({html.escape(session['country'])})\n"
+                    f"  - Active: {session['date_active']}\n"
+                    f"  - Created: {session['date_created']}\n\n"
+                )
+            report_msg += "Please review your active sessions in Telegram settings for unauthorized access."
+            try:
+                await ctx.client.send_message(int(report_chat_id), report_msg, parse_mode='html')
+            except Exception as e:
+                logger.error(f"Failed to send anti-login report to {report_chat_id}: {e}")
+        ctx.settings.set('known_sessions', json.dumps(sessions))
+    except AuthKeyUnregisteredError:
+        logger.error("Anti-login check failed: Session is no longer valid. Re-login required.")
+    except Exception as e:
+        logger.error(f"Error during anti-login check: {e}")
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+The monshi (secretary): automatic replies to private messages, the special list, and
+automatic reactions.
+
+Replies are tried in order: a reply set up for that sender (`.تنظیم فرد منتخب`), an exact
+rule, an inclusive rule, then the default message. Senders on the special list (`.سکوت`,
+`.اضافه کردن خاص`) are never answered. The last message answered per chat is kept in the state
+snapshot, so updates replayed after a restart are not answered twice.
+"""
+import html
+import logging
+import os
+import sqlite3
+import time
+
+from telethon import events
+from telethon.tl.functions.messages import SendReactionRequest
+from telethon.tl.types import ReactionEmoji, User
+
+from selfbot.batch_resolve import show_entity_list
+from selfbot.outbound import background
+from selfbot.plugins import command, listener, resolve_target
+from selfbot.reloader import keep
+
+logger = logging.getLogger(__name__)
+
+# sender_id -> {'state': 'waiting_for_id' or 'waiting_for_message', 'temp_id': None, 'temp_media': None, 'is_reply': False}
+active_user_setup = keep('monshi_setup', dict)
+# chat_id -> id of the last private message the monshi handled there
+handled = keep('monshi_handled', dict)
+
+
+def setup(ctx):
+    ctx.settings.create(
+        '''CREATE TABLE IF NOT EXISTS auto_replies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trigger_text TEXT NOT NULL,
+            response_text TEXT,
+            response_media_path TEXT,
+            exact_match BOOLEAN NOT NULL,
+            specific_peer_id INTEGER DEFAULT NULL, -- For auto-reply to specific users
+            enabled BOOLEAN NOT NULL DEFAULT 1
+        )''',
+        '''CREATE TABLE IF NOT EXISTS special_users (
+            user_id INTEGER PRIMARY KEY,
+            added_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''',
+        '''CREATE TABLE IF NOT EXISTS reaction_targets (
+            entity_id INTEGER PRIMARY KEY,
+            enabled BOOLEAN NOT NULL DEFAULT 1
+        )''',
+        defaults={'monshi_enabled': '0', 'default_monshi_response': 'من در حال حاضر پاسخگو نیستم.',
+                  'reaction_on': '0', 'reaction_emoji': '👍'},
+    )
+    ctx.snapshot.register('monshi', _dump_state, _load_state)
+
+
+def status(ctx):
+    flags = ctx.settings.get_many('monshi_enabled', 'default_monshi_response', 'reaction_on', 'reaction_emoji')
+    return [
+        f"🤖 Auto Reply (Monshi): <b>{'ON' if flags['monshi_enabled'] == '1' else 'OFF'}</b> (Default: <code>{html.escape(flags['default_monshi_response'] or 'N/A')}</code>)",
+        f"❤️ Reaction On: <b>{'ON' if flags['reaction_on'] == '1' else 'OFF'}</b> (Emoji: <b>{flags['reaction_emoji'] or '👍'}</b>)",
+    ]
+
+
+def _dump_state():
+    return {'setup': active_user_setup, 'handled': handled}
+
+
+def _load_state(data):
+    # JSON object keys are strings; the handlers look these dicts up by integer id.
+    active_user_setup.update({int(k): v for k, v in data['setup'].items()})
+    handled.update({int(k): v for k, v in data['handled'].items()})
+
+
+def _entity_link(entity, entity_id):
+    name = entity.first_name if isinstance(entity, User) else entity.title
+    return f"[{name}](tg://user?id={entity_id})"
+
+
+def _ids(ctx, query, params=()):
+    conn = ctx.settings.connect()
+    try:
+        return [row[0] for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+
+def _execute(ctx, query, params=()):
+    """Runs one write statement; returns the number of rows it changed."""
+    conn = ctx.settings.connect()
+    try:
+        changed = conn.execute(query, params).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    return changed
+
+
+# --- Monshi ---
+
+@command('منشی روشن')
+async def monshi_on(ctx, event, args):
+    ctx.settings.set('monshi_enabled', '1')
+    await event.edit("✅ منشی فعال شد.", parse_mode='html')
+
+
+@command('منشی خاموش')
+async def monshi_off(ctx, event, args):
+    ctx.settings.set('monshi_enabled', '0')
+    await event.edit("✅ منشی غیرفعال شد.", parse_mode='html')
+
+
+@command('تنظیم منشی')
+async def set_default_monshi_message(ctx, event, args):
+    """Sets the default auto-reply message."""
+    if not args and not event.is_reply:
+        await event.edit("❌ Usage: `.تنظیم منشی [پیام]` or reply to message.", parse_mode='html')
+        return
+
+    message_text = args
+    if event.is_reply:
+        reply_msg = await event.get_reply_message()
+        if reply_msg and reply_msg.text:
+            message_text = reply_msg.text
+        else:
+            await event.edit("❌ Reply message has no text.", parse_mode='html')
+            return
+
+    ctx.settings.set('default_monshi_response', message_text)
+    await event.edit(f"✅ پیام پیشفرض منشی به: <b>{html.escape(message_text)}</b> تنظیم شد.", parse_mode='html')
+
+
+@command('تنظیم فرد منتخب')
+async def set_individual_auto_reply_start(ctx, event, args):
+    """Starts the setup of an auto-reply for one user; the id and the reply follow as private messages."""
+    await event.delete()
+    active_user_setup[event.sender_id] = {'state': 'waiting_for_id', 'temp_id': None, 'temp_media': None, 'is_reply': event.is_reply}
+    await ctx.client.send_message(event.chat_id, "🔢 لطفا شناسه کاربری (عددی یا یوزرنیم) فرد مورد نظر را وارد کنید.", reply_to=event.id)
+
+
+async def _add_rule(ctx, event, args, exact, usage):
+    if ':' not in args:
+        await event.edit(f"❌ Usage: `{usage}`", parse_mode='html')
+        return
+    key, response = (part.strip() for part in args.split(':', 1))
+    if not key or not response:
+        await event.edit("❌ کلید و پاسخ نمی‌توانند خالی باشند.", parse_mode='html')
+        return
+    _execute(ctx, 'INSERT INTO auto_replies (trigger_text, response_text, exact_match) VALUES (?, ?, ?)', (key, response, exact))
+    kind = "دقیق" if exact else "شامل"
+    await event.edit(f"✅ پاسخ خودکار {kind} برای '<b>{html.escape(key)}</b>' به '<b>{html.escape(response)}</b>' تنظیم شد.", parse_mode='html')
+
+
+@command('تنظیم پاسخ خودکار')
+async def set_exact_auto_reply(ctx, event, args):
+    """Sets an auto-reply rule for exact message matches."""
+    await _add_rule(ctx, event, args, True, ".تنظیم پاسخ خودکار [کلید] : [پاسخ]")
+
+
+@command('تنظیم پاسخ شامل خودکار')
+async def set_inclusive_auto_reply(ctx, event, args):
+    """Sets an auto-reply rule for partial message matches."""
+    await _add_rule(ctx, event, args, False, ".تنظیم پاسخ شامل خودکار [کلید] : [پاسخ]")
+
+
+@command('حذف پاسخ خودکار')
+async def delete_auto_reply(ctx, event, args):
+    """Deletes an auto-reply rule by its trigger key."""
+    key = args.strip()
+    if not key:
+        await event.edit("❌ Usage: `.حذف پاسخ خودکار [کلید]`", parse_mode='html')
+        return
+    if _execute(ctx, 'DELETE FROM auto_replies WHERE trigger_text = ?', (key,)):
+        await event.edit(f"✅ پاسخ خودکار برای '<b>{html.escape(key)}</b>' حذف شد.", parse_mode='html')
+    else:
+        await event.edit(f"ℹ️ پاسخ خودکاری با کلید '<b>{html.escape(key)}</b>' یافت نشد.", parse_mode='html')
+
+
+@command('لیست پاسخ خودکار')
+async def list_auto_replies(ctx, event, args):
+    """Lists all configured auto-reply rules."""
+    conn = ctx.settings.connect()
+    try:
+        replies = conn.execute('SELECT trigger_text, response_text, exact_match, specific_peer_id FROM auto_replies').fetchall()
+    finally:
+        conn.close()
+
+    if not replies:
+        await event.edit("ℹ️ هیچ قانون پاسخ خودکاری تنظیم نشده است.", parse_mode='html')
+        return
+
+    def format_line(rule, peer_label):
+        trigger, response, exact = rule
+        peer_info = f" (برای: {peer_label})" if peer_label else ""
+        return f"  - <b>{html.escape(trigger)}</b> {'(دقیق)' if exact else '(شامل)'}: {html.escape(response or '')}{peer_info}"
+
+    rows = [(peer_id, (trigger, response, exact)) for trigger, response, exact, peer_id in replies]
+    await show_entity_list(event, ctx.batch_resolver, "<b>قوانین پاسخ خودکار:</b>", rows, format_line)
+
+
+@command('منشی پاک کردن')
+async def clear_auto_replies(ctx, event, args):
+    """Deletes all auto-reply rules."""
+    _execute(ctx, 'DELETE FROM auto_replies')
+    await event.edit("✅ تمام قوانین پاسخ خودکار حذف شدند.", parse_mode='html')
+
+
+# --- Special list: senders the monshi ignores ---
+
+@command('سکوت')
+async def mute_user_self(ctx, event, args):
+    """Adds a user to the monshi's ignore list."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Usage: `.سکوت [user_id/username]` or reply to a user.", reply_to=event.id)
+        return
+    try:
+        _execute(ctx, 'INSERT INTO special_users (user_id) VALUES (?)', (target_id,))
+        text = f"✅ User {_entity_link(target_entity, target_id)} has been muted (added to ignore list)."
+    except sqlite3.IntegrityError:
+        text = f"ℹ️ User {_entity_link(target_entity, target_id)} is already in the ignore list."
+    await ctx.client.send_message(event.chat_id, text, parse_mode='md', reply_to=event.id)
+
+
+@command('حذف سکوت')
+async def unmute_user_self(ctx, event, args):
+    """Removes a user from the monshi's ignore list."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Usage: `.حذف سکوت [user_id/username]` or reply to a user.", reply_to=event.id)
+        return
+    if _execute(ctx, 'DELETE FROM special_users WHERE user_id = ?', (target_id,)):
+        text = f"✅ User {_entity_link(target_entity, target_id)} has been unmuted (removed from ignore list)."
+    else:
+        text = f"ℹ️ User {_entity_link(target_entity, target_id)} was not in the ignore list."
+    await ctx.client.send_message(event.chat_id, text, parse_mode='md', reply_to=event.id)
+
+
+@command('اضافه کردن خاص')
+async def add_special_user(ctx, event, args):
+    """Adds a user or chat to the special list."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Could not find user/chat. Please provide a valid ID, username, or reply.", reply_to=event.id)
+        return
+    try:
+        _execute(ctx, 'INSERT INTO special_users (user_id) VALUES (?)', (target_id,))
+        text = f"✅ Entity {_entity_link(target_entity, target_id)} added to special list."
+    except sqlite3.IntegrityError:
+        text = f"ℹ️ Entity {_entity_link(target_entity, target_id)} is already in the special list."
+    await ctx.client.send_message(event.chat_id, text, parse_mode='md', reply_to=event.id)
+
+
+@command('حذف خاص')
+async def remove_special_user(ctx, event, args):
+    """Removes a user or chat from the special list."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Could not find user/chat. Please provide a valid ID, username, or reply.", reply_to=event.id)
+        return
+    if _execute(ctx, 'DELETE FROM special_users WHERE user_id = ?', (target_id,)):
+        text = f"✅ Entity {_entity_link(target_entity, target_id)} removed from special list."
+    else:
+        text = f"ℹ️ Entity {_entity_link(target_entity, target_id)} not found in special list."
+    await ctx.client.send_message(event.chat_id, text, parse_mode='md', reply_to=event.id)
+
+
+@command('لیست خاص')
+async def list_special_users(ctx, event, args):
+    """Lists all users/chats in the special list."""
+    special_ids = _ids(ctx, 'SELECT user_id FROM special_users')
+    if not special_ids:
+        await event.edit("ℹ️ Special list is empty.", parse_mode='html')
+        return
+    await show_entity_list(event, ctx.batch_resolver, "<b>Special Users/Chats:</b>",
+                           [(user_id, None) for user_id in special_ids], lambda _, label: f"  - {label}")
+
+
+@command('پاک کردن لیست خاص')
+async def clear_special_users(ctx, event, args):
+    """Clears all entries from the special list."""
+    _execute(ctx, 'DELETE FROM special_users')
+    await event.edit("✅ Special list cleared.", parse_mode='html')
+
+
+# --- Reactions ---
+
+@command('reaction')
+async def toggle_reaction(ctx, event, args):
+    """Toggles the auto-reaction feature."""
+    mode = args.strip().lower()
+    if mode not in ("on", "off"):
+        await event.edit("❌ Usage: `.reaction on | off`", parse_mode='html')
+        return
+    ctx.settings.set('reaction_on', '1' if mode == "on" else '0')
+    await event.edit(f"✅ Reaction: <b>{mode.upper()}</b>", parse_mode='html')
+
+
+@command('لیست ریاکشن')
+async def list_reaction_targets(ctx, event, args):
+    """Lists entities to which the bot auto-reacts."""
+    target_ids = _ids(ctx, 'SELECT entity_id FROM reaction_targets WHERE enabled = 1')
+    if not target_ids:
+        await event.edit("ℹ️ هیچ فرد یا گروهی برای ریاکشن فعال نیست.", parse_mode='html')
+        return
+    await show_entity_list(event, ctx.batch_resolver, "<b>فرد/گروه‌هایی که به پیام‌هایشان ریاکشن داده می‌شود:</b>",
+                           [(entity_id, None) for entity_id in target_ids], lambda _, label: f"  - {label}")
+
+
+@command('تنظیم ریاکشن')
+async def add_reaction_target(ctx, event, args):
+    """Adds an entity to the list of auto-reaction targets."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Could not find user/chat. Please provide a valid ID, username, or reply.", reply_to=event.id)
+        return
+    try:
+        _execute(ctx, 'INSERT OR REPLACE INTO reaction_targets (entity_id, enabled) VALUES (?, 1)', (target_id,))
+        await ctx.client.send_message(event.chat_id, f"✅ Entity {_entity_link(target_entity, target_id)} added to reaction targets.", parse_mode='md', reply_to=event.id)
+    except Exception as e:
+        await ctx.client.send_message(event.chat_id, f"❌ Error adding reaction target: {e}", reply_to=event.id)
+
+
+@command('حذف ریاکشن')
+async def remove_reaction_target(ctx, event, args):
+    """Removes an entity from the list of auto-reaction targets."""
+    await event.delete()
+    target_entity, target_id = await resolve_target(ctx, event, args.strip())
+    if not target_entity or not target_id:
+        await ctx.client.send_message(event.chat_id, "❌ Could not find user/chat. Please provide a valid ID, username, or reply.", reply_to=event.id)
+        return
+    if _execute(ctx, 'DELETE FROM reaction_targets WHERE entity_id = ?', (target_id,)):
+        text = f"✅ Entity {_entity_link(target_entity, target_id)} removed from reaction targets."
+    else:
+        text = f"ℹ️ Entity {_entity_link(target_entity, target_id)} not found in reaction targets."
+    await ctx.client.send_message(event.chat_id, text, parse_mode='md', reply_to=event.id)
+
+
+@command('set reaction')
+async def set_reaction_emoji(ctx, event, args):
+    """Sets the emoji used for auto-reactions."""
+    emoji = args.strip()
+    if not emoji:
+        await event.edit("❌ Usage: `.set reaction [emoji]` (e.g., `.set reaction 👍`)", parse_mode='html')
+        return
+    if len(emoji) > 10:  # Likely not a single emoji if too long
+        await event.edit("❌ Please provide a single valid emoji.", parse_mode='html')
+        return
+    ctx.settings.set('reaction_emoji', emoji)
+    await event.edit(f"✅ Reaction emoji set to: <b>{emoji}</b>", parse_mode='html')
+
+
+# --- Listeners ---
+
+async def _send_reply(ctx, event, response_text, response_media_path):
+    if response_media_path and os.path.exists(response_media_path):
+        await ctx.client.send_file(event.chat_id, response_media_path, caption=response_text)
+    elif response_text:
+        await event.reply(response_text)
+
+
+@listener(events.NewMessage(incoming=True, func=lambda e: e.is_private))
+async def handle_private_message(ctx, event):
+    """Auto-replies to private messages and collects the steps of `.تنظیم فرد منتخب`."""
+    if _ids(ctx, 'SELECT 1 FROM special_users WHERE user_id = ?', (event.sender_id,)):
+        logger.info(f"Ignoring message from self-muted user: {event.sender_id}")
+        return
+
+    # Multi-step setup of an auto-reply for a specific user
+    state_data = active_user_setup.get(event.sender_id)
+    if state_data is not None:
+        if state_data['state'] == 'waiting_for_id':
+            target_entity, target_id = await resolve_target(ctx, event, event.raw_text.strip())
+            if target_id:
+                state_data['temp_id'] = target_id
+                state_data['state'] = 'waiting_for_message'
+                await event.reply(f"✅ شناسه کاربری <code>{target_id}</code> تنظیم شد. حالا پیام یا رسانه مورد نظر برای پاسخ را ارسال کنید.", parse_mode='html')
+            else:
+                await event.reply("❌ شناسه کاربری نامعتبر. لطفا دوباره تلاش کنید.")
+            return
+        if state_data['state'] == 'waiting_for_message':
+            target_id = state_data['temp_id']
+            response_text = event.text
+            response_media_path = None
+            if event.media:
+                response_media_path = await ctx.client.download_media(event.media, file=f"auto_reply_media_{target_id}_{int(time.time())}")
+                response_text = event.raw_text  # Use caption if any
+            if not response_text and not response_media_path:
+                await event.reply("❌ پیام یا رسانه خالی است. لطفا دوباره تلاش کنید.")
+                return
+            _execute(ctx, 'INSERT INTO auto_replies (trigger_text, response_text, response_media_path, exact_match, specific_peer_id) VALUES (?, ?, ?, ?, ?)',
+                     (f"specific_monshi_{target_id}", response_text, response_media_path, True, target_id))
+            await event.reply(f"✅ پاسخ خودکار برای <code>{target_id}</code> با موفقیت تنظیم شد.", parse_mode='html')
+            del active_user_setup[event.sender_id]
+            return
+
+    if not ctx.settings.enabled('monshi_enabled'):
+        return
+    if event.id <= handled.get(event.chat_id, 0):
+        return  # Already answered (e.g. an update replayed after a restart)
+    handled[event.chat_id] = event.id
+
+    conn = ctx.settings.connect()
+    try:
+        # A reply set up for this sender first, then exact and inclusive rules
+        reply = (
+            conn.execute('SELECT response_text, response_media_path FROM auto_replies WHERE specific_peer_id = ? AND enabled = 1 LIMIT 1',
+                         (event.sender_id,)).fetchone()
+            or conn.execute('SELECT response_text, response_media_path FROM auto_replies WHERE exact_match = 1 AND trigger_text = ? AND specific_peer_id IS NULL AND enabled = 1 LIMIT 1',
+                            (event.text,)).fetchone()
+            or conn.execute("SELECT response_text, response_media_path FROM auto_replies WHERE exact_match = 0 AND ? LIKE '%' || trigger_text || '%' AND specific_peer_id IS NULL AND enabled = 1 LIMIT 1",
+                            (event.text,)).fetchone()
+        )
+    finally:
+        conn.close()
+    if reply:
+        await _send_reply(ctx, event, *reply)
+        return
+
+    default_monshi = ctx.settings.get('default_monshi_response')
+    if default_monshi:
+        await event.reply(default_monshi)
+
+
+@listener(events.NewMessage(incoming=True))
+async def handle_auto_reaction(ctx, event):
+    """Reacts to new messages of the chats and senders on the reaction list."""
+    flags = ctx.settings.get_many('reaction_on', 'reaction_emoji')
+    if flags['reaction_on'] != '1':
+        return
+    conn = ctx.settings.connect()
+    try:
+        targeted = conn.execute('SELECT 1 FROM reaction_targets WHERE entity_id IN (?, ?) AND enabled = 1',
+                                (event.chat_id, event.sender_id)).fetchone()
+    finally:
+        conn.close()
+    if not targeted:
+        return
+
+    reaction_emoji = flags['reaction_emoji'] or '👍'
+    try:
+        with background():
+            await ctx.client(SendReactionRequest(peer=event.chat_id, msg_id=event.id,
+                                                 reaction=[ReactionEmoji(emoticon=reaction_emoji)]))
+        logger.info(f"Reacted to message {event.id} from {event.sender_id} in {event.chat_id} with {reaction_emoji}")
+    except Exception as e:
+        logger.error(f"Failed to send reaction: {e}")
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Profile commands: photo, name and bio, the clock in the name/bio, and copying other profiles.
+
+One photo setter handles local files, URLs and replied photos/videos. Images go through the
+content-addressed upload cache, so setting the same image again only re-activates the earlier
+upload. Replied media is downloaded into memory, not a temp file.
+
+`.clock` and `.bio` are settings; start() runs the loop that applies them once a minute.
+`.shapeshifter` backs the current profile up in the settings database before copying another.
+"""
+import asyncio
+import datetime
+import io
+import logging
+import os
+import time
+
+from telethon.errors import MessageNotModifiedError
+from telethon.errors.rpcerrorlist import PhotoCropSizeSmallError, PhotoInvalidError, WebpageCurlFailedError
+from telethon.tl.functions.account import UpdateProfileRequest
+from telethon.tl.functions.photos import UploadProfilePhotoRequest
+from telethon.tl.types import PhotoEmpty, User
+
+from selfbot.outbound import background
+from selfbot.plugins import command, resolve_target
+from selfbot.profile_photos import delete_profile_photos
+from selfbot.remote_media import RemoteFileTooLarge, prepare_profile_photo
+
+logger = logging.getLogger(__name__)
+
+
+def setup(ctx):
+    ctx.settings.create(
+        '''CREATE TABLE IF NOT EXISTS shapeshifter_backup (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT,
+            bio TEXT,
+            profile_photo_path TEXT,
+            backup_time DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''',
+        defaults={'clock_in_name': '0', 'clock_in_bio': '0', 'bio_auto_text': '0', 'custom_bio_text': ''},
+    )
+
+
+def start(ctx):
+    return _update_profile_loop(ctx)
+
+
+def status(ctx):
+    flags = ctx.settings.get_many('clock_in_name', 'clock_in_bio', 'bio_auto_text', 'custom_bio_text')
+    return [
+        f"⏰ Time in Name: <b>{'ON' if flags['clock_in_name'] == '1' else 'OFF'}</b>",
+        f"📝 Time in Bio: <b>{'ON' if flags['clock_in_bio'] == '1' else 'OFF'}</b>",
+        f"✍️ Auto Bio Text: <b>{'ON' if flags['bio_auto_text'] == '1' else 'OFF'}</b> (Text: <code>{flags['custom_bio_text'] or 'N/A'}</code>)",
+    ]
+
+
+@command('setpfp', 'setprofile')
+async def set_profile_photo(ctx, event, args):
+    """.setpfp <path | url>, or as a reply to a photo or video."""
+    source = args.strip()
+    replied = await event.get_reply_message() if event.is_reply and not source else None
+    if not source and not (replied and (replied.photo or replied.video)):
+        await event.edit("مسیر فایل یا لینک عکس را بنویسید یا روی یک عکس/ویدیو ریپلای کنید.")
+        return
+
+    try:
+        await event.edit("در حال تنظیم عکس پروفایل...")
+        if replied is not None:
+            data = io.BytesIO(await ctx.client.download_media(replied, file=bytes))
+            if replied.video:
+                uploaded = await ctx.client.upload_file(data, file_name='profile.mp4')
+                await ctx.client(UploadProfilePhotoRequest(video=uploaded))
+            else:
+                await ctx.upload_cache.set_profile_photo(data)
+        elif source.startswith(("http://", "https://")):
+            # Downloaded into memory and scaled to profile size in the thread pool, no temp file
+            photo = await prepare_profile_photo(source)
+            try:
+                await ctx.upload_cache.set_profile_photo(photo)
+            finally:
+                photo.close()
+        elif os.path.exists(source):
+            await ctx.upload_cache.set_profile_photo(source)
+        else:
+            await event.edit(f"فایل یافت نشد: `{source}`")
+            return
+        ctx.full_users.invalidate((await ctx.client.get_me(input_peer=True)).user_id)
+        await event.edit("✅ عکس پروفایل با موفقیت تنظیم شد!")
+    except PhotoCropSizeSmallError:
+        await event.edit("خطا: عکس خیلی کوچک است، لطفاً عکس بزرگتری را انتخاب کنید.")
+    except PhotoInvalidError:
+        await event.edit("خطا: این عکس/ویدیو برای پروفایل معتبر نیست.")
+    except WebpageCurlFailedError:
+        await event.edit("خطا در دانلود عکس از لینک. مطمئن شوید لینک معتبر است.")
+    except RemoteFileTooLarge as e:
+        await event.edit(f"خطا: فایل لینک بیش از حد بزرگ است: `{e}`")
+    except Exception as e:
+        logger.error(f"Error setting the profile photo: {e}")
+        await event.edit(f"خطا در تنظیم عکس پروفایل: `{e}`")
+
+
+@command('delpfp')
+async def delete_profile_photo(ctx, event, args):
+    """.delpfp [count | all | keep <k>]: deletes the newest photo by default."""
+    mode = args.strip().lower() or '1'
+    try:
+        if mode == 'all':
+            kwargs = {}
+        elif mode.startswith('keep') and mode.split()[-1].isdigit():
+            kwargs = {'keep': int(mode.split()[-1])}
+        elif mode.isdigit():
+            kwargs = {'count': int(mode)}
+        else:
+            await event.edit("استفاده: `.delpfp [تعداد | all | keep <k>]`")
+            return
+        await event.edit("در حال حذف عکس‌های پروفایل... 🗑️")
+        deleted = await delete_profile_photos(ctx.client, **kwargs)
+        ctx.full_users.invalidate((await ctx.client.get_me(input_peer=True)).user_id)
+        if deleted:
+            await event.edit(f"✅ `{deleted}` عکس پروفایل حذف شد.")
+        else:
+            await event.edit("عکس پروفایلی برای حذف وجود ندارد.")
+    except Exception as e:
+        logger.error(f"Error deleting profile photos: {e}")
+        await event.edit(f"خطا در حذف عکس پروفایل: `{e}`")
+
+
+async def _text_argument(event, args):
+    """The command's text: the argument, or the text of the replied message (None if that has none)."""
+    if event.is_reply:
+        replied = await event.get_reply_message()
+        return replied.text.strip() if replied and replied.text else None
+    return args.strip()
+
+
+@command('setname')
+async def set_name(ctx, event, args):
+    """.setname <name>, or as a reply to the new name: the first word becomes the first name."""
+    new_name = await _text_argument(event, args)
+    if not new_name:
+        await event.edit("اسم جدید را بنویسید یا روی متنی که اسم جدید است ریپلای کنید: `.setname [اسم]`")
+        return
+    first_name, _, last_name = new_name.partition(' ')
+    try:
+        await ctx.client(UpdateProfileRequest(first_name=first_name, last_name=last_name))
+        await event.edit(f"✅ اسم پروفایل به **{new_name}** تغییر کرد.")
+    except Exception as e:
+        logger.error(f"Error setting the name: {e}")
+        await event.edit(f"خطا در تنظیم اسم: `{e}`")
+
+
+@command('setbio')
+async def set_bio(ctx, event, args):
+    """.setbio [text], or as a reply; without text the bio is cleared."""
+    new_bio = await _text_argument(event, args)
+    if new_bio is None:
+        await event.edit("پیام ریپلای شده متنی برای بیو ندارد.")
+        return
+    try:
+        await ctx.client(UpdateProfileRequest(about=new_bio))
+        await event.edit(f"✅ بیو به **{new_bio or '(خالی)'}** تغییر کرد.")
+    except Exception as e:
+        logger.error(f"Error setting the bio: {e}")
+        await event.edit(f"خطا در تنظیم بیو: `{e}`")
+
+
+async def _toggle(ctx, event, args, key, label, usage):
+    mode = args.strip().lower()
+    if mode not in ('on', 'off'):
+        await event.edit(f"استفاده: `{usage}`")
+        return
+    ctx.settings.set(key, '1' if mode == 'on' else '0')
+    await event.edit(f"✅ {label}: **{'روشن' if mode == 'on' else 'خاموش'}**")
+
+
+@command('clock')
+async def toggle_clock_in_name(ctx, event, args):
+    await _toggle(ctx, event, args, 'clock_in_name', "ساعت در اسم", ".clock on | off")
+
+
+@command('bio')
+async def toggle_clock_in_bio(ctx, event, args):
+    """.bio on|off: the time in the bio; .bio text on|off: the custom text set with `.add bio` instead."""
+    words = args.split()
+    if words[:1] == ['text']:
+        await _toggle(ctx, event, " ".join(words[1:]), 'bio_auto_text', "متن خودکار بیو", ".bio text on | off")
+    else:
+        await _toggle(ctx, event, args, 'clock_in_bio', "ساعت در بیو", ".bio on | off")
+
+
+@command('add bio')
+async def add_auto_bio_text(ctx, event, args):
+    """.add bio | <text>: the text `.bio text on` puts in the bio."""
+    bio_text = args.partition('|')[2].strip()
+    if not bio_text:
+        await event.edit("استفاده: `.add bio | [متن بیو]`")
+        return
+    ctx.settings.set('custom_bio_text', bio_text)
+    await event.edit(f"✅ متن بیو خودکار: **{bio_text}**")
+
+
+async def _update_profile_loop(ctx):
+    """Applies the clock/auto-bio settings once a minute."""
+    with background():  # Clock updates yield to command replies
+        while True:
+            await asyncio.sleep(60)
+            flags = ctx.settings.get_many('clock_in_name', 'clock_in_bio', 'bio_auto_text', 'custom_bio_text')
+            if '1' not in (flags['clock_in_name'], flags['clock_in_bio'], flags['bio_auto_text']):
+                continue
+            me = await ctx.client.get_me()
+
+            if flags['clock_in_name'] == '1':
+                now = datetime.datetime.now().strftime("%H:%M")
+                new_first_name = f"{now} {me.first_name.split(' ', 1)[1] if ' ' in me.first_name else 'User'}"
+                if new_first_name != me.first_name:
+                    try:
+                        await ctx.client(UpdateProfileRequest(first_name=new_first_name, last_name=me.last_name))
+                    except MessageNotModifiedError:
+                        pass
+                    except Exception as e:
+                        logger.error(f"Error updating name with clock: {e}")
+
+            if flags['bio_auto_text'] == '1':
+                new_bio = flags['custom_bio_text']
+            elif flags['clock_in_bio'] == '1':
+                new_bio = f"Current Time: {datetime.datetime.now().strftime('%H:%M:%S')}"
+            else:
+                continue
+            # The bio is not part of the User object; the full profile is cached between runs
+            profile = await ctx.full_users.get(me)
+            if new_bio and new_bio != profile.full_user.about:
+                try:
+                    await ctx.client(UpdateProfileRequest(about=new_bio))
+                    ctx.full_users.invalidate(me.id)
+                except MessageNotModifiedError:
+                    pass
+                except Exception as e:
+                    logger.error(f"Error updating the bio: {e}")
+
+
+async def _get_profile_data(ctx, entity):
+    """(name, bio, downloaded photo path or None) of an entity, from one cached full-user request."""
+    profile = await ctx.full_users.get(entity)
+    user = profile.user
+    name = f"{user.first_name or ''} {user.last_name or ''}".strip()
+    bio = profile.full_user.about or ""
+    photo_path = None
+    if profile.full_user.profile_photo and not isinstance(profile.full_user.profile_photo, PhotoEmpty):
+        photo_path = await ctx.client.download_media(profile.full_user.profile_photo,
+                                                     file=f"profile_photo_backup_{entity.id}_{int(time.time())}.jpg")
+    return name, bio, photo_path
+
+
+async def _set_profile_data(ctx, name, bio, photo_path):
+    first_name, _, last_name = name.partition(' ')
+    await ctx.client(UpdateProfileRequest(first_name=first_name, last_name=last_name, about=bio))
+    ctx.full_users.invalidate((await ctx.client.get_me(input_peer=True)).user_id)
+    if photo_path and os.path.exists(photo_path):
+        # Delete existing profile photos first for a clean copy (one request per 100 photos)
+        await delete_profile_photos(ctx.client)
+        await ctx.client(UploadProfilePhotoRequest(file=await ctx.client.upload_file(photo_path)))
+        os.remove(photo_path)
+
+
+async def _backup_profile(ctx):
+    me = await ctx.client.get_me()
+    name, bio, photo_path = await _get_profile_data(ctx, me)
+    conn = ctx.settings.connect()
+    conn.execute('INSERT INTO shapeshifter_backup (user_id, name, bio, profile_photo_path) VALUES (?, ?, ?, ?)',
+                 (me.id, name, bio, photo_path))
+    conn.commit()
+    conn.close()
+    return me
+
+
+async def _restore_backup(ctx, user_id):
+    """Restores the latest backup; False if there is none or it could not be applied."""
+    conn = ctx.settings.connect()
+    backup = conn.execute('SELECT name, bio, profile_photo_path FROM shapeshifter_backup WHERE user_id = ? '
+                          'ORDER BY backup_time DESC LIMIT 1', (user_id,)).fetchone()
+    conn.close()
+    if not backup:
+        return False
+    try:
+        await _set_profile_data(ctx, *backup)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to restore profile from backup: {e}")
+        return False
+
+
+@command('shapeshifter')
+async def shapeshifter(ctx, event, args):
+    """.shapeshifter <user> [.s] (or as a reply): copies name, bio and photo; `.s` works silently."""
+    silent = args.lower().endswith('.s')
+    if silent:
+        args = args[:-2].strip()
+    target, _ = await resolve_target(ctx, event, args.strip())
+    if not isinstance(target, User):
+        await event.edit("کاربر مورد نظر را با ریپلای یا آیدی/یوزرنیم مشخص کنید.")
+        return
+    if silent:
+        await event.delete()
+    else:
+        await event.edit(f"🎭 در حال کپی پروفایل {_mention(target)}...")
+
+    me = await _backup_profile(ctx)
+    try:
+        await _set_profile_data(ctx, *await _get_profile_data(ctx, target))
+        if not silent:
+            await event.edit(f"✅ پروفایل {_mention(target)} کپی شد. بازگشت: `.shapeshifter backup`")
+    except Exception as e:
+        logger.exception("Shapeshifter failed:")
+        restored = await _restore_backup(ctx, me.id)
+        if not silent:
+            await event.edit(f"خطا در کپی پروفایل: `{e}`\n"
+                             + ("پروفایل قبلی بازگردانده شد." if restored else "بازگرداندن پروفایل قبلی ممکن نشد."))
+
+
+@command('shapeshifter.s')
+async def shapeshifter_silent(ctx, event, args):
+    await shapeshifter(ctx, event, args + " .s")
+
+
+@command('shapeshifter save')
+async def shapeshifter_save(ctx, event, args):
+    await _backup_profile(ctx)
+    await event.edit("✅ پروفایل فعلی به عنوان بکاپ ذخیره شد.")
+
+
+@command('shapeshifter backup')
+async def shapeshifter_backup(ctx, event, args):
+    me = await ctx.client.get_me(input_peer=True)
+    if await _restore_backup(ctx, me.user_id):
+        await event.edit("✅ پروفایل به آخرین بکاپ برگشت.")
+    else:
+        await event.edit("بکاپی برای بازگرداندن پیدا نشد.")
+
+
+def _mention(user):
+    return f"[{user.first_name or user.id}](tg://user?id={user.id})"
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Web search, dictionaries, weather, IMDB and translation.
+
+The third-party modules (requests, wikipedia, a translator) are LazyModules: importing this
+plugin costs nothing until a command actually needs one of them. The OpenWeatherMap and OMDb
+API keys come from the bot's config (ctx.config).
+"""
+import logging
+import re
+import urllib.parse
+
+from selfbot.lazy import LazyModule, LazyObject, is_available
+from selfbot.plugins import command
+
+logger = logging.getLogger(__name__)
+
+requests = LazyModule('requests')
+wikipedia = LazyModule('wikipedia', setup=lambda module: module.set_lang("fa"))  # ویکی‌پدیای فارسی
+
+
+def _create_translator():
+    """GoogleTranslator از google_trans_new یا در صورت نبود آن، deep_translator."""
+    if is_available('google_trans_new'):
+        from google_trans_new import google_translator
+        return google_translator()
+    from deep_translator import GoogleTranslator
+    logger.info("ماژول 'deep_translator' به عنوان جایگزین 'google_trans_new' استفاده می‌شود.")
+    return GoogleTranslator(source='auto', target='en') # پیش‌فرض به انگلیسی
+
+
+TRANSLATOR = LazyObject(_create_translator, lambda: is_available('google_trans_new') or is_available('deep_translator'), 'translator')
+
+
+@command('google')
+async def google_search_command(ctx, event, args):
+    """
+    .google <عبارت جستجو>: یک لینک جستجوی گوگل برای عبارت مورد نظر ایجاد می‌کند.
+    """
+    query = args.strip()
+    if not query:
+        await event.edit("لطفاً عبارتی برای جستجو وارد کنید.")
+        return
+
+    search_url = f"https://www.google.com/search?q={urllib.parse.quote(query)}"
+    try:
+        await event.edit(f"نتیجه جستجوی گوگل برای '{query}':\n[اینجا کلیک کنید]({search_url})")
+        logger.info(f"دستور .google با موفقیت اجرا شد برای: '{query}'")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .google: {e}")
+        await event.edit(f"خطا در ایجاد لینک جستجو: `{e}`")
+
+
+@command('ddg')
+async def duckduckgo_search_command(ctx, event, args):
+    """
+    .ddg <عبارت جستجو>: یک لینک جستجوی DuckDuckGo برای عبارت مورد نظر ایجاد می‌کند.
+    """
+    query = args.strip()
+    if not query:
+        await event.edit("لطفاً عبارتی برای جستجو وارد کنید.")
+        return
+
+    search_url = f"https://duckduckgo.com/?q={urllib.parse.quote(query)}"
+    try:
+        await event.edit(f"نتیجه جستجوی DuckDuckGo برای '{query}':\n[اینجا کلیک کنید]({search_url})")
+        logger.info(f"دستور .ddg با موفقیت اجرا شد برای: '{query}'")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .ddg: {e}")
+        await event.edit(f"خطا در ایجاد لینک جستجو: `{e}`")
+
+
+@command('wiki')
+async def wikipedia_command(ctx, event, args):
+    """
+    .wiki <عبارت جستجو>: خلاصه‌ای از ویکی‌پدیا را برای عبارت مورد نظر نمایش می‌دهد.
+    """
+    if not wikipedia:
+        await event.edit("ماژول 'wikipedia' نصب نیست. این دستور کار نمی‌کند. `pip install wikipedia`")
+        return
+
+    query = args.strip()
+    if not query:
+        await event.edit("لطفاً عبارتی برای جستجو در ویکی‌پدیا وارد کنید.")
+        return
+
+    try:
+        async with ctx.client.action(event.chat_id, 'typing'):
+            search_results = wikipedia.search(query, results=1)
+            if search_results:
+                page = wikipedia.page(search_results[0])
+                summary = wikipedia.summary(search_results[0], sentences=3) # 3 جمله اول
+                response_text = (
+                    f"**{page.title}**\n"
+                    f"`{summary}`\n"
+                    f"[ادامه مطلب]({page.url})"
+                )
+                await event.edit(response_text, parse_mode='md', link_preview=False)
+                logger.info(f"دستور .wiki با موفقیت اجرا شد برای: '{query}'")
+            else:
+                await event.edit(f"نتیجه‌ای برای '{query}' در ویکی‌پدیا یافت نشد.")
+    except wikipedia.exceptions.PageError:
+        logger.error(f"خطا: صفحه ویکی‌پدیا برای '{query}' یافت نشد.")
+        await event.edit(f"نتیجه‌ای برای '{query}' در ویکی‌پدیا یافت نشد.")
+    except wikipedia.exceptions.DisambiguationError as e:
+        logger.warning(f"خطا: ابهام‌زدایی برای '{query}'. گزینه‌ها: {e.options}")
+        await event.edit(f"ابهام برای '{query}'. لطفاً دقیق‌تر باشید. گزینه‌های احتمالی: {', '.join(e.options[:3])}...")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .wiki برای '{query}': {e}")
+        await event.edit(f"خطای ناشناخته در ویکی‌پدیا: `{e}`")
+
+
+@command('ud')
+async def urban_dictionary_command(ctx, event, args):
+    """
+    .ud <کلمه>: معنی یک کلمه را از Urban Dictionary جستجو می‌کند (نیاز به requests).
+    """
+    if not requests:
+        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
+        return
+
+    term = args.strip()
+    if not term:
+        await event.edit("لطفاً کلمه‌ای برای جستجو در Urban Dictionary وارد کنید.")
+        return
+
+    url = f"http://api.urbandictionary.com/v0/define?term={term}"
+    try:
+        async with ctx.client.action(event.chat_id, 'typing'): # نمایش وضعیت "در حال تایپ"
+            response = requests.get(url, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+
+            if data['list']:
+                definition = data['list'][0]['definition']
+                example = data['list'][0]['example']
+                await event.edit(
+                    f"**{term}**\n"
+                    f"**معنی:** `{definition}`\n"
+                    f"**مثال:** `{example}`"
+                )
+                logger.info(f"دستور .ud با موفقیت اجرا شد برای: '{term}'")
+            else:
+                await event.edit(f"معنایی برای '{term}' در Urban Dictionary یافت نشد.")
+    except requests.exceptions.Timeout:
+        logger.error(f"خطا: درخواست UD برای '{term}' به دلیل اتمام زمان انجام نشد.")
+        await event.edit("خطا: زمان درخواست Urban Dictionary به پایان رسید.")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"خطا در درخواست Urban Dictionary برای '{term}': {e}")
+        await event.edit(f"خطا در اتصال به Urban Dictionary: `{e}`")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .ud برای '{term}': {e}")
+        await event.edit(f"خطای ناشناخته در Urban Dictionary: `{e}`")
+
+
+@command('weather')
+async def weather_command(ctx, event, args):
+    """
+    .weather <شهر>: آب و هوای یک شهر را نمایش می‌دهد (نیاز به API Key از OpenWeatherMap و requests).
+    """
+    if not requests:
+        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
+        return
+
+    api_key = ctx.config['owm_api_key']
+    if api_key == 'YOUR_OPENWEATHERMAP_API_KEY_HERE' or not api_key:
+        await event.edit("خطا: API Key برای OpenWeatherMap تنظیم نشده است. لطفاً آن را در کد یا متغیر محیطی 'OWM_API_KEY' تنظیم کنید.")
+        return
+
+    city = args.strip()
+    if not city:
+        await event.edit("لطفاً نام شهری را برای آب و هوا وارد کنید.")
+        return
+
+    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric&lang=fa"
+    try:
+        async with ctx.client.action(event.chat_id, 'typing'):
+            response = requests.get(url, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+
+            if data['cod'] == 200:
+                main = data['main']
+                weather_desc = data['weather'][0]['description']
+                temp = main['temp']
+                feels_like = main['feels_like']
+                humidity = main['humidity']
+                wind_speed = data['wind']['speed']
+                city_name = data['name']
+                country = data['sys']['country']
+
+                weather_report = (
+                    f"**آب و هوای {city_name}, {country}:**\n"
+                    f"وضعیت: `{weather_desc.capitalize()}`\n"
+                    f"دما: `{temp}°C` (حس می‌شود: `{feels_like}°C`)\n"
+                    f"رطوبت: `{humidity}%`\n"
+                    f"سرعت باد: `{wind_speed} m/s`"
+                )
+                await event.edit(weather_report)
+                logger.info(f"دستور .weather با موفقیت اجرا شد برای: '{city}'")
+            else:
+                await event.edit(f"خطا در دریافت آب و هوا برای '{city}': {data.get('message', 'خطای ناشناخته')}")
+    except requests.exceptions.Timeout:
+        logger.error(f"خطا: درخواست آب و هوا برای '{city}' به دلیل اتمام زمان انجام نشد.")
+        await event.edit("خطا: زمان درخواست آب و هوا به پایان رسید.")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"خطا در درخواست آب و هوا برای '{city}': {e}")
+        await event.edit(f"خطا در اتصال به سرویس آب و هوا: `{e}`")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .weather برای '{city}': {e}")
+        await event.edit(f"خطای ناشناخته در آب و هوا: `{e}`")
+
+
+@command('translate')
+async def translate_command(ctx, event, args):
+    """
+    .translate <کد_زبان_مقصد> <متن>: متن را به زبان مقصد ترجمه می‌کند.
+    مثال: .translate en سلام چطوری -> "Hello, how are you?"
+    """
+    if not TRANSLATOR:
+        await event.edit("ماژول ترجمه (google_trans_new یا deep_translator) نصب نیست. این دستور کار نمی‌کند.")
+        return
+
+    parts = args.split(maxsplit=1)
+    if not parts or not re.fullmatch(r'\w{2}', parts[0]):
+        await event.edit("استفاده: `.translate <کد_زبان_مقصد> <متن>`")
+        return
+    target_lang = parts[0].lower()
+    text_to_translate = parts[1] if len(parts) > 1 else ""
+
+    if not text_to_translate:
+        await event.edit("لطفاً متنی برای ترجمه وارد کنید.")
+        return
+
+    try:
+        async with ctx.client.action(event.chat_id, 'typing'):
+            # اگر از google_trans_new استفاده می‌کنید
+            if hasattr(TRANSLATOR, 'translate'):
+                translated_text = TRANSLATOR.translate(text_to_translate, lang_tgt=target_lang)
+            # اگر از deep_translator.GoogleTranslator استفاده می‌کنید
+            elif hasattr(TRANSLATOR, 'translate_text'):
+                TRANSLATOR.target = target_lang # تغییر زبان مقصد
+                translated_text = TRANSLATOR.translate_text(text_to_translate)
+            else:
+                translated_text = None # نباید اتفاق بیفتد
+
+            if translated_text:
+                await event.edit(f"**ترجمه به {target_lang.upper()}:**\n`{translated_text}`")
+                logger.info(f"دستور .translate با موفقیت اجرا شد به {target_lang} برای: '{text_to_translate}'")
+            else:
+                await event.edit("خطا در ترجمه متن. پاسخ نامعتبر از سرور یا سرویس ترجمه.")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .translate برای '{text_to_translate}': {e}")
+        await event.edit(f"خطای ناشناخته در ترجمه: `{e}`")
+
+
+@command('imdb')
+async def imdb_search_command(ctx, event, args):
+    """
+    .imdb <عنوان فیلم/سریال>: اطلاعات یک فیلم یا سریال را از IMDB نمایش می‌دهد.
+    نیاز به API Key از OMDb API دارد.
+    """
+    if not requests:
+        await event.edit("ماژول 'requests' نصب نیست. این دستور کار نمی‌کند. `pip install requests`")
+        return
+    api_key = ctx.config['omdb_api_key']
+    if api_key == 'YOUR_OMDB_API_KEY_HERE' or not api_key:
+        await event.edit("خطا: API Key برای OMDb API تنظیم نشده است. لطفاً آن را در کد یا متغیر محیطی 'OMDB_API_KEY' تنظیم کنید.")
+        return
+
+    title = args.strip()
+    if not title:
+        await event.edit("لطفاً عنوان فیلم یا سریال را وارد کنید.")
+        return
+
+    url = f"http://www.omdbapi.com/?t={urllib.parse.quote(title)}&apikey={api_key}"
+    try:
+        await event.edit(f"در حال جستجوی `{title}` در IMDB... 🎬")
+        response = requests.get(url, timeout=7)
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get('Response') == 'True':
+            poster_url = data.get('Poster')
+            
+            # تهیه متن اطلاعات
+            info_lines = [
+                f"**عنوان:** `{data.get('Title')}`",
+                f"**سال:** `{data.get('Year')}`",
+                f"**ژانر:** `{data.get('Genre')}`",
+                f"**کارگردان:** `{data.get('Director')}`",
+                f"**بازیگران:** `{data.get('Actors')}`",
+                f"**امتیاز IMDB:** `{data.get('imdbRating')}/10` ({data.get('imdbVotes')} رأی)",
+                f"**خلاصه داستان:** `{data.get('Plot')}`",
+                f"**لینک IMDB:** [imdb.com/title/{data.get('imdbID')}/](https://www.imdb.com/title/{data.get('imdbID')}/)"
+            ]
+            info_text = "\n".join(info_lines)
+
+            # اگر پوستر موجود است، آن را ارسال می‌کنیم
+            if poster_url and poster_url != "N/A":
+                await ctx.client.send_file(event.chat_id, poster_url, caption=info_text, parse_mode='md')
+                await event.delete() # پاک کردن دستور اصلی
+            else:
+                await event.edit(info_text, parse_mode='md', link_preview=False)
+
+            logger.info(f"دستور .imdb با موفقیت اجرا شد برای: '{title}'")
+        else:
+            await event.edit(f"فیلم یا سریال `{title}` در IMDB یافت نشد. {data.get('Error', '')}")
+    except requests.exceptions.Timeout:
+        logger.error(f"خطا: درخواست IMDB برای '{title}' به دلیل اتمام زمان انجام نشد.")
+        await event.edit("خطا: زمان درخواست IMDB به پایان رسید.")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"خطا در درخواست IMDB برای '{title}': {e}")
+        await event.edit(f"خطا در اتصال به سرویس IMDB: `{e}`")
+    except Exception as e:
+        logger.error(f"خطا در اجرای دستور .imdb برای '{title}': {e}")
+        await event.edit(f"خطای ناشناخته در IMDB: `{e}`")
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Sending a message or file several times, here or to another chat, optionally deleting it again.
+
+Every command takes a count and a text, or a reply to the message/file to repeat. The pause
+between sends is the `spam_speed` setting (`.سرعت`). Sends go through the outbound scheduler
+like everything else; a FloodWait that is too long to absorb stops the run.
+"""
+import asyncio
+import logging
+
+from telethon.errors import FloodWaitError, MessageIdInvalidError
+
+from selfbot.plugins import command, resolve_target
+
+logger = logging.getLogger(__name__)
+
+
+def setup(ctx):
+    ctx.settings.create(defaults={'spam_speed': '0.5'})
+
+
+def status(ctx):
+    return [f"⚡ Spam Speed (seconds): <b>{ctx.settings.get('spam_speed', '0.5')}</b>"]
+
+
+async def send_message_or_file(ctx, peer, message=None, file=None, count=1, delete_after_send=False, add_counter=False):
+    """Sends `message` and/or `file` `count` times, `spam_speed` seconds apart. Returns the sent messages."""
+    delay = float(ctx.settings.get('spam_speed', '0.5'))
+    sent_messages = []
+    for i in range(count):
+        text_to_send = f"{message or ''} ({i + 1})" if add_counter else message
+        try:
+            if file:
+                msg_obj = await ctx.client.send_file(peer, file, caption=text_to_send)
+            elif text_to_send:
+                msg_obj = await ctx.client.send_message(peer, text_to_send)
+            else:
+                continue  # Nothing to send
+            sent_messages.append(msg_obj)
+            if delete_after_send:
+                await _safe_delete(ctx, msg_obj)
+            await asyncio.sleep(delay)
+        except FloodWaitError as e:
+            logger.warning(f"Flood wait during send_message_or_file: {e.seconds}s is too long, stopping.")
+            break
+        except Exception as e:
+            logger.error(f"Error sending message in loop: {e}")
+            break
+    return sent_messages
+
+
+async def _safe_delete(ctx, message):
+    try:
+        await ctx.client.delete_messages(message.peer_id, message.id)
+    except MessageIdInvalidError:
+        logger.warning("Attempted to delete a message that no longer exists or is invalid.")
+    except Exception as e:
+        logger.warning(f"Failed to delete message: {e}")
+
+
+async def _reply(ctx, event, text):
+    await ctx.client.send_message(event.chat_id, text, reply_to=event.id)
+
+
+def _local_args(args, reply_message):
+    """(count, text) from `[count] [text]`; the text defaults to the replied message's."""
+    parts = args.split(maxsplit=1)
+    fallback = reply_message.text if reply_message else None
+    if parts and parts[0].isdigit():
+        return int(parts[0]), parts[1] if len(parts) > 1 else fallback
+    return 1, args or fallback
+
+
+async def _remote_args(ctx, event, args, reply_message, name):
+    """(target id, target text, count, text) from `<chat> <count> [text]`, or None after reporting the problem."""
+    parts = args.split(maxsplit=2)
+    if len(parts) < 2:
+        await _reply(ctx, event, f"❌ Usage: `.{name} [group_id/username] [count] [text]` or reply: `.{name} [group_id/username] [count]`")
+        return None
+    target_chat_str = parts[0]
+    try:
+        count = int(parts[1])
+    except ValueError:
+        await _reply(ctx, event, f"❌ Invalid count. Usage: `.{name} [group_id/username] [count] [text]`")
+        return None
+    message_text = parts[2] if len(parts) > 2 else (reply_message.text if reply_message else None)
+
+    _, target_id = await resolve_target(ctx, event, target_chat_str, peer_only=True)
+    if not target_id:
+        await _reply(ctx, event, f"❌ Could not find target group/channel '{target_chat_str}'.")
+        return None
+    if not message_text and not reply_message:
+        await _reply(ctx, event, "❌ Please provide text or reply to a message/file to send.")
+        return None
+    return target_id, target_chat_str, count, message_text
+
+
+@command('send', 'spam', 'اسپم')
+async def send_spam_command(ctx, event, args):
+    """Sends a message or file multiple times."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    if not reply_message and not args.strip():
+        await _reply(ctx, event, "❌ Usage: `.send [count] [text]` or reply to a message/file.")
+        return
+    count, text_to_send = _local_args(args, reply_message)
+    file_to_send = reply_message.media if reply_message else None
+    if not text_to_send and not file_to_send:
+        await _reply(ctx, event, "❌ Please provide text or reply to a message/file to send.")
+        return
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages...")
+    await send_message_or_file(ctx, event.chat_id, message=text_to_send, file=file_to_send, count=count)
+
+
+@command('psend')
+async def psend_command(ctx, event, args):
+    """Sends numbered messages."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    if not reply_message and not args.strip():
+        await _reply(ctx, event, "❌ Usage: `.psend [count] [text]` or reply to a message.")
+        return
+    count, base_text = _local_args(args, reply_message)
+    if not base_text:
+        await _reply(ctx, event, "❌ Please provide text or reply to a message to send.")
+        return
+
+    await _reply(ctx, event, f"🔄 Sending {count} numbered messages...")
+    await send_message_or_file(ctx, event.chat_id, message=base_text, count=count, add_counter=True)
+
+
+@command('gsend')
+async def gsend_command(ctx, event, args):
+    """Sends a message or file to another group/chat."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    parsed = await _remote_args(ctx, event, args, reply_message, 'gsend')
+    if parsed is None:
+        return
+    target_id, target_chat_str, count, message_text = parsed
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages to {target_chat_str}...")
+    await send_message_or_file(ctx, target_id, message=message_text,
+                               file=reply_message.media if reply_message else None, count=count)
+
+
+@command('dgsend')
+async def dgsend_command(ctx, event, args):
+    """Sends a message to another group and deletes each message immediately after sending."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    parsed = await _remote_args(ctx, event, args, reply_message, 'dgsend')
+    if parsed is None:
+        return
+    target_id, target_chat_str, count, message_text = parsed
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages to {target_chat_str} and deleting immediately...")
+    await send_message_or_file(ctx, target_id, message=message_text,
+                               file=reply_message.media if reply_message else None, count=count, delete_after_send=True)
+
+
+@command('dgsend2')
+async def dgsend2_command(ctx, event, args):
+    """Sends multiple messages to another group and deletes them all after all messages are sent."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    parsed = await _remote_args(ctx, event, args, reply_message, 'dgsend2')
+    if parsed is None:
+        return
+    target_id, target_chat_str, count, message_text = parsed
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages to {target_chat_str} and collecting for bulk deletion...")
+    sent_msgs = await send_message_or_file(ctx, target_id, message=message_text,
+                                           file=reply_message.media if reply_message else None, count=count)
+    if not sent_msgs:
+        await _reply(ctx, event, "ℹ️ No messages were successfully sent for bulk deletion.")
+        return
+    try:
+        await ctx.client.delete_messages(target_id, [m.id for m in sent_msgs])
+        await _reply(ctx, event, f"✅ All {len(sent_msgs)} messages sent to {target_chat_str} have been deleted.")
+    except Exception as e:
+        await _reply(ctx, event, f"❌ Failed to delete all messages from {target_chat_str}: {e}")
+
+
+@command('dsend')
+async def dsend_command(ctx, event, args):
+    """Sends a text message to the current chat and deletes each message immediately after sending."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    if not reply_message and not args.strip():
+        await _reply(ctx, event, "❌ Usage: `.dsend [count] [text]` or reply to a message.")
+        return
+    count, text_to_send = _local_args(args, reply_message)
+    if not text_to_send:
+        await _reply(ctx, event, "❌ Please provide text or reply to a message to send.")
+        return
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages and deleting immediately...")
+    await send_message_or_file(ctx, event.chat_id, message=text_to_send, count=count, delete_after_send=True)
+
+
+@command('dsend2')
+async def dsend2_command(ctx, event, args):
+    """Sends a file or text message to the current chat and deletes each message immediately after sending."""
+    await event.delete()
+    reply_message = await event.get_reply_message()
+    if not reply_message and not args.strip():
+        await _reply(ctx, event, "❌ Usage: `.dsend2 [count] [text]` or reply to a message/file.")
+        return
+    count, text_to_send = _local_args(args, reply_message)
+    file_to_send = reply_message.media if reply_message else None
+    if not text_to_send and not file_to_send:
+        await _reply(ctx, event, "❌ Please provide text or reply to a message/file to send.")
+        return
+
+    await _reply(ctx, event, f"🔄 Sending {count} messages/files and deleting immediately...")
+    await send_message_or_file(ctx, event.chat_id, message=text_to_send, file=file_to_send, count=count, delete_after_send=True)
+
+
+@command('سرعت')
+async def set_spam_speed(ctx, event, args):
+    """Sets the delay between messages for spam commands."""
+    try:
+        speed = float(args.strip())
+        if speed < 0:
+            raise ValueError("Speed cannot be negative.")
+    except ValueError:
+        await event.edit("❌ Usage: `.سرعت [عدد (ثانیه)]` (e.g., `.سرعت 0.5`)", parse_mode='html')
+        return
+    ctx.settings.set('spam_speed', str(speed))
+    await event.edit(f"✅ Spam speed set to <b>{speed}</b> seconds.", parse_mode='html')
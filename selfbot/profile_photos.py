@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk profile photo operations.
+
+Photo lists are read in pages of 100 (the photos.getUserPhotos limit). Deletions go out as
+one photos.deletePhotos request per 100 photos, and photo histories are sent as albums of
+up to 10, so a large history costs a handful of round trips instead of one per photo.
+"""
+import inspect
+import logging
+
+from telethon.tl.functions.photos import DeletePhotosRequest
+
+logger = logging.getLogger(__name__)
+
+PHOTOS_PAGE_SIZE = 100
+DELETE_BATCH_SIZE = 100
+ALBUM_SIZE = 10   # Telegram's limit for one grouped media message
+
+
+async def delete_profile_photos(client, count=None, keep=0):
+    """
+    Deletes our own profile photos, newest first: all of them, only the newest `count`, or
+    all but the newest `keep`. Returns the number deleted.
+    """
+    photos = []
+    seen = 0
+    async for photo in client.iter_profile_photos('me', limit=None if count is None else keep + count):
+        if seen >= keep:
+            photos.append(photo)
+        seen += 1
+    deleted = 0
+    for start in range(0, len(photos), DELETE_BATCH_SIZE):
+        batch = photos[start:start + DELETE_BATCH_SIZE]
+        result = await client(DeletePhotosRequest(id=batch))
+        deleted += len(result)
+    return deleted
+
+
+async def send_photo_history(client, chat, user, caption=None, on_album=None):
+    """
+    Sends all profile photos of `user` to `chat`, newest first, as albums of up to ten. The
+    caption goes on the first album. on_album(sent_so_far) is called after each album and may
+    return an awaitable. Returns the number of photos sent.
+    """
+    album = []
+    sent = 0
+    async for photo in client.iter_profile_photos(user):
+        album.append(photo)
+        if len(album) == ALBUM_SIZE:
+            sent += await _send_album(client, chat, album, caption if not sent else None)
+            album = []
+            await _notify(on_album, sent)
+    if album:
+        sent += await _send_album(client, chat, album, caption if not sent else None)
+        await _notify(on_album, sent)
+    return sent
+
+
+async def _send_album(client, chat, photos, caption):
+    await client.send_file(chat, photos, caption=caption)
+    return len(photos)
+
+
+async def _notify(callback, *args):
+    if callback:
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
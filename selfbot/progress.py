@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Rate-limited progress messages for long-running commands.
+
+A ProgressReporter is passed straight to Telethon as progress_callback (or called by hand
+with counts). It edits its status message at most once per `interval` seconds, and only when
+the shown percentage (or, without a total, the count) has changed. That avoids the flood
+waits and MessageNotModified errors of editing on every chunk. Edits run in the background
+so the transfer itself never waits for one, and finish() replaces the last pending edit
+with the final text exactly once.
+"""
+import asyncio
+import logging
+import time
+
+from telethon.errors.rpcerrorlist import MessageIdInvalidError, MessageNotModifiedError
+
+from selfbot.outbound import background
+
+logger = logging.getLogger(__name__)
+
+BAR_WIDTH = 12
+
+
+def human_size(num):
+    """1536 -> '1.5 KB'."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(num) < 1024:
+            return f"{num:.1f} {unit}" if unit != 'B' else f"{num:.0f} B"
+        num /= 1024
+    return f"{num:.1f} TB"
+
+
+def human_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+class ProgressReporter:
+    """Edits `message` with a progress bar, speed and ETA, throttled to one edit per `interval`."""
+
+    def __init__(self, message, title, total=None, unit='bytes', interval=2.0):
+        self.message = message
+        self.title = title
+        self.total = total
+        self.unit = unit                # 'bytes' for transfers, anything else is used as the count label
+        self.interval = interval
+        self.current = 0
+        self.stage = None               # Extra line shown under the title
+        self._steps = False
+        self.started = time.monotonic()
+        self._last_edit = 0.0
+        self._last_shown = None
+        self._pending = None
+        self._finished = False
+
+    def __call__(self, current, total=None):
+        """Telethon progress_callback signature; also usable for plain counts."""
+        if self._finished:
+            return
+        self.current = current
+        if total:
+            self.total = total
+        shown = self._shown_value()
+        now = time.monotonic()
+        if shown == self._last_shown or now - self._last_edit < self.interval:
+            return
+        if self._pending is not None and not self._pending.done():
+            return  # The previous edit is still on its way; the next call will catch up
+        self._last_edit = now
+        self._last_shown = shown
+        self._pending = asyncio.ensure_future(self._edit(self.render()))
+
+    def set_stage(self, stage, step=None, steps=None):
+        """For multi-step work without byte counts: shows `stage` and, if given, step/steps."""
+        self.stage = stage
+        self._steps = True              # Speed and ETA mean nothing for steps
+        self._last_shown = None
+        self(step if step is not None else self.current, steps)
+
+    async def finish(self, text=None, **edit_kwargs):
+        """
+        Replaces the progress with `text` (or just stops updating when None, e.g. before the
+        message is deleted). Only the first call has any effect.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        if self._pending is not None and not self._pending.done():
+            self._pending.cancel()
+        if text is not None:
+            await self._edit(text, **edit_kwargs)
+
+    def render(self):
+        lines = [self.title]
+        if self.stage:
+            lines.append(self.stage)
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        speed = self.current / elapsed
+        fmt = human_size if self.unit == 'bytes' else (lambda n: f"{n:,}")
+        if self.total:
+            fraction = min(self.current / self.total, 1.0)
+            filled = int(fraction * BAR_WIDTH)
+            lines.append(f"[{'█' * filled}{'░' * (BAR_WIDTH - filled)}] {fraction * 100:.0f}%")
+            counts = f"{fmt(self.current)} / {fmt(self.total)}"
+        else:
+            counts = fmt(self.current)
+        if self.unit != 'bytes':
+            counts += f" {self.unit}"
+        details = [counts]
+        if self.current and not self._steps:
+            details.append(f"{human_size(speed)}/s" if self.unit == 'bytes' else f"{speed:.1f}/s")
+            if self.total and self.current < self.total:
+                details.append(f"ETA {human_duration((self.total - self.current) / speed)}")
+        details.append(human_duration(elapsed))
+        lines.append(" • ".join(details))
+        return "\n".join(lines)
+
+    # --- internals ---
+
+    def _shown_value(self):
+        if self.total:
+            return int(self.current * 100 / self.total)
+        return self.current
+
+    async def _edit(self, text, **edit_kwargs):
+        try:
+            with background():
+                await self.message.edit(text, **edit_kwargs)
+        except MessageNotModifiedError:
+            pass
+        except MessageIdInvalidError:
+            logger.info("Progress message was deleted; ignoring further updates.")
+            self._finished = True
+        except Exception as e:
+            logger.warning(f"Progress edit failed: {e}")
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+In-process reload of the bot script.
+
+Restarting with os.execv drops the MTProto connection, the update state, every cache and all
+in-flight tasks, and the reconnect costs seconds plus a burst of catch-up updates.
+reload_script() re-executes the script's source in its own module namespace instead. The
+live client and the services built around it survive because the script creates them through
+keep(), which only calls the factory on the first run. Handlers whose code belongs to the
+script are unregistered first, and the new definitions register themselves again as the
+source runs. State globals listed in `preserve` are carried over. The new source is compiled
+before anything is touched, and a failure while running it restores the previous namespace
+and handlers, so a broken edit never leaves the bot without commands. The selfbot package
+itself is not reloaded; core changes still need a full restart.
+"""
+import logging
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+ReloadResult = namedtuple('ReloadResult', 'removed added seconds')
+
+_kept = {}
+_reloading = False
+
+
+def keep(name, factory):
+    """The object kept under `name`; factory() creates it on the first run only."""
+    if name not in _kept:
+        _kept[name] = factory()
+    return _kept[name]
+
+
+def is_reloading():
+    """True while reload_script() is running the script's source again."""
+    return _reloading
+
+
+def reload_script(namespace, client, preserve=()):
+    """
+    Re-executes the script whose globals are `namespace` (normally globals()) in place, keeping
+    the values of the global names in `preserve`. Returns a ReloadResult; on error the old code
+    stays active and the exception is raised.
+    """
+    global _reloading
+    started = time.perf_counter()
+    path = namespace['__file__']
+    with open(path, 'r', encoding='utf-8') as f:
+        code = compile(f.read(), path, 'exec')
+
+    old_handlers = _owned_handlers(client, namespace)
+    snapshot = dict(namespace)
+    for callback, event in old_handlers:
+        client.remove_event_handler(callback, type(event))
+
+    _reloading = True
+    try:
+        exec(code, namespace)
+    except BaseException:
+        for callback, event in _owned_handlers(client, namespace):
+            client.remove_event_handler(callback, type(event))
+        namespace.clear()
+        namespace.update(snapshot)
+        for callback, event in old_handlers:
+            client.add_event_handler(callback, event)
+        raise
+    finally:
+        _reloading = False
+
+    for name in preserve:
+        if name in snapshot:
+            namespace[name] = snapshot[name]
+    result = ReloadResult(len(old_handlers), len(_owned_handlers(client, namespace)), time.perf_counter() - started)
+    logger.info(f"Reloaded {path}: {result.removed} handlers replaced by {result.added} in {result.seconds * 1000:.0f} ms")
+    return result
+
+
+def _owned_handlers(client, namespace):
+    """The (callback, event) registrations whose callback was defined in `namespace`."""
+    owned = []
+    for callback, event in client.list_event_handlers():
+        func = getattr(callback, '__func__', callback)
+        if getattr(func, '__globals__', None) is namespace:
+            owned.append((callback, event))
+    return owned
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Fetching images from URLs for upload without touching the disk.
+
+The response body is streamed into a SpooledTemporaryFile. It stays in memory below
+`spool_threshold` and is only backed by an anonymous temporary file above it, so concurrent
+calls never share a path. aiohttp streams on the event loop when it is installed; otherwise
+the blocking requests download runs in the thread pool. Profile photos are then scaled down
+to what Telegram keeps (640 px on the short side) and re-encoded as JPEG in the thread pool
+with Pillow, if available, so oversized images are not uploaded in full.
+"""
+import asyncio
+import io
+import logging
+import tempfile
+
+from selfbot.lazy import LazyModule
+
+# Imported on first use, so that loading this module does not pull in the HTTP and imaging stacks.
+aiohttp = LazyModule('aiohttp')
+requests = LazyModule('requests')
+Image = LazyModule('PIL.Image')
+ImageOps = LazyModule('PIL.ImageOps')
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_THRESHOLD = 4 * 1024 * 1024
+MAX_DOWNLOAD_SIZE = 50 * 1024 * 1024
+PROFILE_PHOTO_SIZE = 640     # Largest profile photo size Telegram serves (the 'c' size)
+JPEG_QUALITY = 90
+
+
+class RemoteFileTooLarge(ValueError):
+    pass
+
+
+async def fetch_to_buffer(url, max_size=MAX_DOWNLOAD_SIZE, spool_threshold=SPOOL_THRESHOLD, timeout=30):
+    """Downloads `url` into a rewound SpooledTemporaryFile, failing once `max_size` is exceeded."""
+    buffer = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+    try:
+        if aiohttp:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        _append(buffer, chunk, max_size)
+        elif requests:
+            await asyncio.get_running_loop().run_in_executor(None, _fetch_blocking, url, buffer, max_size, timeout)
+        else:
+            raise RuntimeError("Neither aiohttp nor requests is installed")
+    except BaseException:
+        buffer.close()
+        raise
+    buffer.seek(0)
+    return buffer
+
+
+async def prepare_profile_photo(url):
+    """
+    Downloads an image for use as a profile photo and returns a rewound file object ready for
+    client.upload_file. Without Pillow the original bytes are returned unchanged.
+    """
+    buffer = await fetch_to_buffer(url)
+    if not Image:
+        return buffer
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, fit_profile_photo, buffer)
+    finally:
+        buffer.close()
+
+
+def fit_profile_photo(source, size=PROFILE_PHOTO_SIZE):
+    """Scales an image so its short side is at most `size` and re-encodes it as JPEG (blocking)."""
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        short_side = min(image.size)
+        if short_side > size:
+            scale = size / short_side
+            image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    out.seek(0)
+    return out
+
+
+def _fetch_blocking(url, buffer, max_size, timeout):
+    with requests.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            _append(buffer, chunk, max_size)
+
+
+def _append(buffer, chunk, max_size):
+    buffer.write(chunk)
+    if buffer.tell() > max_size:
+        raise RemoteFileTooLarge(f"Remote file is larger than {max_size // (1024 * 1024)} MB")
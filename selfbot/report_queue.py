@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Coalescing outbound queue for edit/delete reports.
+
+Events are grouped per (report target, source chat) for a short window and sent as one
+digest message, split at Telegram's message length limit. Digests leave at a configured
+rate; when the backlog grows past its bound, queued digests collapse into a single
+summary instead of piling up.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+def split_digest(header, items, limit=TELEGRAM_MESSAGE_LIMIT, separator='\n\n'):
+    """Joins items under a header into as few messages as possible, never splitting an item."""
+    chunks = []
+    current = header
+    for item in items:
+        if len(item) + len(separator) > limit - len(header):
+            item = item[:limit - len(header) - 10] + ' …'
+        if len(current) + len(item) + len(separator) > limit:
+            chunks.append(current)
+            current = header
+        current += separator + item
+    if current != header or not chunks:
+        chunks.append(current)
+    return chunks
+
+
+class _PendingDigest:
+    __slots__ = ('title', 'items', 'counts', 'overflow', 'deadline')
+
+    def __init__(self, title, deadline):
+        self.title = title
+        self.items = []
+        self.counts = {}
+        self.overflow = 0
+        self.deadline = deadline
+
+
+class ReportQueue:
+    """Batches report items per chat and delivers them at a bounded rate."""
+
+    KIND_LABELS = {'edit': '✏️ edits', 'delete': '🗑️ deletions'}
+
+    def __init__(self, send, window=3.0, per_minute=20, max_items_per_digest=40, max_backlog=20):
+        self._send = send                      # async callable(target, text)
+        self.window = window
+        self.per_minute = per_minute
+        self.max_items_per_digest = max_items_per_digest
+        self.max_backlog = max_backlog
+        self._pending = OrderedDict()          # (target, chat_id) -> _PendingDigest
+        self._outbox = deque()                 # (target, text, event_count)
+        self._dropped_events = {}              # target -> events folded into a summary
+        self._next_send_at = 0.0
+        self._wakeup = None
+        self._task = None
+
+    def configure(self, window=None, per_minute=None):
+        if window is not None:
+            self.window = max(0.0, window)
+        if per_minute is not None:
+            self.per_minute = max(1, per_minute)
+
+    def add(self, target, chat_id, title, kind, item):
+        """Queues one report item; must be called from within the running event loop."""
+        key = (target, chat_id)
+        digest = self._pending.get(key)
+        if digest is None:
+            digest = self._pending[key] = _PendingDigest(title, time.monotonic() + self.window)
+        digest.counts[kind] = digest.counts.get(kind, 0) + 1
+        if len(digest.items) < self.max_items_per_digest:
+            digest.items.append(item)
+        else:
+            digest.overflow += 1
+        self._ensure_worker()
+
+    def backlog(self):
+        """Number of digest messages waiting for delivery."""
+        return len(self._outbox)
+
+    # --- internals ---
+
+    def _ensure_worker(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    def _summary_line(self, counts):
+        return ', '.join(f"{n} {self.KIND_LABELS.get(kind, kind)}" for kind, n in counts.items())
+
+    def _render(self, digest):
+        total = sum(digest.counts.values())
+        header = f"📋 <b>{total} event(s)</b> in {digest.title} — {self._summary_line(digest.counts)}"
+        if len(self._outbox) >= self.max_backlog // 2:
+            # Already behind: send the counts only, the details would just deepen the backlog.
+            return [header + "\n<i>(details skipped: report queue is busy)</i>"]
+        items = list(digest.items)
+        if digest.overflow:
+            items.append(f"<i>… and {digest.overflow} more event(s) not shown.</i>")
+        return split_digest(header, items)
+
+    def _flush_due(self, now, force=False):
+        for key in [k for k, d in self._pending.items() if force or d.deadline <= now]:
+            digest = self._pending.pop(key)
+            target = key[0]
+            total = sum(digest.counts.values())
+            for text in self._render(digest):
+                self._outbox.append((target, text, total))
+                total = 0  # Count a digest's events once, on its first chunk.
+        while len(self._outbox) > self.max_backlog:
+            target, _, events = self._outbox.popleft()
+            self._dropped_events[target] = self._dropped_events.get(target, 0) + events
+
+    async def _run(self):
+        while self._pending or self._outbox or self._dropped_events:
+            now = time.monotonic()
+            self._flush_due(now)
+
+            if self._dropped_events and now >= self._next_send_at:
+                target, dropped = self._dropped_events.popitem()
+                await self._deliver(target, f"⚠️ <b>Report backlog overflow:</b> {dropped} event(s) were summarized "
+                                            f"instead of reported individually.")
+                continue
+            if self._outbox and now >= self._next_send_at:
+                target, text, _ = self._outbox.popleft()
+                await self._deliver(target, text)
+                continue
+
+            deadlines = [d.deadline for d in self._pending.values()]
+            if self._outbox or self._dropped_events:
+                deadlines.append(self._next_send_at)
+            delay = max(0.0, min(deadlines) - now) if deadlines else 0.0
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, target, text):
+        self._next_send_at = time.monotonic() + 60.0 / self.per_minute
+        try:
+            await self._send(target, text)
+        except Exception as e:
+            logger.error(f"Failed to deliver report digest to {target}: {e}")
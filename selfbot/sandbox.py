@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Running owner-supplied Python snippets without stalling the bot.
+
+`.exec` used to call exec() on the event loop, so a slow snippet froze every handler until it
+returned. run_code() runs each snippet in a fresh interpreter process instead. Before running
+the snippet, the child lowers its own CPU-time and address-space limits (RLIMIT_CPU, RLIMIT_AS;
+skipped where the resource module is missing). The parent reads stdout and stderr as they
+arrive and stops once `max_output` bytes have been read. The child runs in its own process
+group, and the whole group is killed when the wall-clock timeout expires, so an infinite loop,
+a sleep, a flood of output or a process the snippet started all end within the timeout.
+As in the interactive interpreter, a trailing expression's value is printed.
+
+run_async_snippet() is for `.aexec`: code that needs the live client runs in the bot process
+as a top-level-await coroutine. It must therefore be awaited (or wrapped in a task) and can be
+cancelled, but blocking synchronous code inside it still blocks the loop.
+"""
+import ast
+import asyncio
+import contextlib
+import inspect
+import io
+import logging
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# returncode: the child's exit status (negative: killed by that signal), output is bytes decoded as UTF-8
+SandboxResult = namedtuple('SandboxResult', 'stdout stderr returncode timed_out truncated seconds')
+
+# Runs inside the child: apply the limits, then exec stdin's code as __main__ and echo a trailing expression.
+_CHILD = r'''
+import ast, sys
+cpu, memory = int(sys.argv[1]), int(sys.argv[2])
+try:
+    import resource
+    if cpu:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if memory:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+except (ImportError, ValueError, OSError):
+    pass
+source = sys.stdin.read()
+tree = ast.parse(source, '<exec>')
+tail = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+namespace = {'__name__': '__main__', '__builtins__': __builtins__}
+exec(compile(tree, '<exec>', 'exec'), namespace)
+if tail is not None:
+    value = eval(compile(ast.Expression(tail.value), '<exec>', 'eval'), namespace)
+    if value is not None:
+        print(repr(value))
+'''
+
+
+def strip_code_fence(text):
+    """Removes a surrounding ```python ... ``` block, as Telegram users usually paste code in one."""
+    text = text.strip()
+    if text.startswith('```') and text.endswith('```') and len(text) >= 6:
+        text = text[3:-3]
+        first, _, rest = text.partition('\n')
+        if rest and first.strip().isidentifier():
+            text = rest   # drop the language tag
+    return text.strip('\n')
+
+
+async def run_code(code, timeout=10, cpu_seconds=5, memory_mb=256, max_output=1 << 20):
+    """Runs `code` in a separate, limited interpreter and returns a SandboxResult."""
+    started = time.perf_counter()
+    # Own session (and process group), so processes the snippet starts are killed along with it
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-c', _CHILD, str(cpu_seconds), str(memory_mb * 1024 * 1024),
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        start_new_session=True)
+    captured = {process.stdout: [], process.stderr: []}
+    budget = [max_output]
+    truncated = False
+
+    async def feed():
+        try:
+            process.stdin.write(code.encode('utf-8'))
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            process.stdin.close()
+
+    async def read(stream, drain=False):
+        # Keeps up to the shared budget; stops there unless draining after a kill
+        nonlocal truncated
+        while drain or budget[0] > 0:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            captured[stream].append(chunk[:budget[0]])
+            truncated = truncated or len(chunk) > budget[0]
+            budget[0] = max(budget[0] - len(chunk), 0)
+
+    async def run():
+        await asyncio.gather(feed(), read(process.stdout), read(process.stderr))
+        if not truncated:
+            await process.wait()
+
+    timed_out = False
+    runner = asyncio.ensure_future(run())
+    try:
+        try:
+            await asyncio.wait_for(asyncio.shield(runner), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        if timed_out or truncated:
+            runner.cancel()
+            await asyncio.wait({runner})
+            _kill_group(process)
+            # Read what is left until EOF so the pipes close, but give up after a second:
+            # a process that escaped the group could hold them open indefinitely.
+            drain = asyncio.gather(read(process.stdout, drain=True), read(process.stderr, drain=True))
+            try:
+                await asyncio.wait_for(drain, 1)
+                await asyncio.wait_for(process.wait(), 1)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        runner.cancel()
+        _kill_group(process)   # leftovers of a finished snippet, or the child itself if we were cancelled
+    seconds = time.perf_counter() - started
+    returncode = process.returncode
+    logger.info(f"Sandboxed snippet exited with {returncode} after {seconds:.2f} s")
+    stdout, stderr = (b''.join(captured[stream]).decode('utf-8', 'replace') for stream in (process.stdout, process.stderr))
+    return SandboxResult(stdout, stderr, returncode, timed_out, truncated, seconds)
+
+
+def _kill_group(process):
+    """SIGKILLs the child's whole process group (just the child where process groups do not exist)."""
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.returncode is None:
+            process.kill()
+
+
+async def run_async_snippet(code, namespace):
+    """
+    Runs `code` in the bot process with top-level await allowed, `namespace` as its globals and
+    print() captured. Returns (printed output, value of a trailing expression or None).
+    Exceptions propagate; cancelling the awaiting task cancels the snippet.
+    """
+    tree = ast.parse(code, '<aexec>')
+    tail = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+    output = io.StringIO()
+
+    def captured_print(*args, file=None, **kwargs):
+        print(*args, file=file or output, **kwargs)
+
+    namespace.setdefault('__builtins__', __builtins__)
+    namespace['print'] = captured_print
+    value = None
+    await _run(compile(tree, '<aexec>', 'exec', flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT), namespace)
+    if tail is not None:
+        value = await _run(compile(ast.Expression(tail.value), '<aexec>', 'eval',
+                                   flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT), namespace)
+    return output.getvalue(), value
+
+
+async def _run(code, namespace):
+    result = eval(code, namespace)
+    if code.co_flags & inspect.CO_COROUTINE:   # the code contained a top-level await
+        result = await result
+    return result
+
+
+def format_exception(error):
+    """A traceback limited to the snippet's own frames."""
+    frames = [frame for frame in traceback.extract_tb(error.__traceback__) if frame.filename == '<aexec>']
+    return ''.join(traceback.format_list(frames) + traceback.format_exception_only(type(error), error))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Key/value settings and plugin tables in one SQLite file.
+
+The toggles of the monshi, monitoring, profile and font plugins (`.clock on`, `.view del on`,
+...) must survive restarts, and several plugins keep small tables of their own (auto-reply
+rules, reaction targets, profile backups). They all share one database. Each plugin creates
+its tables and default settings in its setup(), so a disabled plugin adds nothing to the file.
+Connections are opened per operation, as these are rare, small writes.
+"""
+import sqlite3
+
+
+class SettingsDB:
+    """The `settings` key/value table plus whatever tables the plugins create."""
+
+    def __init__(self, path='selfbot_data.db'):
+        self.path = path
+        self.create('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
+
+    def connect(self):
+        return sqlite3.connect(self.path)
+
+    def create(self, *statements, defaults=None):
+        """Runs CREATE TABLE statements and inserts `defaults` for settings that are not set yet."""
+        conn = self.connect()
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            for key, value in (defaults or {}).items():
+                conn.execute('INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)', (key, str(value)))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, key, default=None):
+        conn = self.connect()
+        try:
+            row = conn.execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else default
+
+    def get_many(self, *keys):
+        """Several settings with a single query. Missing keys map to None."""
+        conn = self.connect()
+        try:
+            rows = conn.execute(f'SELECT key, value FROM settings WHERE key IN ({",".join("?" * len(keys))})', keys).fetchall()
+        finally:
+            conn.close()
+        values = dict(rows)
+        return {key: values.get(key) for key in keys}
+
+    def set(self, key, value):
+        conn = self.connect()
+        try:
+            conn.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (key, str(value)))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def enabled(self, key):
+        """True if an on/off setting is on ('1')."""
+        return self.get(key) == '1'
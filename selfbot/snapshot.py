@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Versioned snapshot of in-memory bot state for warm restarts.
+
+AFK and auto-reply state, the "already answered" markers and warmed caches live in memory,
+so a restart or crash used to forget them. The bot would then greet people it had already
+answered. Each owner registers a named section with a dump() function, which returns plain
+JSON data, and a load(data) function. All sections are written together as one compact JSON
+file, through a temporary file and os.replace, so a crash mid-write never leaves a torn
+snapshot. Saves run periodically, on SIGTERM/SIGHUP and at shutdown. At startup, restore()
+hands each section back to its owner. A file with a different format version is ignored
+rather than misread. A section that fails to load is skipped without affecting the others.
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class StateSnapshot:
+    """Named sections of in-memory state, saved to and restored from one versioned file."""
+
+    def __init__(self, path='state_snapshot.json', save_interval=30):
+        self.path = path
+        self.save_interval = save_interval
+        self.saved_at = None
+        self.restored_from = None   # save time of the snapshot restored at startup
+        self._sections = {}         # name -> (dump, load)
+        self._task = None
+
+    def register(self, name, dump, load):
+        """Adds (or replaces) a section; dump() must return JSON-serializable data."""
+        self._sections[name] = (dump, load)
+
+    def restore(self):
+        """Loads the saved sections into their owners. Returns the number restored."""
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable state snapshot {self.path}: {e}")
+            return 0
+        if data.get('version') != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring state snapshot with format version {data.get('version')} (expected {SNAPSHOT_VERSION})")
+            return 0
+        restored = 0
+        for name, section in data.get('sections', {}).items():
+            if name not in self._sections:
+                continue
+            try:
+                self._sections[name][1](section)
+                restored += 1
+            except Exception as e:
+                logger.warning(f"Could not restore state section {name}: {e}")
+        self.restored_from = data.get('saved_at')
+        logger.info(f"Restored {restored} state sections in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return restored
+
+    def save(self):
+        """Writes all sections atomically. Never raises; failures are logged."""
+        sections = {}
+        for name, (dump, _) in self._sections.items():
+            try:
+                sections[name] = dump()
+            except Exception as e:
+                logger.warning(f"Could not snapshot state section {name}: {e}")
+        now = time.time()
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'saved_at': now, 'sections': sections},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self.saved_at = now
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write the state snapshot: {e}")
+
+    def start_autosave(self):
+        """
+        Starts saving every save_interval seconds and on SIGTERM/SIGHUP (call from the running
+        loop). Save once more on shutdown as well.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._autosave())
+        for sig in (getattr(signal, 'SIGTERM', None), getattr(signal, 'SIGHUP', None)):
+            if sig is None:
+                continue
+            try:
+                loop.add_signal_handler(sig, self._save_and_exit, sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass   # no loop signal handlers (Windows, non-main thread)
+
+    async def _autosave(self):
+        while True:
+            await asyncio.sleep(self.save_interval)
+            self.save()
+
+    def _save_and_exit(self, sig):
+        """Saves, then lets the signal's default action terminate the process as before."""
+        self.save()
+        asyncio.get_running_loop().remove_signal_handler(sig)
+        signal.signal(sig, signal.SIG_DFL)
+        os.kill(os.getpid(), sig)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Startup time breakdown for `--profile-startup`.
+
+The entry script calls mark(phase) after each startup phase (imports, client setup,
+connect, ...) and report() once it is ready. Only the standard library is imported here,
+so the profiler can be created before any heavy import it is meant to measure.
+"""
+import sys
+import time
+
+
+class StartupProfiler:
+    """Records the time spent in each named startup phase."""
+
+    def __init__(self, enabled=None):
+        self.enabled = '--profile-startup' in sys.argv if enabled is None else enabled
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = []   # [(name, seconds, modules imported during the phase)]
+        self._modules = len(sys.modules)
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.phases.append((phase, now - self._last, modules - self._modules))
+        self._last = now
+        self._modules = modules
+
+    def report(self):
+        """The breakdown as printable text (empty when profiling is off)."""
+        if not self.enabled:
+            return ""
+        total = self._last - self.started
+        width = max(len(name) for name, _, _ in self.phases) if self.phases else 0
+        lines = ["--- startup profile ---"]
+        for name, seconds, modules in self.phases:
+            share = seconds / total * 100 if total else 0
+            lines.append(f"{name.ljust(width)}  {seconds * 1000:8.1f} ms  {share:5.1f}%  +{modules} modules")
+        lines.append(f"{'total'.ljust(width)}  {total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of uploaded files.
+
+Local files are identified by the SHA-256 of their content, computed in one streaming pass
+in the thread pool (through mmap for large files). The digest of a path is remembered
+together with its size and mtime, so an unchanged file is not hashed again. Each digest
+maps to the document or photo Telegram returned for the first upload. Sending the same
+content again reuses that media, which costs one request instead of a full upload.
+Expired file references are refreshed from the message the media was sent in. If that
+fails, the entry is dropped and the file is uploaded again. The index is a small JSON file
+capped at `max_entries`, evicting the least recently used entries.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import time
+
+from telethon import utils
+from telethon.errors.rpcerrorlist import (
+    FileReferenceEmptyError, FileReferenceExpiredError, FileReferenceInvalidError,
+    MediaEmptyError, PhotoIdInvalidError,
+)
+from telethon.tl import types
+from telethon.tl.functions.photos import UpdateProfilePhotoRequest, UploadProfilePhotoRequest
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK = 4 * 1024 * 1024
+MMAP_THRESHOLD = 32 * 1024 * 1024
+
+STALE_MEDIA_ERRORS = (
+    FileReferenceEmptyError, FileReferenceExpiredError, FileReferenceInvalidError, MediaEmptyError,
+)
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, read in chunks (memory-mapped for large files)."""
+    h = hashlib.sha256()
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, HASH_CHUNK):
+                        h.update(view[offset:offset + HASH_CHUNK])
+                finally:
+                    view.release()
+        else:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def stream_digest(stream):
+    """SHA-256 hex digest of a seekable file object's content; the stream is rewound afterwards."""
+    h = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK), b''):
+        h.update(chunk)
+    stream.seek(0)
+    return h.hexdigest()
+
+
+class UploadCache:
+    """Maps file content to previously uploaded Telegram media, persisted to `path`."""
+
+    def __init__(self, client, path='upload_cache.json', max_entries=500):
+        self.client = client
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = self._load()
+
+    async def digest(self, file_path):
+        """
+        Content digest of a local file or a seekable file object. Unchanged files (same size and
+        mtime) are not rehashed.
+        """
+        if not isinstance(file_path, str):
+            return await asyncio.get_running_loop().run_in_executor(None, stream_digest, file_path)
+        st = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        known = self._data['paths'].get(key)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        digest = await asyncio.get_running_loop().run_in_executor(None, file_digest, file_path)
+        self._data['paths'][key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    async def send_file(self, chat, file_path, upload=None, **kwargs):
+        """
+        client.send_file for a local path that reuses an earlier upload of the same content.
+        upload(file_path), if given, produces what to pass to send_file on a miss (e.g. a
+        parallel upload); otherwise the path itself is sent.
+        """
+        digest = await self.digest(file_path)
+        entry = self._get('send', digest)
+        if entry is not None:
+            for attempt in range(2):
+                try:
+                    message = await self.client.send_file(chat, _input_media(entry), **kwargs)
+                    self.hits += 1
+                    return message
+                except STALE_MEDIA_ERRORS as e:
+                    if attempt or not await self._refresh(entry):
+                        logger.info(f"Cached upload {digest[:12]} is no longer usable ({e}); uploading again.")
+                        self._forget('send', digest)
+                        break
+        self.misses += 1
+        file = await upload(file_path) if upload else file_path
+        message = await self.client.send_file(chat, file, **kwargs)
+        media = getattr(message.media, 'document', None) or getattr(message.media, 'photo', None)
+        if media is not None:
+            self._remember('send', digest, media, peer=utils.get_peer_id(message.peer_id), msg_id=message.id)
+        return message
+
+    async def set_profile_photo(self, file_path):
+        """
+        Sets an image (a path or an in-memory file object) as profile photo, re-activating a
+        previous upload of the same image.
+        """
+        digest = await self.digest(file_path)
+        entry = self._get('profile', digest)
+        if entry is not None:
+            try:
+                result = await self.client(UpdateProfilePhotoRequest(id=_input_media(entry)))
+                self.hits += 1
+                return result
+            except STALE_MEDIA_ERRORS + (PhotoIdInvalidError,) as e:
+                logger.info(f"Cached profile photo {digest[:12]} is no longer usable ({e}); uploading again.")
+                self._forget('profile', digest)
+        self.misses += 1
+        file_name = None if isinstance(file_path, str) else 'profile.jpg'
+        uploaded = await self.client.upload_file(file_path, file_name=file_name)
+        result = await self.client(UploadProfilePhotoRequest(file=uploaded))
+        self._remember('profile', digest, result.photo)
+        return result
+
+    def stats(self):
+        return {'entries': len(self._data['entries']), 'hits': self.hits, 'misses': self.misses}
+
+    # --- internals ---
+
+    def _get(self, kind, digest):
+        entry = self._data['entries'].get(f"{kind}:{digest}")
+        if entry is not None:
+            entry['used'] = time.time()
+        return entry
+
+    def _remember(self, kind, digest, media, peer=None, msg_id=None):
+        self._data['entries'][f"{kind}:{digest}"] = {
+            'type': 'photo' if isinstance(media, types.Photo) else 'document',
+            'id': media.id,
+            'access_hash': media.access_hash,
+            'file_reference': media.file_reference.hex(),
+            'peer': peer,
+            'msg_id': msg_id,
+            'used': time.time(),
+        }
+        self._save()
+
+    def _forget(self, kind, digest):
+        if self._data['entries'].pop(f"{kind}:{digest}", None) is not None:
+            self._save()
+
+    async def _refresh(self, entry):
+        """Fetches a fresh file reference from the message the media was sent in."""
+        if not entry.get('peer') or not entry.get('msg_id'):
+            return False
+        try:
+            message = await self.client.get_messages(entry['peer'], ids=entry['msg_id'])
+        except Exception as e:
+            logger.warning(f"Could not refresh a file reference: {e}")
+            return False
+        media = message and (getattr(message.media, 'document', None) or getattr(message.media, 'photo', None))
+        if media is None or media.id != entry['id']:
+            return False
+        entry['file_reference'] = media.file_reference.hex()
+        self._save()
+        return True
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {'entries': data.get('entries', {}), 'paths': data.get('paths', {})}
+        except (OSError, ValueError):
+            return {'entries': {}, 'paths': {}}
+
+    def _save(self):
+        entries = self._data['entries']
+        if len(entries) > self.max_entries:
+            for key in sorted(entries, key=lambda k: entries[k]['used'])[:len(entries) - self.max_entries]:
+                del entries[key]
+        paths = self._data['paths']
+        if len(paths) > self.max_entries:
+            for key in list(paths)[:len(paths) - self.max_entries]:
+                del paths[key]
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f)
+        os.replace(tmp, self.path)
+
+
+def _input_media(entry):
+    cls = types.InputPhoto if entry['type'] == 'photo' else types.InputDocument
+    return cls(id=entry['id'], access_hash=entry['access_hash'], file_reference=bytes.fromhex(entry['file_reference']))